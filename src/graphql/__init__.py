@@ -4,6 +4,7 @@ This includes decorators for describing a GraphQL schema.
 """
 
 from decorators import graphql_attr_field
+from decorators import graphql_batch_field
 from decorators import graphql_custom_class_field
 from decorators import graphql_enum
 from decorators import graphql_field
@@ -12,6 +13,7 @@ from decorators import graphql_interface
 from decorators import graphql_mutation
 from decorators import graphql_object
 from decorators import graphql_root_field
+from decorators import graphql_runtime_type
 from decorators import graphql_scalar
 from decorators import graphql_union
 from result_with_errors import GraphQlResultWithErrors
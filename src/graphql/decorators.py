@@ -7,13 +7,13 @@ def graphql_object(object_name, description=None):
     and a graphql_interface annotation.
 
     An object obj's concrete GraphQL type is given by the first element
-    in inspect.getmro(obj.__class__) that has a graphql_object
-    annotation.  Apart from scalars, lists, tuples, enum values, and the
-    value None, all objects exposed through GraphQL must have a concrete
-    GraphQL type.  It is possible for a base class and a derived class
-    to both have graphql_object annotations.  In this case, as far as
-    GraphQL queries are concerned, there is no relationship between the
-    base and derived classes.
+    in inspect.getmro(obj.__class__) that has a graphql_object (or
+    graphql_runtime_type) annotation.  Apart from scalars, lists,
+    tuples, enum values, and the value None, all objects exposed through
+    GraphQL must have a concrete GraphQL type.  It is possible for a
+    base class and a derived class to both have graphql_object
+    annotations.  In this case, as far as GraphQL queries are concerned,
+    there is no relationship between the base and derived classes.
 
     basestring object_name - The type name.
     basestring description - A description of the type, or None.
@@ -26,6 +26,33 @@ def graphql_object(object_name, description=None):
     return decorator
 
 
+def graphql_runtime_type(object_name):
+    """Annotate a class as having the GraphQL type with the specified name.
+
+    Decorator that annotates a class as having the GraphQL concrete
+    object type with the specified name, as in
+    GraphQlSchema.class_type.  Unlike graphql_object, graphql_runtime_type
+    does not define a type; the type must be defined elsewhere using
+    graphql_object.  Instances of the class must provide the methods and
+    attributes for the type's fields, e.g. by forwarding them to a
+    wrapped object.
+
+    An object obj's concrete GraphQL type is given by the first element
+    in inspect.getmro(obj.__class__) that has a graphql_object or
+    graphql_runtime_type annotation.  Annotating a class with
+    graphql_runtime_type spares us from examining the rest of its MRO.
+    This is useful for proxy classes, such as those of ORMs, whose MROs
+    are deep or do not include the class with the graphql_object
+    annotation.
+
+    basestring object_name - The name of the object type.
+    """
+    def decorator(cls):
+        cls._graphql_runtime_type_name = object_name
+        return cls
+    return decorator
+
+
 def graphql_interface(interface_name, description=None):
     """Annotate a class as a GraphQL interface with the specified name.
 
@@ -142,7 +169,8 @@ def graphql_scalar(scalar_name, description=None):
 
 def graphql_field(
         field_name, field_type, arguments={}, context_args=[],
-        description=None, is_deprecated=False, deprecation_reason=None):
+        description=None, is_deprecated=False, deprecation_reason=None,
+        cost=None, multiplier=None):
     """Decorator that annotates a method as corresponding to a GraphQL field.
 
     The field appears in the GraphQL types for any of the containing
@@ -178,6 +206,14 @@ def graphql_field(
     bool is_deprecated - Whether the field is deprecated.
     basestring deprecation_reason - An indication of why the field is
         deprecated, or None.  This is None if is_deprecated is False.
+    number cost - The estimated cost of obtaining the field's value
+        for a single object, for query cost analysis, or None to use
+        the default.  See GraphQlCostAnalyzer.
+    int|basestring multiplier - The estimated number of objects in the
+        field's value, or the name of an argument to the field whose
+        value is the estimate, such as "first" or "count".  The cost of
+        the field's selection set is multiplied by this.  This is None
+        to use the default.  See GraphQlField.multiplier.
     """
     def decorator(func):
         func._graphql_field_name = field_name
@@ -187,13 +223,56 @@ def graphql_field(
         func._graphql_field_description = description
         func._graphql_field_is_deprecated = is_deprecated
         func._graphql_field_deprecation_reason = deprecation_reason
+        func._graphql_field_cost = cost
+        func._graphql_field_multiplier = multiplier
+        return func
+    return decorator
+
+
+def graphql_batch_field(
+        field_name, field_type, arguments={}, context_args=[],
+        description=None, is_deprecated=False, deprecation_reason=None,
+        cost=None, multiplier=None):
+    """Annotate a static method or class method as a batched GraphQL field.
+
+    Decorator that annotates a static method or class method as
+    computing the values of a GraphQL field for many objects at once.
+    Rather than calling a method once per object, we gather the objects
+    that need the field, such as the elements of a list and the elements
+    of the other lists at the same depth in the query, and pass them to
+    the method in a single call.  This is useful for avoiding a separate
+    database query or backend request for each object.
+
+    The method takes a list of the objects as its first positional
+    argument, followed by the keyword arguments described in the
+    comments for graphql_field.  It returns a list or tuple containing
+    the value of the field for each object, in the same order as the
+    objects.  The list of objects may contain duplicates.  Each object's
+    value may be a GraphQlResultWithErrors.  If the method raises an
+    exception, we report an error for each of the objects.
+
+    The decorator must be applied before staticmethod or classmethod;
+    that is, it must appear below staticmethod or classmethod.  As with
+    graphql_field, we respect ordinary method overriding semantics: we
+    call the method with the same name as the decorated method that is
+    defined in each object's class.  We call it once for each distinct
+    such method and set of arguments.
+
+    The arguments are the same as those of graphql_field.
+    """
+    def decorator(func):
+        graphql_field(
+            field_name, field_type, arguments, context_args, description,
+            is_deprecated, deprecation_reason, cost, multiplier)(func)
+        func._graphql_field_is_batch = True
         return func
     return decorator
 
 
 def graphql_attr_field(
         attr_name, field_name, field_type, description=None,
-        is_deprecated=False, deprecation_reason=None):
+        is_deprecated=False, deprecation_reason=None, cost=None,
+        multiplier=None):
     """Annotate a class's attribute as corresponding to a GraphQL field.
 
     The field appears in the GraphQL types for any of the class's
@@ -210,17 +289,25 @@ def graphql_attr_field(
     bool is_deprecated - Whether the field is deprecated.
     basestring deprecation_reason - An indication of why the field is
         deprecated, or None.  This is None if is_deprecated is False.
+    number cost - The estimated cost of obtaining the field's value
+        for a single object, as in the "cost" argument to
+        graphql_field.
+    int multiplier - The estimated number of objects in the field's
+        value, as in the "multiplier" argument to graphql_field, or
+        None to use the default.
     """
     def decorator(cls):
         if '_graphql_attr_fields' not in cls.__dict__:
             cls._graphql_attr_fields = []
         cls._graphql_attr_fields.append({
             'attr': attr_name,
+            'cost': cost,
             'deprecationReason': deprecation_reason,
             'description': description,
             'fieldName': field_name,
             'fieldType': field_type,
             'isDeprecated': is_deprecated,
+            'multiplier': multiplier,
         })
         return cls
     return decorator
@@ -260,6 +347,9 @@ def graphql_custom_class_field(field_func):
     partialKwargs: The additional keyword arguments to pass to
         methodName, as in GraphQlField.partial_kwargs.
 
+    The dictionary may also have "cost" and "multiplier" entries, as in
+    the "cost" and "multiplier" arguments to graphql_field.
+
     The reason graphql_custom_class_field takes a function that returns
     a dictionary rather than taking a dictionary is that decorator
     functions run in the global scope, so they should do as little work
@@ -275,7 +365,8 @@ def graphql_custom_class_field(field_func):
 
 def graphql_root_field(
         field_name, field_type, arguments={}, context_args=[],
-        description=None, is_deprecated=False, deprecation_reason=None):
+        description=None, is_deprecated=False, deprecation_reason=None,
+        cost=None, multiplier=None):
     """Annotate a function as corresponding to a GraphQL root field.
 
     Decorator that annotates a function as corresponding to a GraphQL
@@ -299,6 +390,11 @@ def graphql_root_field(
     bool is_deprecated - Whether the field is deprecated.
     basestring deprecation_reason - An indication of why the field is
         deprecated, or None.  This is None if is_deprecated is False.
+    number cost - The estimated cost of calling the function, as in
+        the "cost" argument to graphql_field.
+    int|basestring multiplier - The estimated number of objects in the
+        field's value, as in the "multiplier" argument to
+        graphql_field.
     """
     def decorator(func):
         func._graphql_root_field_name = field_name
@@ -308,6 +404,8 @@ def graphql_root_field(
         func._graphql_root_field_description = description
         func._graphql_root_field_is_deprecated = is_deprecated
         func._graphql_root_field_deprecation_reason = deprecation_reason
+        func._graphql_root_field_cost = cost
+        func._graphql_root_field_multiplier = multiplier
         return func
     return decorator
 
@@ -9,6 +9,8 @@ from errors import GraphQlParseError
 from field_query import GraphQlFieldQuery
 from fragment import GraphQlFragment
 from fragment_reference import GraphQlFragmentReference
+from lexer import GraphQlLexer
+from lexer import GraphQlTokenKind
 from operation import GraphQlOperation
 from parser import GraphQlParser
 from query import GraphQlQuery
@@ -0,0 +1,280 @@
+import re
+
+
+class GraphQlTokenKind(object):
+    """An enumeration of the kinds of tokens GraphQlLexer produces.
+
+    A punctuation token, such as "{" or "...", uses the punctuation
+    itself as its kind.
+    """
+
+    # A valid identifier or keyword, such as "query" or "id"
+    name = 'name'
+
+    # A sequence of characters that occupies the place of an identifier or
+    # keyword, but is not a valid identifier, such as "foo-bar"
+    word = 'word'
+
+    # An integer or floating point literal
+    number = 'number'
+
+    # A malformed integer or floating point literal
+    invalid_number = 'invalid_number'
+
+    # A string literal
+    string = 'string'
+
+    # A malformed string literal
+    invalid_string = 'invalid_string'
+
+    # The end of the document
+    end = 'end'
+
+
+class GraphQlLexer(object):
+    """Splits a GraphQL document string into tokens.
+
+    GraphQlLexer uses compiled regular expressions to split an entire
+    document into tokens at once, so that GraphQlParser does not have to
+    examine the document one character at a time.  It skips tokens that
+    are ignored in the GraphQL syntax, such as whitespace, commas, and
+    comments.
+
+    Each token is a tuple (kind, value, start, end).  "kind" is the
+    GraphQlTokenKind constant or punctuation string indicating the kind
+    of token.  "start" and "end" are the indices in the document string
+    of the start of the token and of the first character after the
+    token.  "value" depends on the kind of token:
+
+    name, word: The characters in the token.
+    number: The int or float value of the literal.
+    string: The basestring value of the literal.
+    invalid_number, invalid_string: A message indicating what is wrong
+        with the literal.  In this case, "end" is the index of the
+        problematic portion of the literal rather than the end of the
+        token.
+    end: None.
+    punctuation: The punctuation string.
+
+    The last token is always an "end", "invalid_number", or
+    "invalid_string" token.  We stop at the first malformed literal,
+    leaving it up to the parser to decide whether and how to report it.
+    """
+
+    # The characters that are ignored in the GraphQL syntax, apart from those
+    # in comments.
+    _IGNORED_CHARS = u'\ufeff \t,\n\r'
+
+    # The characters that terminate a sequence of characters we are reading as
+    # an identifier or keyword.
+    _DELIMITER_CHARS = u'!$().:=@[]{}"#' + _IGNORED_CHARS
+
+    # The characters that may appear at the start of a number literal.
+    _NUMBER_START_CHARS = '-0123456789'
+
+    # The regular expression for reading the next token, skipping any ignored
+    # tokens before it.  Group 1 is a punctuation token, group 2 is a valid
+    # identifier or keyword, and group 3 is the contents of a string literal
+    # that has no escape sequences.  If none of the groups match, the next
+    # token requires more careful examination, starting at the end of the
+    # match.
+    _TOKEN_RE = re.compile(
+        u'[{0:s}]*(?:#[^\n\r]*[{0:s}]*)*'
+        u'(?:'
+        u'(\\.\\.\\.|[!$():=@\\[\\]{{}}.])|'
+        u'([_A-Za-z][_0-9A-Za-z]*)(?![^{1:s}])|'
+        u'"([^"\\\\\x00-\x08\x0b\x0c\x0e-\x1f]*)"'
+        u')?'.format(
+            re.escape(_IGNORED_CHARS), re.escape(_DELIMITER_CHARS)))
+
+    # The regular expression for a sequence of characters that occupies the
+    # place of an identifier or keyword.
+    _WORD_RE = re.compile(u'[^{:s}]+'.format(re.escape(_DELIMITER_CHARS)))
+
+    # The regular expression for characters in a string literal other than
+    # the closing quotation mark, escape sequences, and illegal characters.
+    _STR_CHARS_RE = re.compile(u'[^"\\\\\x00-\x08\x0b\x0c\x0e-\x1f]*')
+
+    # A map from each character that may follow a backslash in a string
+    # literal, apart from "u", to the character the escape sequence denotes.
+    _ESCAPED_CHARS = {
+        '"': '"',
+        '/': '/',
+        '\\': '\\',
+        'b': '\b',
+        'f': '\f',
+        'n': '\n',
+        'r': '\r',
+        't': '\t',
+    }
+
+    # The regular expressions for the integer, fractional, and exponent
+    # components of a number literal.
+    _INT_RE = re.compile('-?[0-9]+')
+    _FRACTION_RE = re.compile('\\.[0-9]+')
+    _EXPONENT_RE = re.compile('[eE][+-]?[0-9]+')
+
+    # Private attributes:
+    # basestring _document_str - The document we are splitting into tokens.
+
+    def __init__(self, document_str):
+        self._document_str = document_str
+
+    def _str_token(self, start):
+        """Return the token for the string literal at the specified index.
+
+        int start - The index in _document_str of the opening quotation
+            mark.
+        return tuple - The "string" or "invalid_string" token.
+        """
+        document_str = self._document_str
+        length = len(document_str)
+        components = []
+        offset = start + 1
+        while True:
+            match = GraphQlLexer._STR_CHARS_RE.match(document_str, offset)
+            components.append(match.group())
+            offset = match.end()
+            if offset >= length:
+                return (
+                    GraphQlTokenKind.invalid_string,
+                    'Unexpected end of document', start, length)
+            char = document_str[offset]
+            if char == '"':
+                return (
+                    GraphQlTokenKind.string, ''.join(components), start,
+                    offset + 1)
+            elif char != '\\':
+                return (
+                    GraphQlTokenKind.invalid_string,
+                    'String literal contains illegal byte', start, start)
+            elif offset + 1 >= length:
+                return (
+                    GraphQlTokenKind.invalid_string,
+                    'Unexpected end of document', start, length)
+
+            escape_offset = offset
+            char = document_str[offset + 1]
+            offset += 2
+            if char in GraphQlLexer._ESCAPED_CHARS:
+                components.append(GraphQlLexer._ESCAPED_CHARS[char])
+            elif char == 'u':
+                if offset + 4 >= length:
+                    return (
+                        GraphQlTokenKind.invalid_string,
+                        'Invalid Unicode escape sequence', start,
+                        escape_offset)
+                try:
+                    char = unichr(int(document_str[offset:offset + 4], 16))
+                except ValueError:
+                    return (
+                        GraphQlTokenKind.invalid_string,
+                        'Invalid Unicode escape sequence', start,
+                        escape_offset)
+                components.append(char)
+                offset += 4
+
+    def _number_token(self, start):
+        """Return the token for the number literal at the specified index.
+
+        int start - The index in _document_str of the start of the
+            literal.
+        return tuple - The "number" or "invalid_number" token.
+        """
+        document_str = self._document_str
+        length = len(document_str)
+        match = GraphQlLexer._INT_RE.match(document_str, start)
+        if match is None:
+            if start + 1 >= length:
+                return (
+                    GraphQlTokenKind.invalid_number,
+                    'Unexpected end of document', start, length)
+            return (
+                GraphQlTokenKind.invalid_number,
+                'Could not parse number literal', start, start)
+        digits = match.group().lstrip('-')
+        if digits[0] == '0' and '0' in digits[1:]:
+            return (
+                GraphQlTokenKind.invalid_number,
+                'Could not parse number literal', start, start)
+
+        offset = match.end()
+        is_float = False
+        if offset < length and document_str[offset] == '.':
+            match = GraphQlLexer._FRACTION_RE.match(document_str, offset)
+            if match is None:
+                return (
+                    GraphQlTokenKind.invalid_number, 'Expected digit', start,
+                    offset + 1)
+            offset = match.end()
+            is_float = True
+        if offset < length and document_str[offset] in 'eE':
+            match = GraphQlLexer._EXPONENT_RE.match(document_str, offset)
+            if match is None:
+                if (offset + 1 < length and
+                        document_str[offset + 1] in '+-'):
+                    error_offset = offset + 2
+                else:
+                    error_offset = offset + 1
+                return (
+                    GraphQlTokenKind.invalid_number, 'Expected digit', start,
+                    min(error_offset, length))
+            offset = match.end()
+            is_float = True
+
+        if is_float:
+            value = float(document_str[start:offset])
+        else:
+            value = int(document_str[start:offset])
+        return (GraphQlTokenKind.number, value, start, offset)
+
+    def tokens(self):
+        """Return the tokens in the document string passed to the constructor.
+
+        return list<tuple> - The tokens, formatted as described in the
+            comments for GraphQlLexer.
+        """
+        document_str = self._document_str
+        length = len(document_str)
+        token_match = GraphQlLexer._TOKEN_RE.match
+        tokens = []
+        offset = 0
+        while True:
+            match = token_match(document_str, offset)
+            group = match.lastindex
+            if group == 1:
+                punctuation = match.group(1)
+                tokens.append(
+                    (punctuation, punctuation, match.start(1), match.end()))
+            elif group == 2:
+                tokens.append((
+                    GraphQlTokenKind.name, match.group(2), match.start(2),
+                    match.end()))
+            elif group == 3:
+                tokens.append((
+                    GraphQlTokenKind.string, match.group(3),
+                    match.start(3) - 1, match.end()))
+            else:
+                start = match.end()
+                if start >= length:
+                    tokens.append((GraphQlTokenKind.end, None, length, length))
+                    return tokens
+                char = document_str[start]
+                if char == '"':
+                    token = self._str_token(start)
+                elif char in GraphQlLexer._NUMBER_START_CHARS:
+                    token = self._number_token(start)
+                else:
+                    end = GraphQlLexer._WORD_RE.match(
+                        document_str, start).end()
+                    token = (
+                        GraphQlTokenKind.word, document_str[start:end], start,
+                        end)
+                tokens.append(token)
+                if token[0] in (
+                        GraphQlTokenKind.invalid_number,
+                        GraphQlTokenKind.invalid_string):
+                    return tokens
+                offset = token[3]
+                continue
+            offset = match.end()
@@ -1,9 +1,13 @@
+import collections
+
 from directive import GraphQlDirective
 from document import GraphQlDocument
 from errors import GraphQlParseError
 from field_query import GraphQlFieldQuery
 from fragment import GraphQlFragment
 from fragment_reference import GraphQlFragmentReference
+from lexer import GraphQlLexer
+from lexer import GraphQlTokenKind
 from graphql.schema import GraphQlDirectiveLocation
 from graphql.schema import GraphQlEnumType
 from graphql.schema import GraphQlInputObjectType
@@ -12,7 +16,6 @@ from graphql.schema import GraphQlListType
 from graphql.schema import GraphQlNonNullType
 from graphql.schema import GraphQlObjectType
 from graphql.schema import GraphQlScalarType
-from graphql.schema import GraphQlSchema
 from mutation import GraphQlMutation
 from query import GraphQlQuery
 from selection_set import GraphQlSelectionSet
@@ -21,18 +24,33 @@ from variable_reference import GraphQlVariableReference
 
 
 class GraphQlParser(object):
-    """A parser for computing the GraphQlDocument for a document string."""
-
-    # In the context of this class, the term "read" refers to taking characters
-    # from _document_str starting at _offset, incrementing _offset to the first
-    # character after the end of the read portion, and raising an exception if
-    # the desired entity was not present.  As a rule, reading should skip any
-    # tokens ignored in the GraphQL syntax preceding the desired entity.
+    """A parser for computing the GraphQlDocument for a document string.
+
+    A GraphQlParser may limit the size and complexity of the documents
+    it accepts, to protect us from hostile documents, such as very long
+    or deeply nested ones.  We check the limits as we read the document,
+    so that a document that exceeds them fails quickly with a
+    GraphQlParseError, before we build a large document or validate it.
+    By default, there are no limits.
+    """
+
+    # In the context of this class, the term "read" refers to taking tokens
+    # from _tokens starting at _token_index, incrementing _token_index past the
+    # read tokens and setting _offset to the first character after the end of
+    # the read portion, and raising an exception if the desired entity was not
+    # present.  As a rule, reading should skip any tokens ignored in the
+    # GraphQL syntax preceding the desired entity.  GraphQlLexer has already
+    # removed ignored tokens from _tokens, so skipping them only entails
+    # advancing _offset to the start of the next token.
 
     # The number of characters after the problematic portion of the query to
     # include in an error message describing an invalid query.
     _NUM_CONTEXT_CHARS = 50
 
+    # The default maximum number of field queries in each operation once we
+    # have expanded all of its fragment references
+    _DEFAULT_MAX_EXPANDED_FIELD_QUERIES = 100000
+
     # Private attributes:
     # basestring _document_str - The document we are parsing.
     # dict<GraphQlFieldQuery, int> _field_query_offsets - A map from each field
@@ -52,8 +70,28 @@ class GraphQlParser(object):
     # dict<basestring, list<GraphQlFragmentReference>> _fragment_to_references
     #     - A map from the names of named fragments to the references to those
     #     fragments that we have read.
-    # int _offset - The index in _schema of the next character to read.
+    # int _depth - The number of selection sets that enclose the next
+    #     character to read, including those of inline fragments.
+    # int _max_aliases - The maximum number of field queries with aliases in
+    #     each selection set, or None if there is no maximum.
+    # int _max_depth - The maximum nesting depth of selection sets, including
+    #     those of inline fragments, or None if there is no maximum.
+    # int _max_field_queries - The maximum number of field queries in the
+    #     document, or None if there is no maximum.
+    # int _max_expanded_field_queries - The maximum number of field queries in
+    #     each operation once we have expanded all of its fragment references,
+    #     or None if there is no maximum.
+    # int _max_length - The maximum number of characters in the document, or
+    #     None if there is no maximum.
+    # int _num_field_queries - The number of field queries we have read.
+    # int _offset - The index in _document_str of the next character to read.
+    # dict<GraphQlOperation, int> _operation_offsets - A map from each
+    #     operation we have read to the index in _document_str of the start of
+    #     the operation.
     # GraphQlSchema _schema - The schema the document is using.
+    # int _token_index - The index in _tokens of the next token to read.
+    # list<tuple> _tokens - The tokens in _document_str, as returned by
+    #     GraphQlLexer.tokens().
     # dict<GraphQlVariable, int> _variable_offsets - A map from each variable
     #     definition we have read to the index in _document_str of the start of
     #     the definition.
@@ -61,10 +99,50 @@ class GraphQlParser(object):
     #     from each variable reference we have read to the index in
     #     _document_str of the start of the reference.
 
-    def __init__(self, document_str, schema):
+    def __init__(
+            self, document_str, schema, max_length=None, max_depth=None,
+            max_field_queries=None, max_aliases=None,
+            max_expanded_field_queries=_DEFAULT_MAX_EXPANDED_FIELD_QUERIES):
+        """Initialize a GraphQlParser.
+
+        basestring document_str - The document to parse.
+        GraphQlSchema schema - The schema the document is using.
+        int max_length - The maximum number of characters in the
+            document, or None if there is no maximum.
+        int max_depth - The maximum nesting depth of selection sets, or
+            None if there is no maximum.  The selection set of an
+            operation has a depth of 1, the selection sets of its fields
+            have a depth of 2, and so on.  The selection sets of inline
+            fragments count as another level, and the selection sets of
+            named fragment definitions count from 1.
+        int max_field_queries - The maximum number of field queries in
+            the document, or None if there is no maximum.  A field query
+            in a named fragment counts once, regardless of how many
+            times we reference the fragment.
+        int max_aliases - The maximum number of field queries with
+            aliases in each selection set, or None if there is no
+            maximum.  This excludes the fragments in the selection set.
+        int max_expanded_field_queries - The maximum number of field
+            queries in each operation once we have replaced each
+            fragment reference with the fragment's field queries, or
+            None if there is no maximum.  This protects us from small
+            documents whose fragments reference other fragments several
+            times, so that their expanded size grows exponentially.
+            Unlike the other limits, this has a default value, which is
+            large enough for any reasonable document.
+        """
         self._document_str = document_str
         self._schema = schema
+        self._max_length = max_length
+        self._max_depth = max_depth
+        self._max_field_queries = max_field_queries
+        self._max_aliases = max_aliases
+        self._max_expanded_field_queries = max_expanded_field_queries
+        self._depth = 0
+        self._num_field_queries = 0
         self._offset = 0
+        self._tokens = None
+        self._token_index = 0
         self._fragments = {}
         self._fragment_to_references = {}
         self._fragment_reference_to_base_type = {}
@@ -73,6 +151,7 @@ class GraphQlParser(object):
         self._field_query_offsets = {}
         self._variable_offsets = {}
         self._variable_reference_offsets = {}
+        self._operation_offsets = {}
 
     def _raise_exception(self, message, offset):
         """Raise a GraphQlParseError indicating failure to parse the document.
@@ -94,6 +173,20 @@ class GraphQlParser(object):
             '"{:s}": {:s}'.format(line, column, context_str, message),
             self._document_str, line, column)
 
+    def _next_kind(self):
+        """Return the kind of the next token, as in GraphQlLexer.tokens()."""
+        return self._tokens[self._token_index][0]
+
+    def _read_token(self):
+        """Read the next token, without skipping any ignored tokens.
+
+        return tuple - The token, as in GraphQlLexer.tokens().
+        """
+        token = self._tokens[self._token_index]
+        self._token_index += 1
+        self._offset = token[3]
+        return token
+
     def _read_ignored_tokens(self, allow_end_of_string):
         """Read all available ignored tokens starting at _offset.
 
@@ -103,19 +196,9 @@ class GraphQlParser(object):
         bool allow_end_of_string - If False, we raise a
             GraphQlParseError if we reach the end of the string.
         """
-        is_in_comment = False
-        while self._offset < len(self._document_str):
-            char = self._document_str[self._offset]
-            if char in u"\ufeff \t,":
-                pass
-            elif char == '#':
-                is_in_comment = True
-            elif char in "\n\r":
-                is_in_comment = False
-            elif not is_in_comment:
-                break
-            self._offset += 1
-        if self._offset == len(self._document_str) and not allow_end_of_string:
+        kind, value, start, end = self._tokens[self._token_index]
+        self._offset = start
+        if kind == GraphQlTokenKind.end and not allow_end_of_string:
             self._raise_exception('Unexpected end of document', self._offset)
 
     def _read_identifier(self):
@@ -124,23 +207,33 @@ class GraphQlParser(object):
         return basestring - The identifier.
         """
         self._read_ignored_tokens(False)
-        prev_offset = self._offset
-        while (self._offset < len(self._document_str) and
-                self._document_str[self._offset] not in
-                u"!$().:=@[]{}\"\ufeff \t,#\n\r"):
-            self._offset += 1
-        identifier = self._document_str[prev_offset:self._offset]
-        if identifier == '':
-            self._raise_exception(
-                'Expected identifier or keyword', prev_offset)
-        elif not GraphQlSchema.is_valid_identifier(identifier):
+        kind, value, start, end = self._tokens[self._token_index]
+        if kind == GraphQlTokenKind.name:
+            self._read_token()
+            return value
+        elif kind in (
+                GraphQlTokenKind.word, GraphQlTokenKind.number,
+                GraphQlTokenKind.invalid_number):
             self._raise_exception(
                 'Invalid GraphQL identifier or keyword.  Identifiers must '
                 'consist of letters, digits, and underscores, and may not '
                 'begin with a digit.',
-                prev_offset)
+                start)
         else:
-            return identifier
+            self._raise_exception('Expected identifier or keyword', start)
+
+    def _peek_identifier(self):
+        """Return the identifier or keyword we would read next.
+
+        This is like _read_identifier(), but it does not advance past
+        the identifier.
+        """
+        token_index = self._token_index
+        offset = self._offset
+        identifier = self._read_identifier()
+        self._token_index = token_index
+        self._offset = offset
+        return identifier
 
     def _read_type(self):
         """Read a GraphQL type.
@@ -148,13 +241,14 @@ class GraphQlParser(object):
         return GraphQlType - The type.
         """
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] == '[':
-            self._offset += 1
+        if self._next_kind() == '[':
+            self._read_token()
             t = self._read_type()
             self._read_ignored_tokens(False)
-            if self._document_str[self._offset] != ']':
+            if self._next_kind() != ']':
                 self._raise_exception('Expected "]"', self._offset)
-            self._offset += 1
+            self._read_token()
+            self._read_ignored_tokens(False)
             t = GraphQlListType(t)
         else:
             prev_offset = self._offset
@@ -165,10 +259,10 @@ class GraphQlParser(object):
             except ValueError:
                 self._raise_exception(
                     'There is no type named {:s}'.format(name), prev_offset)
-        if self._document_str[self._offset] != '!':
+        if self._next_kind() != '!':
             return t
         else:
-            self._offset += 1
+            self._read_token()
             return GraphQlNonNullType(t)
 
     def _read_field_query(self, base_type):
@@ -180,13 +274,20 @@ class GraphQlParser(object):
         """
         self._read_ignored_tokens(False)
         start = self._offset
+        self._num_field_queries += 1
+        if (self._max_field_queries is not None and
+                self._num_field_queries > self._max_field_queries):
+            self._raise_exception(
+                'The document has more than the maximum of {:d} field '
+                'queries'.format(self._max_field_queries),
+                start)
         response_key = self._read_identifier()
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] != ':':
+        if self._next_kind() != ':':
             field_name = response_key
             field_offset = start
         else:
-            self._offset += 1
+            self._read_token()
             self._read_ignored_tokens(False)
             field_offset = self._offset
             field_name = self._read_identifier()
@@ -243,36 +344,50 @@ class GraphQlParser(object):
         """
         self._read_ignored_tokens(False)
         if isinstance(base_type, (GraphQlEnumType, GraphQlScalarType)):
-            if self._document_str[self._offset] == '{':
+            if self._next_kind() == '{':
                 self._raise_exception(
                     'Scalar values do not have fields', self._offset)
             return None
-        if self._document_str[self._offset] != '{':
+        if self._next_kind() != '{':
             self._raise_exception(
                 'Must specify the {:s} object fields to request'.format(
                     base_type.name),
                 self._offset)
 
+        self._depth += 1
+        if self._max_depth is not None and self._depth > self._max_depth:
+            self._raise_exception(
+                'Selection sets may not be nested more than {:d} '
+                'deep'.format(self._max_depth),
+                self._offset)
+
         # Read the field queries and fragment references
         field_queries_and_fragments = []
-        self._offset += 1
+        num_aliases = 0
+        self._read_token()
         self._read_ignored_tokens(False)
-        while self._document_str[self._offset] != '}':
+        while self._next_kind() != '}':
             fragment_start = self._offset
-            if self._document_str[self._offset] != '.':
-                # Field query
-                field_queries_and_fragments.append(
-                    self._read_field_query(base_type))
-            elif (self._offset + 2 >= len(self._document_str) or
-                    self._document_str[self._offset:self._offset + 3] !=
-                    '...'):
+            kind = self._next_kind()
+            if kind == '.':
                 self._raise_exception(
                     'Expected field name or "..."', self._offset)
+            elif kind != '...':
+                # Field query
+                field_query = self._read_field_query(base_type)
+                if (field_query.response_key !=
+                        field_query.field_descriptor.name):
+                    num_aliases += 1
+                    if (self._max_aliases is not None and
+                            num_aliases > self._max_aliases):
+                        self._raise_exception(
+                            'A selection set may not have more than {:d} '
+                            'aliases'.format(self._max_aliases),
+                            fragment_start)
+                field_queries_and_fragments.append(field_query)
             else:
-                self._offset += 3
-                prev_offset = self._offset
-                name = self._read_identifier()
-                self._offset = prev_offset
+                self._read_token()
+                name = self._peek_identifier()
                 if name == 'on':
                     # Anonymous fragment definition
                     fragment_reference = GraphQlFragmentReference(
@@ -287,9 +402,10 @@ class GraphQlParser(object):
                 self._fragment_reference_offsets[fragment_reference] = (
                     fragment_start)
             self._read_ignored_tokens(False)
-        self._offset += 1
+        self._read_token()
         if not field_queries_and_fragments:
             self._raise_exception('Expected field name or "..."', self._offset)
+        self._depth -= 1
         return GraphQlSelectionSet(base_type, field_queries_and_fragments)
 
     def _read_str_literal(self):
@@ -298,92 +414,13 @@ class GraphQlParser(object):
         return basestring - The value.
         """
         self._read_ignored_tokens(False)
-        start = self._offset
-        if self._document_str[self._offset] != '"':
-            self._raise_exception('Expected string literal', self._offset)
-        self._offset += 1
-
-        components = []
-        while (self._offset < len(self._document_str) and
-                self._document_str[self._offset] != '"'):
-            prev_offset = self._offset
-            char = self._document_str[self._offset]
-            self._offset += 1
-            if char < ' ' and char not in "\n\r\t":
-                self._raise_exception(
-                    'String literal contains illegal byte', start)
-            elif char != '\\':
-                components.append(char)
-            elif self._offset >= len(self._document_str):
-                self._raise_exception(
-                    'Unexpected end of document', self._offset)
-            else:
-                char = self._document_str[self._offset]
-                self._offset += 1
-                if char in '"/\\':
-                    components.append(char)
-                elif char == 'b':
-                    components.append("\b")
-                elif char == 'f':
-                    components.append("\f")
-                elif char == 'n':
-                    components.append("\n")
-                elif char == 'r':
-                    components.append("\r")
-                elif char == 't':
-                    components.append("\t")
-                elif char == 'u':
-                    if self._offset + 4 >= len(self._document_str):
-                        self._raise_exception(
-                            'Invalid Unicode escape sequence', prev_offset)
-                    hex_code = self._document_str[
-                        self._offset:self._offset + 4]
-                    try:
-                        code = int(hex_code, 16)
-                    except ValueError:
-                        self._raise_exception(
-                            'Invalid Unicode escape sequence', prev_offset)
-                    components.append(unichr(code))
-                    self._offset += 4
-
-        if self._offset >= len(self._document_str):
-            self._raise_exception('Unexpected end of document', self._offset)
-        self._offset += 1
-        return ''.join(components)
-
-    def _read_float_fraction(self):
-        """Read the fractional component of a floating point literal.
-
-        This consists of a decimal point followed by a sequence of
-        digits.
-        """
-        if self._document_str[self._offset] != '.':
-            self._raise_exception('Expected "."', self._offset)
-        self._offset += 1
-        if not ('0' <= self._document_str[self._offset] <= '9'):
-            self._raise_exception('Expected digit', self._offset)
-        self._offset += 1
-        while (self._offset < len(self._document_str) and
-                '0' <= self._document_str[self._offset] <= '9'):
-            self._offset += 1
-
-    def _read_float_exponent(self):
-        """Read the exponent component of a floating point literal.
-
-        This consists of the letter "e" followed by an optional sign and
-        a sequence of digits.
-        """
-        if self._document_str[self._offset] not in 'eE':
-            self._raise_exception('Expected "e"', self._offset)
-        self._offset += 1
-        if self._document_str[self._offset] in '+-':
-            self._offset += 1
-        if not ('0' <= self._document_str[self._offset] <= '9'):
-            self._raise_exception('Expected digit', self._offset)
-        self._offset += 1
-        while (self._offset < len(self._document_str) and
-                '0' <= self._document_str[self._offset] <= '9'):
-            self._offset += 1
+        kind, value, start, end = self._tokens[self._token_index]
+        if kind == GraphQlTokenKind.invalid_string:
+            self._raise_exception(value, end)
+        elif kind != GraphQlTokenKind.string:
+            self._raise_exception('Expected string literal', start)
+        self._read_token()
+        return value
 
     def _read_number_literal(self):
         """Read an integer or floating point literal value.
@@ -391,43 +428,17 @@ class GraphQlParser(object):
         return number - The value.
         """
         self._read_ignored_tokens(False)
-        start = self._offset
-        if self._document_str[self._offset] == '-':
-            self._offset += 1
-            if self._offset >= len(self._document_str):
-                self._raise_exception(
-                    'Unexpected end of document', self._offset)
-        if not ('0' <= self._document_str[self._offset] <= '9'):
+        kind, value, start, end = self._tokens[self._token_index]
+        if kind == GraphQlTokenKind.invalid_number:
+            self._raise_exception(value, end)
+        elif kind != GraphQlTokenKind.number:
             self._raise_exception('Could not parse number literal', start)
-        starts_with_zero = self._document_str[self._offset] == '0'
-        self._offset += 1
-
-        # Read the integer component
-        while self._offset < len(self._document_str):
-            char = self._document_str[self._offset]
-            if starts_with_zero and char == '0':
-                self._raise_exception('Could not parse number literal', start)
-            if not ('0' <= char <= '9'):
-                break
-            self._offset += 1
-
-        is_float = False
-        if self._offset < len(self._document_str):
-            if self._document_str[self._offset] == '.':
-                self._read_float_fraction()
-                is_float = True
-            if self._document_str[self._offset] in 'eE':
-                self._read_float_exponent()
-                is_float = True
-        if is_float:
-            return float(self._document_str[start:self._offset])
-        else:
-            value = int(self._document_str[start:self._offset])
-            if not (-2 ** 31 <= value < 2 ** 31):
-                self._raise_exception(
-                    'Integer literals must be between -2^31 and 2^31 - 1',
-                    start)
-            return value
+        self._read_token()
+        if (not isinstance(value, float) and
+                not (-2 ** 31 <= value < 2 ** 31)):
+            self._raise_exception(
+                'Integer literals must be between -2^31 and 2^31 - 1', start)
+        return value
 
     @staticmethod
     def verified_graphql_to_python(value, scalar_descriptor):
@@ -494,14 +505,15 @@ class GraphQlParser(object):
             t = t.value_type
 
         # Handle values other than literal scalars
-        if self._document_str[self._offset] == '$':
+        kind = self._next_kind()
+        if kind == '$':
             # Variable
             prev_offset = self._offset
-            self._offset += 1
+            self._read_token()
             reference = GraphQlVariableReference(self._read_identifier())
             self._variable_reference_offsets[reference] = prev_offset
             return reference
-        elif self._document_str[self._offset] == '[':
+        elif kind == '[':
             # List
             if not isinstance(t, GraphQlListType):
                 self._raise_exception(
@@ -509,22 +521,22 @@ class GraphQlParser(object):
                         initial_type.type_str()),
                     start)
             value = []
-            self._offset += 1
+            self._read_token()
             self._read_ignored_tokens(False)
-            while self._document_str[self._offset] != ']':
+            while self._next_kind() != ']':
                 value.append(
                     self._read_input_value_recursive(
                         t.element_type, initial_type, start))
                 self._read_ignored_tokens(False)
-            self._offset += 1
+            self._read_token()
             return value
-        elif self._document_str[self._offset] == '{':
+        elif kind == '{':
             # Input object
             input_object_start = self._offset
             value = {}
-            self._offset += 1
+            self._read_token()
             self._read_ignored_tokens(False)
-            while self._document_str[self._offset] != '}':
+            while self._next_kind() != '}':
                 prev_offset = self._offset
                 key = self._read_identifier()
                 if key in value:
@@ -535,13 +547,13 @@ class GraphQlParser(object):
                         'There is no such field {:s}.{:s}'.format(t.name, key),
                         prev_offset)
                 self._read_ignored_tokens(False)
-                if self._document_str[self._offset] != ':':
+                if self._next_kind() != ':':
                     self._raise_exception('Expected ":"', self._offset)
-                self._offset += 1
+                self._read_token()
                 value[key] = self._read_input_value_recursive(
                     t.fields[key], initial_type, start)
                 self._read_ignored_tokens(False)
-            self._offset += 1
+            self._read_token()
 
             # Check for required keys
             for key, value_type in t.fields.iteritems():
@@ -554,9 +566,11 @@ class GraphQlParser(object):
             return value
 
         # Read a scalar value
-        if self._document_str[self._offset] == '"':
+        if kind in (
+                GraphQlTokenKind.string, GraphQlTokenKind.invalid_string):
             value = self._read_str_literal()
-        elif self._document_str[self._offset] in '-0123456789':
+        elif kind in (
+                GraphQlTokenKind.number, GraphQlTokenKind.invalid_number):
             value = self._read_number_literal()
         else:
             prev_offset = self._offset
@@ -615,10 +629,10 @@ class GraphQlParser(object):
         self._read_ignored_tokens(False)
         start = self._offset
         args = {}
-        if self._document_str[self._offset] == '(':
-            self._offset += 1
+        if self._next_kind() == '(':
+            self._read_token()
             self._read_ignored_tokens(False)
-            while self._document_str[self._offset] != ')':
+            while self._next_kind() != ')':
                 # Read the argument name
                 prev_offset = self._offset
                 name = self._read_identifier()
@@ -631,9 +645,9 @@ class GraphQlParser(object):
                         'Duplicate argument {:s}'.format(name), prev_offset)
 
                 self._read_ignored_tokens(False)
-                if self._document_str[self._offset] != ':':
+                if self._next_kind() != ':':
                     self._raise_exception('Expected ":"', self._offset)
-                self._offset += 1
+                self._read_token()
 
                 # Read the argument value
                 value = self._read_input_value(types[name])
@@ -641,7 +655,7 @@ class GraphQlParser(object):
                 self._read_ignored_tokens(False)
             if not args:
                 self._raise_exception('Expected argument name', self._offset)
-            self._offset += 1
+            self._read_token()
 
         # Check required arguments
         for name, t in types.iteritems():
@@ -659,9 +673,9 @@ class GraphQlParser(object):
         """
         directives = []
         self._read_ignored_tokens(False)
-        while self._document_str[self._offset] == '@':
+        while self._next_kind() == '@':
             prev_offset = self._offset
-            self._offset += 1
+            self._read_token()
             name = self._read_identifier()
             directive_type = self._schema.directive(name)
             if directive_type is None:
@@ -705,14 +719,14 @@ class GraphQlParser(object):
         """
         self._read_ignored_tokens(False)
         start = self._offset
-        if self._document_str[self._offset] != '$':
+        if self._next_kind() != '$':
             self._raise_exception('Expected "$"', self._offset)
-        self._offset += 1
+        self._read_token()
         name = self._read_identifier()
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] != ':':
+        if self._next_kind() != ':':
             self._raise_exception('Expected ":"', self._offset)
-        self._offset += 1
+        self._read_token()
 
         # Read the type
         self._read_ignored_tokens(False)
@@ -727,7 +741,7 @@ class GraphQlParser(object):
 
         # Read the default value
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] != '=':
+        if self._next_kind() != '=':
             default_value = None
         elif isinstance(t, GraphQlNonNullType):
             self._raise_exception(
@@ -735,7 +749,7 @@ class GraphQlParser(object):
                 'type',
                 self._offset)
         else:
-            self._offset += 1
+            self._read_token()
             self._read_ignored_tokens(False)
             prev_offset = self._offset
             default_value = self._read_input_value(t)
@@ -757,10 +771,10 @@ class GraphQlParser(object):
         """
         self._read_ignored_tokens(False)
         variables = {}
-        if self._document_str[self._offset] == '(':
-            self._offset += 1
+        if self._next_kind() == '(':
+            self._read_token()
             self._read_ignored_tokens(False)
-            while self._document_str[self._offset] != ')':
+            while self._next_kind() != ')':
                 prev_offset = self._offset
                 variable = self._read_variable()
                 if variable.name in variables:
@@ -771,7 +785,7 @@ class GraphQlParser(object):
                 self._read_ignored_tokens(False)
             if not variables:
                 self._raise_exception('Expected "$"', self._offset)
-            self._offset += 1
+            self._read_token()
         return variables
 
     def _read_query(self):
@@ -780,12 +794,12 @@ class GraphQlParser(object):
         return GraphQlQuery - The query.
         """
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] not in '(@{':
+        if self._next_kind() not in ('(', '@', '{'):
             prev_offset = self._offset
             if self._read_identifier() != 'query':
                 self._raise_exception('Expected "query"', prev_offset)
             self._read_ignored_tokens(False)
-        if self._document_str[self._offset] in '(@{':
+        if self._next_kind() in ('(', '@', '{'):
             name = None
         else:
             name = self._read_identifier()
@@ -807,7 +821,7 @@ class GraphQlParser(object):
         if self._read_identifier() != 'mutation':
             self._raise_exception('Expected "mutation"', prev_offset)
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] in '(@{':
+        if self._next_kind() in ('(', '@', '{'):
             name = None
         else:
             name = self._read_identifier()
@@ -874,12 +888,11 @@ class GraphQlParser(object):
             read a fragment.
         """
         self._read_ignored_tokens(False)
-        if self._document_str[self._offset] in '{(@':
+        if self._next_kind() in ('{', '(', '@'):
             return self._read_query()
         else:
             prev_offset = self._offset
-            identifier = self._read_identifier()
-            self._offset = prev_offset
+            identifier = self._peek_identifier()
             if identifier == 'query':
                 return self._read_query()
             elif identifier == 'mutation':
@@ -900,7 +913,7 @@ class GraphQlParser(object):
         operation_names = set()
         self._read_ignored_tokens(False)
         anonymous_offset = None
-        while self._offset < len(self._document_str):
+        while self._next_kind() != GraphQlTokenKind.end:
             prev_offset = self._offset
             operation = self._read_operation_or_fragment()
             if operation is not None:
@@ -922,6 +935,7 @@ class GraphQlParser(object):
 
                 operations.append(operation)
                 operation_names.add(operation.name)
+                self._operation_offsets[operation] = prev_offset
             self._read_ignored_tokens(True)
         return operations
 
@@ -1187,7 +1201,58 @@ class GraphQlParser(object):
                     fragment_to_variable_uses, visited_fragments,
                     used_variables)
 
-    def _validate_single_field_selection_merging(self, selection_set, fields):
+    def _merge_field(self, fields, response_key, field, field_query):
+        """Add a field to "fields", raising if we cannot merge it.
+
+        Raise a GraphQlParseError if "fields" already has a different
+        field with the same response key.
+
+        dict<basestring, tuple<dict<basestring, object>,
+            GraphQlFieldQuery>> fields - The fields we have merged, as
+            in _validate_single_field_selection_merging.
+        basestring response_key - The response key of the field.
+        dict<basestring, object> field - The field, as in
+            _validate_single_field_selection_merging.
+        GraphQlFieldQuery field_query - The field query for the field.
+        """
+        other_field = fields.get(response_key)
+        if other_field is None:
+            fields[response_key] = (field, field_query)
+        elif field != other_field[0]:
+            self._raise_exception(
+                'Error merging {:s} key in selection set.  The field names, '
+                'return type, or arguments do not match.'.format(
+                    response_key),
+                self._field_query_offsets[field_query])
+
+    def _fragment_fields(self, fragment, fragment_fields):
+        """Return the merged fields of the specified fragment.
+
+        Raise a GraphQlParseError if we cannot merge the field queries
+        in the fragment's selection set.  We only merge each fragment's
+        fields once, so that checking a fragment that references other
+        fragments many times does not take exponential time.
+
+        GraphQlFragment fragment - The fragment.
+        dict<GraphQlFragment, OrderedDict> fragment_fields - A map from
+            each fragment whose fields we have merged to its fields.
+            _fragment_fields adds an entry for "fragment" if there is
+            none.
+        return OrderedDict<basestring, tuple<dict<basestring, object>,
+            GraphQlFieldQuery>> - The fields, as in the "fields"
+            argument to _validate_single_field_selection_merging, in the
+            order in which they first appear.
+        """
+        fields = fragment_fields.get(fragment)
+        if fields is None:
+            fields = collections.OrderedDict()
+            self._validate_single_field_selection_merging(
+                fragment.selection_set, fields, fragment_fields)
+            fragment_fields[fragment] = fields
+        return fields
+
+    def _validate_single_field_selection_merging(
+            self, selection_set, fields, fragment_fields):
         """Raise if we cannot merge a selection set's field queries.
 
         Raise a GraphQlParseError if there is an error merging the field
@@ -1195,24 +1260,31 @@ class GraphQlParser(object):
         "{foo, foo: bar}".
 
         GraphQlSelectionSet selection_set - The selection set to merge.
-            This is either the initial selection set we were checking or
-            a nested selection set from one of its fragments.
-        dict<basestring, dict<basestring, object>> fields - A map to the
-            fields we have checked thus far from their response keys, as
-            in GraphQlFieldQuery.response_key.  Each field has the
-            following entries:
+        dict<basestring, tuple<dict<basestring, object>,
+            GraphQlFieldQuery>> fields - A map to the fields we have
+            checked thus far from their response keys, as in
+            GraphQlFieldQuery.response_key.  Each value is a pair of the
+            field and the first field query for the response key.  Each
+            field has the following entries:
 
             args: A map from the names of the field's arguments to their
                 values, as in GraphQlFieldQuery.args.
             fieldType: The GraphQlType of the field's value.
             name: The name of the field.
+        dict<GraphQlFragment, OrderedDict> fragment_fields - A map from
+            each fragment whose fields we have merged to its fields, as
+            in _fragment_fields.
         """
         for field_query_or_fragment in (
                 selection_set.field_queries_and_fragments):
             if not isinstance(field_query_or_fragment, GraphQlFieldQuery):
-                # Recurse on a GraphQlFragment
-                self._validate_single_field_selection_merging(
-                    field_query_or_fragment.fragment.selection_set, fields)
+                # Merge the fields of a GraphQlFragment
+                for response_key, (field, field_query) in (
+                        self._fragment_fields(
+                            field_query_or_fragment.fragment,
+                            fragment_fields).iteritems()):
+                    self._merge_field(
+                        fields, response_key, field, field_query)
             else:
                 field_descriptor = field_query_or_fragment.field_descriptor
                 field = {
@@ -1220,17 +1292,12 @@ class GraphQlParser(object):
                     'fieldType': field_descriptor.field_type,
                     'name': field_descriptor.name,
                 }
-                if field_query_or_fragment.response_key not in fields:
-                    fields[field_query_or_fragment.response_key] = field
-                elif field != fields[field_query_or_fragment.response_key]:
-                    self._raise_exception(
-                        'Error merging {:s} key in selection set.  The field '
-                        'names, return type, or arguments do not '
-                        'match.'.format(field_query_or_fragment.response_key),
-                        self._field_query_offsets[field_query_or_fragment])
+                self._merge_field(
+                    fields, field_query_or_fragment.response_key, field,
+                    field_query_or_fragment)
 
     def _validate_field_selection_merging(
-            self, selection_set, named_fragments):
+            self, selection_set, named_fragments, fragment_fields):
         """Raise if we cannot merge a selection set's field queries.
 
         Raise a GraphQlParseError if there is an error merging the field
@@ -1241,19 +1308,59 @@ class GraphQlParser(object):
         GraphQlSelectionSet selection_set - The selection set to check.
         set<GraphQlFragment> named_fragments - The named fragment
             definitions.  Equivalent to set(self._fragments.values()).
+        dict<GraphQlFragment, OrderedDict> fragment_fields - A map from
+            each fragment whose fields we have merged to its fields, as
+            in _fragment_fields.
         """
         for field_query_or_fragment in (
                 selection_set.field_queries_and_fragments):
             if isinstance(field_query_or_fragment, GraphQlFieldQuery):
                 if field_query_or_fragment.selection_set is not None:
                     self._validate_single_field_selection_merging(
-                        field_query_or_fragment.selection_set, {})
+                        field_query_or_fragment.selection_set, {},
+                        fragment_fields)
                     self._validate_field_selection_merging(
-                        field_query_or_fragment.selection_set, named_fragments)
+                        field_query_or_fragment.selection_set, named_fragments,
+                        fragment_fields)
             elif field_query_or_fragment.fragment not in named_fragments:
                 self._validate_field_selection_merging(
                     field_query_or_fragment.fragment.selection_set,
-                    named_fragments)
+                    named_fragments, fragment_fields)
+
+    def _expanded_field_query_count(self, selection_set, fragment_counts):
+        """Return the number of field queries in a selection set.
+
+        Return the number of field queries in the specified selection
+        set, including those in nested selection sets, once we have
+        replaced each fragment reference with the fragment's field
+        queries.  Assume there are no fragment cycles.
+
+        GraphQlSelectionSet selection_set - The selection set.
+        dict<GraphQlFragment, int> fragment_counts - A map from each
+            fragment whose count we have computed to its count.  We add
+            entries for the fragments in selection_set.  This ensures
+            that computing the count takes linear time, even though the
+            count may be exponential in the size of the document.
+        return int - The number of field queries.
+        """
+        count = 0
+        for field_query_or_fragment in (
+                selection_set.field_queries_and_fragments):
+            if isinstance(field_query_or_fragment, GraphQlFieldQuery):
+                count += 1
+                if field_query_or_fragment.selection_set is not None:
+                    count += self._expanded_field_query_count(
+                        field_query_or_fragment.selection_set,
+                        fragment_counts)
+            else:
+                fragment = field_query_or_fragment.fragment
+                fragment_count = fragment_counts.get(fragment)
+                if fragment_count is None:
+                    fragment_count = self._expanded_field_query_count(
+                        fragment.selection_set, fragment_counts)
+                    fragment_counts[fragment] = fragment_count
+                count += fragment_count
+        return count
 
     def parse(self):
         """Parse the document string passed to the constructor.
@@ -1265,6 +1372,13 @@ class GraphQlParser(object):
 
         return GraphQlDocument - The document.
         """
+        if (self._max_length is not None and
+                len(self._document_str) > self._max_length):
+            self._raise_exception(
+                'The document is longer than the maximum of {:d} '
+                'characters'.format(self._max_length),
+                self._max_length)
+        self._tokens = GraphQlLexer(self._document_str).tokens()
         operations = self._read_operations_and_fragments()
 
         # Check for unused or undefined fragments
@@ -1317,6 +1431,19 @@ class GraphQlParser(object):
             self._assert_no_fragment_cycle(
                 fragment, [], set(), fragment_to_references, visited)
 
+        # Check the expanded sizes of the operations
+        if self._max_expanded_field_queries is not None:
+            fragment_counts = {}
+            for operation in operations:
+                count = self._expanded_field_query_count(
+                    operation.selection_set, fragment_counts)
+                if count > self._max_expanded_field_queries:
+                    self._raise_exception(
+                        'The operation has more than the maximum of {:d} '
+                        'field queries once we expand its '
+                        'fragments'.format(self._max_expanded_field_queries),
+                        self._operation_offsets[operation])
+
         # Validate variable uses
         for operation in operations:
             fragments = set()
@@ -1339,15 +1466,15 @@ class GraphQlParser(object):
                         self._variable_offsets[variable])
 
         # Validate selection set merging
+        fragment_fields = {}
         for operation in operations:
             self._validate_single_field_selection_merging(
-                operation.selection_set, {})
+                operation.selection_set, {}, fragment_fields)
             self._validate_field_selection_merging(
-                operation.selection_set, named_fragments)
+                operation.selection_set, named_fragments, fragment_fields)
         for fragment in self._fragments.itervalues():
-            self._validate_single_field_selection_merging(
-                fragment.selection_set, {})
+            self._fragment_fields(fragment, fragment_fields)
             self._validate_field_selection_merging(
-                fragment.selection_set, named_fragments)
+                fragment.selection_set, named_fragments, fragment_fields)
 
         return GraphQlDocument(self._schema, operations)
@@ -3,6 +3,7 @@ import unittest
 from graphql.document import GraphQlParser
 from graphql.document import GraphQlFieldQuery
 from graphql.document import GraphQlFragmentReference
+from graphql.document import GraphQlLexer
 from graphql.document import GraphQlParseError
 from graphql.schema import GraphQlSchemaFactory
 
@@ -152,6 +153,68 @@ class GraphQlParserTest(unittest.TestCase):
             schema).parse()
         GraphQlParser('{human(id: "#1000"){id}}', schema).parse()
 
+    def test_lexer(self):
+        """Test GraphQlLexer.tokens()."""
+        tokens = GraphQlLexer(
+            u'\ufeffquery Foo($a: [Int]!) # Comment\n'
+            '{...on Query{human(id: "1\\u00410\\n", x: -1.5e3, y: 12)}}'
+        ).tokens()
+        self.assertEqual(
+            [
+                ('name', 'query'), ('name', 'Foo'), ('(', '('), ('$', '$'),
+                ('name', 'a'), (':', ':'), ('[', '['), ('name', 'Int'),
+                (']', ']'), ('!', '!'), (')', ')'), ('{', '{'),
+                ('...', '...'), ('name', 'on'), ('name', 'Query'),
+                ('{', '{'), ('name', 'human'), ('(', '('), ('name', 'id'),
+                (':', ':'), ('string', '1A0\n'), ('name', 'x'), (':', ':'),
+                ('number', -1500.0), ('name', 'y'), (':', ':'),
+                ('number', 12), (')', ')'), ('}', '}'), ('}', '}'),
+                ('end', None),
+            ],
+            [(token[0], token[1]) for token in tokens])
+        self.assertEqual((1, 6), tokens[0][2:])
+        self.assertEqual(('name', 'Foo', 7, 10), tokens[1])
+
+        tokens = GraphQlLexer('{foo-bar 5abc "\x01"}').tokens()
+        self.assertEqual(
+            [
+                ('{', '{', 0, 1), ('word', 'foo-bar', 1, 8),
+                ('number', 5, 9, 10), ('name', 'abc', 10, 13),
+                ('invalid_string', 'String literal contains illegal byte',
+                 14, 14),
+            ],
+            tokens)
+        self.assertEqual(
+            ('invalid_number', 'Expected digit', 1, 4),
+            GraphQlLexer(' 12.e').tokens()[-1])
+
+    def test_error_location(self):
+        """Test the line and column of GraphQlParseErrors."""
+        schema = self._schema()
+        try:
+            GraphQlParser(
+                '{\n  human(id: "1000") {\n    id\n    foo-bar\n  }\n}',
+                schema).parse()
+            self.fail('Expected a GraphQlParseError')
+        except GraphQlParseError as error:
+            self.assertEqual(4, error.line)
+            self.assertEqual(5, error.column)
+            self.assertIn('Invalid GraphQL identifier', str(error))
+        try:
+            GraphQlParser('{human(id: "1000\n', schema).parse()
+            self.fail('Expected a GraphQlParseError')
+        except GraphQlParseError as error:
+            self.assertEqual(2, error.line)
+            self.assertEqual(1, error.column)
+            self.assertIn('Unexpected end of document', str(error))
+        try:
+            GraphQlParser('{human(id: 1.5e+x){id}}', schema).parse()
+            self.fail('Expected a GraphQlParseError')
+        except GraphQlParseError as error:
+            self.assertEqual(1, error.line)
+            self.assertEqual(17, error.column)
+            self.assertIn('Expected digit', str(error))
+
     def test_invalid_syntax(self):
         """Ensure that GraphQlParser raises on invalid syntax."""
         schema = self._schema()
@@ -273,6 +336,80 @@ class GraphQlParserTest(unittest.TestCase):
             GraphQlParser(
                 '@include(if: true) {human("123"){id}}', schema).parse()
 
+    def test_limits(self):
+        """Test the limits that GraphQlParser may impose on documents."""
+        schema = self._schema()
+        document_str = (
+            'query Foo {hero {friends {friends {name}}}}\n'
+            'query Bar {hero {...Baz}}\n'
+            'fragment Baz on Character {friends {name, a: id, b: id}}')
+        document = GraphQlParser(
+            document_str, schema, len(document_str), 4, 9, 2).parse()
+        self.assertEqual(2, len(document.operations))
+
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(
+                document_str, schema, len(document_str) - 1).parse()
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(document_str, schema, None, 3).parse()
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(document_str, schema, None, None, 8).parse()
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(document_str, schema, None, None, None, 1).parse()
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(
+                '{hero {... on Human {friends {... on Droid {name}}}}}',
+                schema, max_depth=4).parse()
+        GraphQlParser(
+            '{hero {... on Human {friends {... on Droid {name}}}}}', schema,
+            max_depth=5).parse()
+        GraphQlParser(
+            '{a: hero {id}, b: hero {id}, hero {c: id, d: id}}', schema,
+            max_aliases=2).parse()
+
+        with self.assertRaises(GraphQlParseError) as cm:
+            GraphQlParser(
+                '{hero {friends {friends {name}}}}', schema,
+                max_depth=2).parse()
+        self.assertEqual(1, cm.exception.line)
+        self.assertEqual(16, cm.exception.column)
+
+        document_str = '{hero {' * 1000 + 'id' + '}' * 2000
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(document_str, schema, max_depth=20).parse()
+
+    def test_fragment_explosion(self):
+        """Test GraphQlParser on documents with many layers of fragments."""
+        schema = self._schema()
+        fragments = []
+        for i in xrange(40):
+            fragments.append(
+                'fragment F{:d} on Character {{...F{:d}, ...F{:d}}}'.format(
+                    i, i + 1, i + 1))
+        fragments.append('fragment F40 on Character {id, name}')
+        document_str = '{{hero {{...F0}}}} {:s}'.format(' '.join(fragments))
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(document_str, schema).parse()
+        document = GraphQlParser(
+            document_str, schema, max_expanded_field_queries=None).parse()
+        self.assertEqual(1, len(document.operations))
+
+        document_str = (
+            '{hero {...F0}} fragment F0 on Character {...F1, ...F1} '
+            'fragment F1 on Character {...F2, ...F2} '
+            'fragment F2 on Character {id, name}')
+        GraphQlParser(
+            document_str, schema, max_expanded_field_queries=9).parse()
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(
+                document_str, schema, max_expanded_field_queries=8).parse()
+
+        fragments[-1] = 'fragment F40 on Character {id, id: name}'
+        document_str = '{{hero {{...F0}}}} {:s}'.format(' '.join(fragments))
+        with self.assertRaises(GraphQlParseError):
+            GraphQlParser(
+                document_str, schema, max_expanded_field_queries=None).parse()
+
     def test_invalid_variables(self):
         """Ensure that GraphQlParser raises on invalid variables."""
         schema = self._schema()
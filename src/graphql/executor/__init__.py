@@ -1,11 +1,27 @@
 """Provides the ability to execute a GraphQlDocument."""
 
+from apollo_tracer import GraphQlApolloTracer
+from composite_tracer import GraphQlCompositeTracer
 from context import GraphQlContext
+from cost_analyzer import GraphQlCostAnalyzer
+from document_cache import GraphQlDocumentCache
 from errors import GraphQlBadScalarDescriptorError
 from errors import GraphQlExecutionError
 from errors import GraphQlFieldTypeError
 from errors import GraphQlOperationNameError
+from errors import GraphQlQueryCostError
+from errors import GraphQlResponseSizeError
+from errors import GraphQlTimeoutError
 from errors import GraphQlVariablesError
 from executor import GraphQlExecutor
+from latency_stats import GraphQlLatencyStats
+from loader import GraphQlDeferredValue
+from loader import GraphQlLoader
+from loader import GraphQlLoaderRegistry
+from result_access import GraphQlResultAccess
+from result_object import GraphQlResultObject
 from root_mutation_object import GraphQlRootMutationObject
 from root_query_object import GraphQlRootQueryObject
+from stats import GraphQlStats
+from stats_tracer import GraphQlStatsTracer
+from tracer import GraphQlTracer
@@ -0,0 +1,90 @@
+import datetime
+import timeit
+
+from tracer import GraphQlTracer
+
+
+class GraphQlApolloTracer(GraphQlTracer):
+    """A GraphQlTracer that reports the field timings in the response.
+
+    GraphQlApolloTracer adds a "tracing" entry to the "extensions" entry
+    of the response, in the format of the Apollo Tracing extension
+    (version 1), so that tools that understand Apollo Tracing can
+    display the timings of the fields.  It only reports the "execution"
+    phase.  A GraphQlApolloTracer should only be used for a single
+    execution, so GraphQlContext.tracer() should return a new instance
+    each time.
+    """
+
+    # Private attributes:
+    # datetime _end_datetime - The UTC time at which we finished executing
+    #     the document.
+    # float _end_time - The time at which we finished executing the
+    #     document, as returned by timeit.default_timer().
+    # list<dict<basestring, object>> _resolvers - The "resolvers" entry of
+    #     the tracing information.
+    # datetime _start_datetime - The UTC time at which we started executing
+    #     the document.
+    # float _start_time - The time at which we started executing the
+    #     document, as returned by timeit.default_timer().
+
+    def __init__(self, sample_rate=1):
+        super(GraphQlApolloTracer, self).__init__(sample_rate)
+        self._resolvers = []
+        self._start_datetime = None
+        self._start_time = None
+        self._end_datetime = None
+        self._end_time = None
+
+    def execute_start(self, operation_name):
+        self._start_datetime = datetime.datetime.utcnow()
+        self._start_time = timeit.default_timer()
+
+    def execute_end(self, errors):
+        self._end_datetime = datetime.datetime.utcnow()
+        self._end_time = timeit.default_timer()
+
+    def field_end(
+            self, path, parent_type, field, arguments, start_time, duration,
+            exception):
+        self._resolvers.append({
+            'duration': GraphQlApolloTracer._nanoseconds(duration),
+            'fieldName': field.descriptor.name,
+            'parentType': parent_type.name,
+            'path': list(path),
+            'returnType': field.descriptor.field_type.type_str(),
+            'startOffset': GraphQlApolloTracer._nanoseconds(
+                start_time - self._start_time),
+        })
+
+    @staticmethod
+    def _nanoseconds(seconds):
+        """Return the specified number of seconds, in whole nanoseconds."""
+        return int(round(seconds * 1e9))
+
+    @staticmethod
+    def _format_datetime(dt):
+        """Return the RFC 3339 representation of the specified UTC time.
+
+        datetime dt - The time.
+        return str - The representation, e.g.
+            '2017-07-28T14:20:32.106Z'.
+        """
+        return '{:s}.{:03d}Z'.format(
+            dt.strftime('%Y-%m-%dT%H:%M:%S'), dt.microsecond // 1000)
+
+    def extensions(self):
+        if self._start_time is None or self._end_time is None:
+            return None
+        return {
+            'tracing': {
+                'duration': GraphQlApolloTracer._nanoseconds(
+                    self._end_time - self._start_time),
+                'endTime': GraphQlApolloTracer._format_datetime(
+                    self._end_datetime),
+                'execution': {'resolvers': self._resolvers},
+                'startTime': GraphQlApolloTracer._format_datetime(
+                    self._start_datetime),
+                'version': 1,
+            },
+        }
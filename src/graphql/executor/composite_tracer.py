@@ -0,0 +1,67 @@
+from tracer import GraphQlTracer
+
+
+class GraphQlCompositeTracer(GraphQlTracer):
+    """A GraphQlTracer that passes the events on to several tracers.
+
+    GraphQlContext.tracer() returns a single tracer, so to use several
+    tracers at once, e.g. a GraphQlStatsTracer that records every
+    execution and a GraphQlApolloTracer that traces a sample of them,
+    we may return a GraphQlCompositeTracer that wraps them.  Each of the
+    tracers decides whether to trace the execution using its own
+    is_sampled() method, and GraphQlCompositeTracer only passes the
+    events on to the tracers that are tracing it.  The "extensions"
+    entries of the response include the entries of each of those
+    tracers.  A GraphQlCompositeTracer should only be used for a single
+    execution, so GraphQlContext.tracer() should return a new instance
+    each time.
+
+    Public attributes:
+
+    list<GraphQlTracer> tracers - The tracers to which we pass the
+        events.
+    """
+
+    # Private attributes:
+    # list<GraphQlTracer> _sampled_tracers - The elements of "tracers" that
+    #     are tracing the current execution, as determined by is_sampled().
+
+    def __init__(self, tracers):
+        super(GraphQlCompositeTracer, self).__init__()
+        self.tracers = list(tracers)
+        self._sampled_tracers = []
+
+    def is_sampled(self):
+        self._sampled_tracers = [
+            tracer for tracer in self.tracers if tracer.is_sampled()]
+        return bool(self._sampled_tracers)
+
+    def execute_start(self, operation_name):
+        for tracer in self._sampled_tracers:
+            tracer.execute_start(operation_name)
+
+    def execute_end(self, errors):
+        for tracer in self._sampled_tracers:
+            tracer.execute_end(errors)
+
+    def field_start(self, path, parent_type, field, arguments):
+        for tracer in self._sampled_tracers:
+            tracer.field_start(path, parent_type, field, arguments)
+
+    def field_end(
+            self, path, parent_type, field, arguments, start_time, duration,
+            exception):
+        for tracer in self._sampled_tracers:
+            tracer.field_end(
+                path, parent_type, field, arguments, start_time, duration,
+                exception)
+
+    def extensions(self):
+        extensions = None
+        for tracer in self._sampled_tracers:
+            tracer_extensions = tracer.extensions()
+            if tracer_extensions:
+                if extensions is None:
+                    extensions = {}
+                extensions.update(tracer_extensions)
+        return extensions
@@ -1,6 +1,15 @@
 import logging
 
+try:
+    import concurrent.futures
+    _FUTURE_TYPES = (concurrent.futures.Future,)
+except ImportError:
+    _FUTURE_TYPES = ()
+
+from document_cache import GraphQlDocumentCache
 from graphql.document import GraphQlParseError
+from loader import GraphQlLoaderRegistry
+from result_access import GraphQlResultAccess
 
 logger = logging.getLogger(__name__)
 
@@ -21,19 +30,28 @@ class GraphQlContext(object):
 
     Public attributes:
 
+    GraphQlLoaderRegistry loaders - The loaders that methods that return
+        the values of GraphQL fields may use to load values in batches.
+        This is available as the "loaders" context argument.  Since
+        loaders cache the values they load, we should typically create a
+        new GraphQlContext for each request.
     GraphQlSchema schema - The schema the GraphQL documents use.
     """
 
     def __init__(self, schema):
         self.schema = schema
+        self.loaders = GraphQlLoaderRegistry()
 
     def context_arg(self, name):
         """Return the context argument with the specified name.
 
         Raise a ValueError if there is no such context argument.  The
         set of available context arguments depends on the particular
-        GraphQlContext subclass.  The base class does not support any
-        context arguments.
+        GraphQlContext subclass.  The base class only supports the
+        "loaders" context argument, which is equal to the "loaders"
+        attribute.  Subclasses should call the base class's
+        implementation for any names they do not recognize, so that this
+        context argument remains available.
 
         "Context arguments" are values that methods that return the
         values of GraphQL fields may obtain.  For example, on a web
@@ -46,6 +64,8 @@ class GraphQlContext(object):
         basestring name - The name.
         return mixed - The context argument.
         """
+        if name == 'loaders':
+            return self.loaders
         raise ValueError(u'Unknown context argument {:s}'.format(name))
 
     def exception_errors(self, exception, exception_info):
@@ -73,6 +93,252 @@ class GraphQlContext(object):
         else:
             return [{'message': str(exception)}]
 
+    def document_cache(self):
+        """Return the cache to use for parsing document strings, if any.
+
+        GraphQlExecutor.execute uses the return value to avoid
+        re-parsing document strings it has already parsed.  Return None
+        if we should parse each document string from scratch.  By
+        default, this returns the shared GraphQlDocumentCache.
+
+        return GraphQlDocumentCache - The cache.
+        """
+        return GraphQlDocumentCache.instance()
+
+    def parser_limits(self):
+        """Return the limits to impose on the document strings we parse.
+
+        GraphQlExecutor.execute passes the limits to GraphQlParser, so
+        that it rejects documents that exceed them with a
+        GraphQlParseError.  This is useful for protecting a server from
+        hostile documents, such as very long or deeply nested ones.  By
+        default, this returns an empty map, meaning there are no limits.
+
+        return dict<basestring, int> - A map from the names of the
+            keyword arguments to GraphQlParser's constructor for the
+            limits, such as "max_depth", to their values.
+        """
+        return {}
+
+    def deadline(self):
+        """Return the time by which we must finish executing the document.
+
+        GraphQlExecutor checks the deadline between field resolutions.
+        Once it passes, the executor stops resolving fields.  It sets
+        each remaining nullable field to null, propagating null values
+        for non-null fields as usual, and it adds a GraphQlTimeoutError
+        to the "errors" entry of the result.  The partial result still
+        passes through execute_document_end and the like.  By default,
+        this returns None, meaning there is no deadline.  See also the
+        "timeout" argument to GraphQlExecutor.execute.
+
+        return float - The deadline, as returned by time.time(), or None.
+        """
+        return None
+
+    def response_size_limits(self):
+        """Return the limits to impose on the size of the response.
+
+        GraphQlExecutor keeps track of the approximate size of the
+        response as it executes the document: the number of JSON objects
+        and an estimate of the number of bytes in the JSON encoding.
+        Once this exceeds the limits, it aborts execution, and the
+        response consists of a GraphQlResponseSizeError.  This protects
+        a server from running out of memory on a query for a huge list.
+        By default, this returns an empty map, meaning there are no
+        limits and we do not measure the response.
+
+        return dict<basestring, int> - A map from the names of the
+            limits, "max_objects" and "max_bytes", to their values.
+        """
+        return {}
+
+    def prefetch_modules(self):
+        """Return whether to import the modules a document needs in advance.
+
+        GraphQlSchemas import the modules containing the classes,
+        functions, scalar descriptors, and enumerations they refer to on
+        demand, the first time a document uses them.  If this returns
+        True, then once we determine the operation to execute, we start
+        importing the modules that it may need and that we have not
+        imported yet on a background thread, in parallel with the rest
+        of the execution.  See also GraphQlSchema.warm_up and
+        GraphQlImportTracker, which reports the time we spend importing
+        modules on the request path.  The default implementation
+        returns False.
+
+        return bool - Whether to prefetch modules.
+        """
+        return False
+
+    def single_pass_serialization(self):
+        """Return whether to validate field values as we serialize them.
+
+        By default, GraphQlExecutor checks that the entire value of each
+        field has the correct type before it serializes the value and
+        obtains the values of any nested fields.  If this returns True,
+        it performs the check and the serialization in a single
+        traversal of the value instead.  The results are the same, but
+        if the value does not have the correct type, we may already
+        have obtained some of the nested fields' values, and discarded
+        the results, by the time we find out.  Mutation fields are
+        always checked before we obtain any nested fields.  The default
+        implementation returns False.
+
+        return bool - Whether to use single-pass serialization.
+        """
+        return False
+
+    def compact_results(self):
+        """Return whether to represent object results as GraphQlResultObjects.
+
+        By default, GraphQlExecutor represents the result of executing
+        the selection sets of each object value as an OrderedDict.  If
+        this returns True, it uses GraphQlResultObjects instead, which
+        require far fewer Python objects.  This applies to all of the
+        objects in the "data" entry of the response, apart from "data"
+        itself, including those that the hooks receive.  Such a result
+        may not be passed to json.dumps; we may use
+        GraphQlExecutor.encode_json or GraphQlExecutor.execute_chunks
+        instead.  The default implementation returns False.
+
+        return bool - Whether to use GraphQlResultObjects.
+        """
+        return False
+
+    def result_access(self, method_name):
+        """Return how the specified hook method should receive the result.
+
+        This applies to the "result" arguments of
+        execute_document_str_end, execute_document_end, and extensions.
+        Copying a large result is expensive, so a subclass that
+        overrides one of these methods may override result_access to
+        indicate that the method does not need its own copy.  By
+        default, this returns GraphQlResultAccess.copy for the methods
+        that the context overrides, and GraphQlResultAccess.none for the
+        others.
+
+        basestring method_name - The name of the method, e.g.
+            "extensions".
+        return int - The GraphQlResultAccess constant.
+        """
+        method = getattr(self, method_name)
+        if (getattr(method, '__func__', None) is
+                getattr(GraphQlContext, method_name).__func__):
+            return GraphQlResultAccess.none
+        else:
+            return GraphQlResultAccess.copy
+
+    def root_field_thread_pool(self):
+        """Return the thread pool for executing root query fields, if any.
+
+        If this returns a thread pool, GraphQlExecutor executes the root
+        fields of each query operation in parallel, by submitting a task
+        for each root field to the pool, and assembles the results in
+        the order in which the fields appear in the document.  This is
+        useful for queries with many independent root fields that block
+        on I/O.  It does not apply to mutations, which we always perform
+        one at a time.
+
+        The results are the same as with serial execution.  The errors
+        are also the same and appear in the same order, except that the
+        errors for batched fields and GraphQlDeferredValues appear with
+        the errors for their root fields, rather than after the other
+        errors.  However, the methods of the fields and the loaders, as
+        well as exception_errors and context_arg, may be called on the
+        pool's threads, so they must be thread-safe.  Batched fields and
+        loaders only gather values within the same root field.  The
+        default implementation returns None.
+
+        return object - The thread pool, such as a
+            concurrent.futures.ThreadPoolExecutor, or None if we should
+            execute the root fields serially.  Its "submit" method must
+            behave like concurrent.futures.Executor.submit.
+        """
+        return None
+
+    def future_types(self):
+        """Return the types of field values that GraphQlExecutor waits for.
+
+        A method that returns the value of a GraphQL field may return a
+        future, such as a concurrent.futures.Future for work it has
+        submitted to a thread pool, instead of the value itself.  If the
+        value of a field is an instance of one of the returned types,
+        GraphQlExecutor continues executing the rest of the document and
+        only calls the future's "result" method once it has encountered
+        the other futures at the same level, so that their work may
+        overlap.  The result may be another future.  We wait for the
+        futures of mutation fields immediately, so that we perform the
+        mutations one at a time.  By default, this returns
+        (concurrent.futures.Future,) if the concurrent.futures module is
+        available and () otherwise.
+
+        return tuple<type> - The types.  Their instances must have a
+            "result" method that takes no arguments and behaves like
+            concurrent.futures.Future.result.
+        """
+        return _FUTURE_TYPES
+
+    def tracer(self):
+        """Return the GraphQlTracer to notify of field events, if any.
+
+        GraphQlExecutor calls this once at the beginning of each
+        execution of a document, and it only traces the execution if
+        this returns a GraphQlTracer whose is_sampled() method returns
+        True.  Otherwise, it does not do any tracing work.  Tracers that
+        keep track of the events, such as GraphQlApolloTracer, should
+        not be reused, so this should typically return a new tracer each
+        time.  To use several tracers, we may return a
+        GraphQlCompositeTracer.  The default implementation returns None.
+
+        return GraphQlTracer - The tracer, or None.
+        """
+        return None
+
+    def cost_analyzer(self):
+        """Return the GraphQlCostAnalyzer for limiting the cost of operations.
+
+        If this returns a GraphQlCostAnalyzer, GraphQlExecutor uses it to
+        estimate the cost of each operation before executing it.  It
+        passes the cost to query_cost, and if the cost exceeds the
+        analyzer's max_cost, it does not execute the operation, and the
+        response consists of a GraphQlQueryCostError.  The default
+        implementation returns None, in which case we do not estimate
+        the cost.
+
+        return GraphQlCostAnalyzer - The analyzer, or None.
+        """
+        return None
+
+    def query_cost(self, operation_name, cost):
+        """Respond to estimating the cost of the operation to execute.
+
+        We call this before executing the operation, and before
+        rejecting it if the cost exceeds the maximum.  See
+        cost_analyzer.
+
+        basestring operation_name - The name of the operation, or None
+            if it is anonymous.
+        number cost - The cost, as in
+            GraphQlCostAnalyzer.operation_cost.
+        """
+        pass
+
+    def response_size(self, num_objects, num_bytes):
+        """Respond to finishing measuring the size of the response.
+
+        We call this when we finish executing an operation, or when we
+        abort it because the response is too large, before calling
+        execute_document_end and the like.  This lets "extensions"
+        report the size.  We only call it if response_size_limits()
+        returns a non-empty map.
+
+        int num_objects - The number of JSON objects in the response.
+        int num_bytes - The estimated number of bytes in the JSON
+            encoding of the response.
+        """
+        pass
+
     def execute_document_str_start(self, document_str, operation_name):
         """Respond to starting to execute a document from a document string.
 
@@ -91,7 +357,9 @@ class GraphQlContext(object):
 
         This is for when we execute a document from a document string.
         We do not call this when we execute a document from a
-        GraphQlDocument object rather than a string.
+        GraphQlDocument object rather than a string.  We call this even
+        if we obtained the document from document_cache() rather than
+        parsing it.
 
         GraphQlDocument document - The document we are executing.
         basestring operation_name - The name of the operation we are
@@ -113,11 +381,12 @@ class GraphQlContext(object):
             executing.  This may be None if the document only has one
             operation.
         dict<basestring, object> result - The execution response,
-            excluding the "extensions" entry.
+            excluding the "extensions" entry, or None.  See
+            result_access.
         Exception exception - The exception we encountered, if any.
             This is only for exceptions that propagate to the root
-            level: GraphQlParseErrors, GraphQlOperationNameErrors, and
-            GraphQlVariablesErrors.
+            level: GraphQlParseErrors, GraphQlOperationNameErrors,
+            GraphQlVariablesErrors, and GraphQlQueryCostErrors.
         tuple<type, mixed, traceback> exception_info - Information about
             the exception we encountered, as returned by sys.exc_info(),
             or None if "excepction" is None.
@@ -149,11 +418,13 @@ class GraphQlContext(object):
             executing.  This may be None if the document only has one
             operation.
         dict<basestring, object> result - The execution response,
-            excluding the "extensions" entry.
+            excluding the "extensions" entry, or None.  See
+            result_access.
         Exception exception - The exception we encountered, if any.
             This is only for exceptions that propagate to the root
             level: GraphQlParseErrors, GraphQlOperationNameErrors,
-            GraphQlVariablesErrors, and GraphQlSchemaMismatchErrors.
+            GraphQlVariablesErrors, GraphQlQueryCostErrors, and
+            GraphQlSchemaMismatchErrors.
         tuple<type, mixed, traceback> exception_info - Information about
             the exception we encountered, as returned by sys.exc_info(),
             or None if "excepction" is None.
@@ -168,11 +439,13 @@ class GraphQlContext(object):
         execute_document_end.
 
         dict<basestring, object> result - The execution response,
-            excluding the "extensions" entry.
+            excluding the "extensions" entry, or None.  See
+            result_access.
         Exception exception - The exception we encountered, if any.
             This is only for exceptions that propagate to the root
             level: GraphQlParseErrors, GraphQlOperationNameErrors,
-            GraphQlVariablesErrors, and GraphQlSchemaMismatchErrors.
+            GraphQlVariablesErrors, GraphQlQueryCostErrors, and
+            GraphQlSchemaMismatchErrors.
         tuple<type, mixed, traceback> exception_info - Information about
             the exception we encountered, as returned by sys.exc_info(),
             or None if "excepction" is None.
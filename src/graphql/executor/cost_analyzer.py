@@ -0,0 +1,221 @@
+from errors import GraphQlOperationNameError
+from graphql.document import GraphQlFragmentReference
+from graphql.document import GraphQlVariableReference
+from graphql.schema import GraphQlListType
+from graphql.schema import GraphQlNonNullType
+from graphql.schema import GraphQlObjectType
+
+
+class GraphQlCostAnalyzer(object):
+    """Estimates the cost of executing GraphQL operations.
+
+    GraphQlCostAnalyzer computes the cost of an operation statically,
+    from the document alone, without calling any of the fields'
+    methods.  This lets us reject expensive operations, such as deeply
+    nested queries of lists of friends of friends, before we start
+    executing them.  To do so, GraphQlContext.cost_analyzer() should
+    return a GraphQlCostAnalyzer with a max_cost.
+
+    The cost of querying a selection set on an object is the sum of the
+    costs of its fields.  The cost of a field is GraphQlField.cost, plus
+    the field's multiplier times the cost of querying the field's
+    selection set on a single object.  The multiplier is an estimate of
+    the number of objects in the field's value.  We specify a field's
+    cost and multiplier using the "cost" and "multiplier" arguments to
+    graphql_field and the like.  By default, the multiplier is
+    default_multiplier for list fields and 1 for other fields.
+
+    If the selection set is on an interface or union, the cost is the
+    maximum cost over the object types that implement it.  We do not
+    count introspection fields such as __typename and __schema, and we
+    count fields that have @include and @skip directives as if they
+    were included.
+
+    Public attributes:
+
+    number default_cost - The cost of a field whose GraphQlField.cost
+        is None.
+    int default_multiplier - The multiplier of a list field whose
+        GraphQlField.multiplier is None, or whose multiplier argument is
+        absent.
+    number max_cost - The maximum cost of an operation that
+        GraphQlExecutor executes, or None if there is no maximum.
+        GraphQlExecutor rejects operations that exceed this with a
+        GraphQlQueryCostError.
+    """
+
+    def __init__(self, max_cost=None, default_cost=1, default_multiplier=10):
+        self.max_cost = max_cost
+        self.default_cost = default_cost
+        self.default_multiplier = default_multiplier
+
+    def _multiplier(self, field, arguments, variables):
+        """Return the multiplier for a field query.
+
+        GraphQlField field - The field.
+        dict<basestring, object> arguments - The arguments of the field
+            query, as in GraphQlFieldQuery.args.
+        dict<basestring, object> variables - A map from the names of the
+            variables to their values.
+        return number - The multiplier.
+        """
+        multiplier = field.multiplier
+        if isinstance(multiplier, basestring):
+            value = arguments.get(multiplier)
+            if isinstance(value, GraphQlVariableReference):
+                value = variables.get(value.name)
+            if (isinstance(value, (int, long, float)) and
+                    not isinstance(value, bool)):
+                return max(value, 0)
+            multiplier = None
+        if multiplier is not None:
+            return multiplier
+
+        field_type = field.descriptor.field_type
+        if isinstance(field_type, GraphQlNonNullType):
+            field_type = field_type.value_type
+        if isinstance(field_type, GraphQlListType):
+            return self.default_multiplier
+        else:
+            return 1
+
+    @staticmethod
+    def _append_field_queries(selection_set, object_type, field_queries):
+        """Append the field queries that apply to object_type to field_queries.
+
+        This includes the field queries in fragments whose types match
+        object_type, regardless of any directives.
+
+        GraphQlSelectionSet selection_set - The selection set.
+        GraphQlObjectType object_type - The type of the object we are
+            querying.
+        list<GraphQlFieldQuery> field_queries - The list to which to
+            append the field queries.
+        """
+        for field_query_or_fragment in (
+                selection_set.field_queries_and_fragments):
+            if not isinstance(
+                    field_query_or_fragment, GraphQlFragmentReference):
+                field_queries.append(field_query_or_fragment)
+            elif object_type.is_subtype(
+                    field_query_or_fragment.fragment.object_type):
+                GraphQlCostAnalyzer._append_field_queries(
+                    field_query_or_fragment.fragment.selection_set,
+                    object_type, field_queries)
+
+    def _object_cost(self, selection_sets, object_type, variables, costs):
+        """Return the cost of querying selection sets on an object.
+
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets.
+        GraphQlObjectType object_type - The type of the object.
+        dict<basestring, object> variables - A map from the names of the
+            variables to their values.
+        dict<tuple<tuple<GraphQlSelectionSet>, GraphQlBaseType>, number>
+            costs - A map from the selection sets and type of each
+            selection set query whose cost we have computed to its cost.
+        return number - The cost.
+        """
+        field_queries = []
+        for selection_set in selection_sets:
+            GraphQlCostAnalyzer._append_field_queries(
+                selection_set, object_type, field_queries)
+        response_keys = []
+        response_key_to_field_queries = {}
+        for field_query in field_queries:
+            response_key = field_query.response_key
+            if response_key not in response_key_to_field_queries:
+                response_keys.append(response_key)
+            response_key_to_field_queries.setdefault(response_key, []).append(
+                field_query)
+
+        cost = 0
+        for response_key in response_keys:
+            field_queries = response_key_to_field_queries[response_key]
+            field = object_type.fields.get(
+                field_queries[0].field_descriptor.name)
+            if field is None:
+                # Implicit field
+                continue
+            if field.cost is not None:
+                cost += field.cost
+            else:
+                cost += self.default_cost
+            if field_queries[0].selection_set is not None:
+                child_selection_sets = tuple([
+                    field_query.selection_set
+                    for field_query in field_queries])
+                cost += (
+                    self._multiplier(field, field_queries[0].args, variables) *
+                    self._selection_sets_cost(
+                        child_selection_sets,
+                        field.descriptor.field_type.base_type(), variables,
+                        costs))
+        return cost
+
+    def _selection_sets_cost(
+            self, selection_sets, base_type, variables, costs):
+        """Return the cost of querying selection sets on a value of a type.
+
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets.
+        GraphQlBaseType base_type - The type of the value.
+        dict<basestring, object> variables - A map from the names of the
+            variables to their values.
+        dict<tuple<tuple<GraphQlSelectionSet>, GraphQlBaseType>, number>
+            costs - A map from the selection sets and type of each
+            selection set query whose cost we have computed to its cost.
+        return number - The cost.
+        """
+        key = (selection_sets, base_type)
+        cost = costs.get(key)
+        if cost is None:
+            if isinstance(base_type, GraphQlObjectType):
+                object_types = [base_type]
+            else:
+                object_types = [
+                    leaf_type for leaf_type in base_type.leaf_types()
+                    if isinstance(leaf_type, GraphQlObjectType)]
+            cost = 0
+            for object_type in object_types:
+                cost = max(
+                    cost,
+                    self._object_cost(
+                        selection_sets, object_type, variables, costs))
+            costs[key] = cost
+        return cost
+
+    def operation_cost(self, operation, variables={}):
+        """Return the estimated cost of executing the specified operation.
+
+        GraphQlOperation operation - The operation.
+        dict<basestring, object> variables - A map from the names of the
+            variables to the Python object representations of their
+            values.  We only use these for multipliers that refer to
+            arguments whose values are variable references.
+        return number - The cost.
+        """
+        return self._selection_sets_cost(
+            (operation.selection_set,), operation.selection_set.base_type,
+            variables, {})
+
+    def document_cost(self, document, operation_name=None, variables={}):
+        """Return the estimated cost of executing an operation in a document.
+
+        Raise a GraphQlOperationNameError if there is no such operation.
+
+        GraphQlDocument document - The document.
+        basestring operation_name - The name of the operation.  This may
+            be None if the document only has one operation.
+        dict<basestring, object> variables - The variables, as in
+            operation_cost.
+        return number - The cost.
+        """
+        if operation_name is None:
+            if len(document.operations) != 1:
+                raise GraphQlOperationNameError(
+                    'Must specify the operation name')
+            return self.operation_cost(document.operations[0], variables)
+        for operation in document.operations:
+            if operation.name == operation_name:
+                return self.operation_cost(operation, variables)
+        raise GraphQlOperationNameError(
+            u'There is no operation named {:s}'.format(operation_name))
@@ -0,0 +1,136 @@
+import collections
+import threading
+
+from graphql.document import GraphQlParser
+
+
+class GraphQlDocumentCache(object):
+    """A bounded cache of parsed GraphQlDocuments.
+
+    GraphQlDocumentCache maps each document string, GraphQlSchema, and
+    set of parser limits to the GraphQlDocument we obtain by parsing the
+    string using the schema and limits.  When the cache is full, we
+    evict the least recently used document.  GraphQlDocumentCache is
+    thread-safe.
+
+    By default, GraphQlExecutor.execute uses the shared instance
+    returned by instance() to avoid re-parsing documents it has already
+    parsed.  See GraphQlContext.document_cache.
+
+    Public attributes:
+
+    int evictions - The number of documents we have evicted from the
+        cache to make room for other documents.
+    int hits - The number of calls to "document" that found the
+        document in the cache.
+    int misses - The number of calls to "document" that had to parse the
+        document string.
+    """
+
+    # The default maximum number of documents to store.
+    _DEFAULT_MAX_SIZE = 1000
+
+    # The singleton instance of GraphQlDocumentCache, or None if we have not
+    # created this yet.
+    _instance = None
+
+    # The lock for creating _instance
+    _instance_lock = threading.Lock()
+
+    # Private attributes:
+    # OrderedDict<tuple, GraphQlDocument> _documents - A map from the document
+    #     string, schema, and sorted limit items of each cached document to
+    #     the document, ordered from least recently used to most recently
+    #     used.
+    # Lock _lock - The lock for accessing the cache.
+    # int _max_size - The maximum number of documents to store.
+
+    def __init__(self, max_size=_DEFAULT_MAX_SIZE):
+        if max_size < 0:
+            raise ValueError('The maximum size may not be negative')
+        self._max_size = max_size
+        self._documents = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def instance():
+        """Return the shared GraphQlDocumentCache."""
+        if GraphQlDocumentCache._instance is None:
+            with GraphQlDocumentCache._instance_lock:
+                if GraphQlDocumentCache._instance is None:
+                    GraphQlDocumentCache._instance = GraphQlDocumentCache()
+        return GraphQlDocumentCache._instance
+
+    def _evict(self, max_size):
+        """Evict least recently used documents until we have at most max_size.
+
+        Assume we have acquired _lock.
+        """
+        while len(self._documents) > max_size:
+            self._documents.popitem(False)
+            self.evictions += 1
+
+    def document(self, document_str, schema, limits={}):
+        """Return the GraphQlDocument for the specified document string.
+
+        Return the cached document if there is one.  Otherwise, parse
+        the document string and add the result to the cache.  Raise a
+        GraphQlParseError if the document is malformed.  We do not cache
+        malformed documents.
+
+        basestring document_str - The document string.
+        GraphQlSchema schema - The schema the document is using.
+        dict<basestring, int> limits - The limits to impose on the
+            document, as in GraphQlContext.parser_limits().
+        return GraphQlDocument - The document.
+        """
+        if limits:
+            key = (document_str, schema, tuple(sorted(limits.iteritems())))
+        else:
+            key = (document_str, schema)
+        with self._lock:
+            document = self._documents.pop(key, None)
+            if document is not None:
+                self._documents[key] = document
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        document = GraphQlParser(document_str, schema, **limits).parse()
+        with self._lock:
+            if self._max_size > 0:
+                self._documents[key] = document
+                self._evict(self._max_size)
+        return document
+
+    def max_size(self):
+        """Return the maximum number of documents we store."""
+        return self._max_size
+
+    def set_max_size(self, max_size):
+        """Set the maximum number of documents to store.
+
+        If the cache has more than max_size documents, this evicts the
+        least recently used documents.
+        """
+        if max_size < 0:
+            raise ValueError('The maximum size may not be negative')
+        with self._lock:
+            self._max_size = max_size
+            self._evict(max_size)
+
+    def size(self):
+        """Return the number of documents in the cache."""
+        with self._lock:
+            return len(self._documents)
+
+    def clear(self):
+        """Remove all documents from the cache.
+
+        This does not reset the hits, misses, and evictions counters.
+        """
+        with self._lock:
+            self._documents.clear()
@@ -30,6 +30,27 @@ class GraphQlOperationNameError(GraphQlExecutionError):
     pass
 
 
+class GraphQlQueryCostError(GraphQlExecutionError):
+    """Indicates that an operation is too expensive to execute.
+
+    We raise this if the cost of the operation to execute, as estimated
+    by GraphQlContext.cost_analyzer(), exceeds the analyzer's max_cost.
+    We raise it before we start executing the operation.
+    """
+    pass
+
+
+class GraphQlResponseSizeError(GraphQlExecutionError):
+    """Indicates that the response to a document is too large.
+
+    We raise this once the approximate size of the response exceeds the
+    limits given by GraphQlContext.response_size_limits().  Rather than
+    setting the offending field to null, we abort execution, so that
+    the response consists of the error alone.
+    """
+    pass
+
+
 class GraphQlSchemaMismatchError(GraphQlExecutionError):
     """A mismatch between GraphQlDocument.schema and GraphQlContext.schema.
 
@@ -40,6 +61,19 @@ class GraphQlSchemaMismatchError(GraphQlExecutionError):
     pass
 
 
+class GraphQlTimeoutError(GraphQlExecutionError):
+    """Indicates that the deadline for executing a document has passed.
+
+    We check the deadline, as given by GraphQlContext.deadline() and the
+    "timeout" argument to GraphQlExecutor.execute and the like, between
+    field resolutions.  Once it passes, we do not resolve any more
+    fields.  Instead, we treat each remaining field as if it raised a
+    GraphQlTimeoutError, so that the response contains the partial
+    result we computed before the deadline.
+    """
+    pass
+
+
 class GraphQlVariablesError(GraphQlExecutionError):
     """Indicates that the variables are invalid.
 
@@ -1,12 +1,20 @@
 import collections
 import copy
+import json
 import re
 import sys
+import threading
+import time
+import timeit
+import weakref
 
 from errors import GraphQlBadScalarDescriptorError
 from errors import GraphQlFieldTypeError
 from errors import GraphQlOperationNameError
+from errors import GraphQlQueryCostError
+from errors import GraphQlResponseSizeError
 from errors import GraphQlSchemaMismatchError
+from errors import GraphQlTimeoutError
 from errors import GraphQlVariablesError
 from graphql import GraphQlResultWithErrors
 from graphql.document import GraphQlFieldQuery
@@ -16,23 +24,141 @@ from graphql.document import GraphQlParser
 from graphql.document import GraphQlQuery
 from graphql.document import GraphQlVariableReference
 from graphql.schema import GraphQlEnumType
+from graphql.schema import GraphQlImportTracker
 from graphql.schema import GraphQlInputObjectType
 from graphql.schema import GraphQlListType
 from graphql.schema import GraphQlNonNullType
 from graphql.schema import GraphQlObjectType
 from graphql.schema import GraphQlScalarType
+from loader import GraphQlDeferredValue
+from result_access import GraphQlResultAccess
+from result_object import GraphQlResultObject
 from root_mutation_object import GraphQlRootMutationObject
 from root_query_object import GraphQlRootQueryObject
 
 
+class _GraphQlOutputTypeMismatch(Exception):
+    """Indicates that a value does not match the expected output type.
+
+    _execute_selection_sets_checked raises this to report the problem to
+    _execute_field_queries_raise, which raises the appropriate
+    GraphQlFieldTypeError.
+    """
+    pass
+
+
+class _GraphQlJsonFragment(str):
+    """A JSON value that we have already encoded as a JSON string.
+
+    When we execute a document for execute_chunks, we replace the result
+    object for each object value with its JSON encoding once we have
+    finished executing its fields.  A string takes up much less memory
+    than a tree of OrderedDicts.  _append_json and _json_parts write
+    fragments verbatim.
+    """
+    pass
+
+
+class _GraphQlResponseSize(object):
+    """The approximate size of a response, as we compute it.
+
+    The size consists of the number of JSON objects in the response and
+    an estimate of the number of bytes in its JSON encoding.  See
+    GraphQlContext.response_size_limits().
+
+    Public attributes:
+
+    int max_bytes - The maximum number of bytes, or None if there is no
+        maximum.
+    int max_objects - The maximum number of objects, or None if there is
+        no maximum.
+    int num_bytes - The estimated number of bytes so far.
+    int num_objects - The number of objects so far.
+    """
+
+    # Private attributes:
+    # threading.Lock _lock - The lock for updating num_objects and num_bytes.
+    #     GraphQlExecutors on different threads may share a
+    #     _GraphQlResponseSize, as in GraphQlExecutor._fork().
+
+    def __init__(self, max_objects=None, max_bytes=None):
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.num_objects = 0
+        self.num_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, num_objects, num_bytes):
+        """Add the specified amounts to the size of the response.
+
+        Raise a GraphQlResponseSizeError if the response exceeds the
+        limits as a result.
+        """
+        with self._lock:
+            self.num_objects += num_objects
+            self.num_bytes += num_bytes
+            total_objects = self.num_objects
+            total_bytes = self.num_bytes
+        if self.max_objects is not None and total_objects > self.max_objects:
+            raise GraphQlResponseSizeError(
+                'The response exceeds the maximum of {:d} objects'.format(
+                    self.max_objects))
+        if self.max_bytes is not None and total_bytes > self.max_bytes:
+            raise GraphQlResponseSizeError(
+                'The response exceeds the maximum size of {:d} bytes'.format(
+                    self.max_bytes))
+
+
 class GraphQlExecutor(object):
     """Provides the ability to execute a GraphQL document."""
 
+    # A map from each GraphQlOperation we have executed to a pair consisting
+    # of the names of the variables that appear in the operation's @include
+    # and @skip directives and a map from the values of those variables to
+    # the execution plans for those values, as in _plans.  Execution plans
+    # only depend on the variables through the directives, so we can share
+    # them between executions of an operation.
+    _operation_plans = weakref.WeakKeyDictionary()
+
+    # The lock for accessing _operation_plans.
+    _operation_plans_lock = threading.Lock()
+
+    # A map from each GraphQlOperation we have prefetched modules for to the
+    # names of the modules the operation may need, as in _module_names.
+    _operation_module_names = weakref.WeakKeyDictionary()
+
+    # The lock for accessing _operation_module_names.
+    _operation_module_names_lock = threading.Lock()
+
+    # The minimum number of characters in each chunk that execute_chunks
+    # yields, apart from the last chunk
+    _CHUNK_SIZE = 65536
+
+    # The JSONEncoder for encoding responses for execute_chunks
+    _json_encoder = json.JSONEncoder(separators=(',', ':'))
+
     # Private attributes:
+    # bool _compact_results - Whether to represent the results of object
+    #     values as GraphQlResultObjects, as in
+    #     GraphQlContext.compact_results().
     # GraphQlContext _context - The context.
+    # float _deadline - The time by which we must finish executing the
+    #     document, as returned by time.time(), or None if there is no
+    #     deadline.  Once it passes, we fail the fields we have yet to obtain
+    #     with a GraphQlTimeoutError.
+    # tuple<type> _deferred_types - The types of field values that we obtain
+    #     later, in _execute_pending: GraphQlDeferredValue and the types in
+    #     GraphQlContext.future_types().
     # GraphQlDocument _document - The document to execute.
     # list<dict<basestring, object>> _errors - The GraphQL errors we have
     #     encountered thus far in executing the document.
+    # bool _json_fragments - Whether to replace the result object for each
+    #     object value with a _GraphQlJsonFragment once we have finished
+    #     executing its fields, as in execute_chunks.
+    # bool _measure_root - Whether to add the size of the root object to
+    #     _response_size.  This is False for the GraphQlExecutors that
+    #     _execute_root_fields_in_parallel uses to execute individual root
+    #     fields, since it measures the combined root object itself.
     # mixed _graphql_variables - The variable values to pass to the document,
     #     as represented in GraphQL.  This is supposed to be a map from the
     #     names of the variables to the Python objects for their values.  This
@@ -40,8 +166,59 @@ class GraphQlExecutor(object):
     #     and (b) values appear as their GraphQL scalar representations, rather
     #     than their Python object representations.  Note that the user may
     #     supply _graphql_variables, so it might not be of the correct type.
+    # tuple<dict<basestring, object>, basestring, tuple> _null_target - The
+    #     result object and response key whose value we should set to None if
+    #     a non-null field that we are currently executing fails, followed by
+    #     the null target that encloses it, or None if there is no such
+    #     target.  This is the location of the nearest enclosing nullable
+    #     field, or of the "data" entry of the response if there is no such
+    #     field.
+    # dict<int, tuple> _nulled_targets - A map from the IDs of the null
+    #     targets, as in _null_target, that we have set to None because of a
+    #     failed non-null element of _pending to the targets.  We discard the
+    #     elements of _pending inside of them, as in _is_discarded.
     # basestring _operation_name - The name of the operation to execute.  This
     #     may be None if the document only has one operation.
+    # list<tuple> _pending - The fields whose values we have yet to obtain:
+    #     batched fields, as described in the comments for
+    #     graphql_batch_field, and fields whose values are instances of
+    #     _deferred_types.  Each element is a tuple (value, field,
+    #     arguments, selection_sets, results, response_key, null_target,
+    #     deferred_value, path), where "value" is the object whose field we
+    #     are querying, "field" is the GraphQlField, "arguments" and
+    #     "selection_sets" are the arguments and selection sets of the field
+    #     queries, as in _execute_field_queries, "null_target" is the value of
+    #     _null_target when we encountered the field, "deferred_value" is the
+    #     GraphQlDeferredValue or future for the field's value, or None if we
+    #     have yet to call the batched field's method, and "path" is the
+    #     return value of _pending_path().  Once we obtain the field's value,
+    #     we set results[response_key] to the JSON value result of the field
+    #     queries.
+    # dict<tuple<tuple<GraphQlSelectionSet>, GraphQlObjectType>, list<tuple>>
+    #     _plans - A map from the selection sets and the runtime type of each
+    #     object we have queried to the execution plan for querying the
+    #     selection sets on an object of that type, as returned by
+    #     _compute_plan.  This is None if we have not computed it yet.  It is
+    #     shared with other executions of the same operation that have the
+    #     same @include and @skip directive values.
+    # dict<tuple<tuple<GraphQlSelectionSet>, GraphQlObjectType>,
+    #     tuple<tuple<basestring>, dict<basestring, int>>> _response_keys -
+    #     A map from the selection sets and the runtime type of each object
+    #     we have queried to the response keys in the execution plan and the
+    #     map from each key to its index, for the GraphQlResultObjects.
+    # _GraphQlResponseSize _response_size - The size of the response so far,
+    #     or None if GraphQlContext.response_size_limits() is empty, in which
+    #     case we do not measure the response.  The GraphQlExecutors returned
+    #     by _fork() share this with us.
+    # bool _single_pass - Whether to validate field values as we serialize
+    #     them, as in GraphQlContext.single_pass_serialization().
+    # list<dict<basestring, object>> _timeout_errors - The GraphQL errors we
+    #     added to _errors for a GraphQlTimeoutError, or None if we have not
+    #     added any.  We only report the timeout once, rather than once per
+    #     field, or once per GraphQlExecutor returned by _fork().
+    # GraphQlTracer _tracer - The tracer to notify of field events, or None
+    #     if we are not tracing.  If this is not None, we are a
+    #     _GraphQlTracingExecutor.
     # dict<basestring, mixed> _variables - A map from each variable to the
     #     Python object representation of its value, including any default
     #     values, or None if we have not computed this yet.  We compute this
@@ -54,7 +231,26 @@ class GraphQlExecutor(object):
         self._operation_name = operation_name
         self._graphql_variables = graphql_variables
         self._errors = []
+        self._json_fragments = False
+        self._measure_root = True
         self._variables = None
+        self._plans = None
+        self._response_keys = {}
+        self._single_pass = context.single_pass_serialization()
+        self._compact_results = context.compact_results()
+        self._deferred_types = (
+            (GraphQlDeferredValue,) + tuple(context.future_types()))
+        self._deadline = context.deadline()
+        self._timeout_errors = None
+        limits = context.response_size_limits()
+        if limits:
+            self._response_size = _GraphQlResponseSize(**limits)
+        else:
+            self._response_size = None
+        self._pending = []
+        self._null_target = None
+        self._nulled_targets = {}
+        self._tracer = None
 
     @staticmethod
     def _exception_errors(context, exception, exception_info):
@@ -88,8 +284,95 @@ class GraphQlExecutor(object):
         tuple<type, mixed, traceback> exception_info - Information about
             the exception, as returned by sys.exc_info().
         """
-        self._errors += GraphQlExecutor._exception_errors(
+        if isinstance(exception, GraphQlResponseSizeError):
+            # Abort execution rather than nulling out the field
+            raise exception_info[0], exception_info[1], exception_info[2]
+        errors = GraphQlExecutor._exception_errors(
             self._context, exception, exception_info)
+        if isinstance(exception, GraphQlTimeoutError):
+            if self._timeout_errors is not None:
+                return
+            self._timeout_errors = errors
+        self._errors += errors
+
+    def _append_fork_errors(self, executor):
+        """Append the errors of a GraphQlExecutor returned by _fork().
+
+        We omit the executor's errors for a GraphQlTimeoutError if we
+        have already reported the timeout.
+        """
+        errors = executor._errors
+        if executor._timeout_errors is not None:
+            if self._timeout_errors is None:
+                self._timeout_errors = executor._timeout_errors
+            else:
+                timeout_error_ids = set([
+                    id(error) for error in executor._timeout_errors])
+                errors = [
+                    error for error in errors
+                    if id(error) not in timeout_error_ids]
+        self._errors += errors
+
+    def _limit_deadline(self, deadline):
+        """Ensure that _deadline is no later than the specified deadline.
+
+        float deadline - The deadline, as returned by time.time(), or
+            None if there is no deadline.
+        """
+        if deadline is not None and (
+                self._deadline is None or deadline < self._deadline):
+            self._deadline = deadline
+
+    def _check_deadline(self):
+        """Raise a GraphQlTimeoutError if _deadline has passed."""
+        if self._deadline is not None and time.time() >= self._deadline:
+            raise GraphQlTimeoutError(
+                'The deadline for executing the document has passed')
+
+    @staticmethod
+    def _value_size(value):
+        """Return the estimated size of a JSON value result, in bytes.
+
+        We estimate the size of the JSON encoding of the specified
+        value, excluding the sizes of any objects it contains.  We
+        measure those separately, in _add_object_size.
+        """
+        if isinstance(value, basestring):
+            if isinstance(value, _GraphQlJsonFragment):
+                return 0
+            return len(value) + 2
+        elif isinstance(value, list):
+            size = len(value) + 1
+            for element in value:
+                size += GraphQlExecutor._value_size(element)
+            return size
+        elif isinstance(value, (dict, GraphQlResultObject)):
+            return 0
+        else:
+            # null, true, false, or a number
+            return 5
+
+    def _add_object_size(self, plan, results):
+        """Add the size of a result object to _response_size.
+
+        Raise a GraphQlResponseSizeError if the response exceeds the
+        limits of _response_size as a result.
+
+        list<tuple> plan - The execution plan for the object, as returned
+            by _compute_plan.
+        object results - The results for the object's fields, as in
+            _execute_selection_sets_base.
+        """
+        size = 2
+        for plan_element in plan:
+            size += len(plan_element[0]) + 4
+        if isinstance(results, list):
+            values = results
+        else:
+            values = results.itervalues()
+        for value in values:
+            size += GraphQlExecutor._value_size(value)
+        self._response_size.add(1, size)
 
     def _verified_python_to_graphql(self, value, scalar_descriptor):
         """Like scalar_descriptor.python_to_graphql(value), but with checks.
@@ -269,7 +552,7 @@ class GraphQlExecutor(object):
         object value - The value whose fields we are querying.  This
             must be of type "t".
         GraphQlType t - The type of the value.
-        list<GraphQlSelectionSet> selection_sets - The selection sets,
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets,
             in execution order.
         return object - The execution result.
         """
@@ -303,6 +586,49 @@ class GraphQlExecutor(object):
         else:
             return self._execute_selection_sets_base(value, selection_sets)
 
+    def _execute_selection_sets_checked(self, value, t, selection_sets):
+        """Return the JSON value result of the specified selection sets.
+
+        This is like _execute_selection_sets, except that it does not
+        require "value" to be of type "t".  Rather, it raises a
+        _GraphQlOutputTypeMismatch if it is not.  This is equivalent to
+        checking _is_output_of_type(value, t) and then calling
+        _execute_selection_sets, except that it only traverses "value"
+        once.
+        """
+        if value is None:
+            if isinstance(t, GraphQlNonNullType):
+                raise _GraphQlOutputTypeMismatch()
+            return None
+        if isinstance(t, GraphQlNonNullType):
+            t = t.value_type
+
+        if isinstance(t, GraphQlEnumType):
+            try:
+                return t.python_to_graphql(value)
+            except ValueError:
+                raise _GraphQlOutputTypeMismatch()
+        elif isinstance(t, GraphQlScalarType):
+            try:
+                return self._verified_python_to_graphql(
+                    value, t.scalar_descriptor())
+            except (TypeError, ValueError):
+                raise _GraphQlOutputTypeMismatch()
+        elif isinstance(t, GraphQlListType):
+            if not isinstance(value, (list, tuple)):
+                raise _GraphQlOutputTypeMismatch()
+            result = []
+            for element in value:
+                result.append(
+                    self._execute_selection_sets_checked(
+                        element, t.element_type, selection_sets))
+            return result
+        else:
+            object_type = self._document.schema.object_type(value)
+            if object_type is None or not object_type.is_subtype(t):
+                raise _GraphQlOutputTypeMismatch()
+            return self._execute_selection_sets_base(value, selection_sets)
+
     @staticmethod
     def _camel_case_to_snake_case(s):
         """Convert the specified camelCase identifier to snake_case.
@@ -314,94 +640,475 @@ class GraphQlExecutor(object):
         s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', s)
         return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
 
+    def _field_type_error(self, value, field, field_value):
+        """Return a GraphQlFieldTypeError for a field value of the wrong type.
+
+        mixed value - The value whose field we queried.
+        GraphQlField field - The field.
+        mixed field_value - The value the field returned.
+        return GraphQlFieldTypeError - The error.
+        """
+        object_type = self._document.schema.object_type(value)
+        return GraphQlFieldTypeError(
+            '{:s}{{{:s}}} returned an instance of {:s}, but it must return a '
+            'value of type {:s}'.format(
+                object_type.name, field.descriptor.name,
+                field_value.__class__.__name__,
+                field.descriptor.field_type.type_str()))
+
+    def _field_kwargs(self, field, arguments):
+        """Return the keyword arguments for obtaining the specified field.
+
+        Return the keyword arguments to pass to field.method_name,
+        excluding the context arguments.
+
+        GraphQlField field - The field.  We must obtain its value using
+            a method.
+        dict<basestring, object> arguments - A map from the name of each
+            supplied argument to its value, as in
+            GraphQlFieldQuery.args.
+        return dict<basestring, mixed> - The keyword arguments.
+        """
+        kwargs = field.partial_kwargs.copy()
+        for name, arg in arguments.iteritems():
+            kwargs[self._camel_case_to_snake_case(name)] = (
+                self._evaluate_value(arg))
+        return kwargs
+
+    def _execute_field_value(self, value, field, field_value, selection_sets):
+        """Return the JSON value result of the specified field's value.
+
+        Return the JSON value result of executing the specified
+        selection sets on the specified field value.  Raise a
+        GraphQlFieldTypeError if the value is not of the field's type.
+
+        mixed value - The value whose field we queried.
+        GraphQlField field - The field.
+        mixed field_value - The value the field returned.
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets
+            of the field queries, in execution order.
+        return object - The execution result.
+        """
+        if self._single_pass:
+            return self._execute_selection_sets_single_pass(
+                value, field, field_value, selection_sets)
+        field_type = field.descriptor.field_type
+        if not self._is_output_of_type(field_value, field_type):
+            raise self._field_type_error(value, field, field_value)
+        return self._execute_selection_sets(
+            field_value, field_type, selection_sets)
+
+    def _resolve_field(self, value, field, non_context_kwargs):
+        """Return the value of the specified field, before any processing.
+
+        This calls the field's method or accesses its attribute.
+
+        mixed value - The value whose field we are querying.
+        GraphQlField field - The field.  It must not be batched.
+        dict<basestring, mixed> non_context_kwargs - The keyword
+            arguments to pass to the field's method, excluding the
+            context arguments, as returned by _field_kwargs.
+        return mixed - The field's value.
+        """
+        if self._deadline is not None:
+            self._check_deadline()
+        if field.attr is not None:
+            return getattr(value, field.attr)
+        kwargs = non_context_kwargs.copy()
+        for name in field.context_args:
+            kwargs[name] = self._context.context_arg(name)
+        return getattr(value, field.method_name)(
+            *field.partial_args, **kwargs)
+
     def _execute_field_queries_raise(
-            self, value, field, arguments, field_queries):
-        """Return the JSON value result of the specified field queries.
+            self, value, field, arguments, selection_sets, results,
+            response_key):
+        """Compute the JSON value result of the specified field queries.
 
-        Return the JSON value result of executing the specified field
-        queries sharing the same response key on the specified value.
-        This is like _execute_field_queries, except that it does not
-        catch exceptions if the field has a nullable type.  See the
-        comments for _execute_field_queries.
+        Set results[response_key] to the JSON value result of executing
+        the specified field queries sharing the same response key on the
+        specified value.  This is like _execute_field_queries, except
+        that it does not catch exceptions if the field has a nullable
+        type, and it does not handle batched fields.  See the comments
+        for _execute_field_queries.
         """
         if field.attr is not None:
             non_context_kwargs = {}
         else:
-            non_context_kwargs = field.partial_kwargs.copy()
-            for name, arg in arguments.iteritems():
-                non_context_kwargs[self._camel_case_to_snake_case(name)] = (
-                    self._evaluate_value(arg))
-        if isinstance(value, GraphQlRootMutationObject):
+            non_context_kwargs = self._field_kwargs(field, arguments)
+        is_mutation = isinstance(value, GraphQlRootMutationObject)
+        if is_mutation:
             self._context.mutation_start(
                 field.descriptor.name, non_context_kwargs)
 
         # Compute the field's value
         try:
-            if field.attr is not None:
-                field_value = getattr(value, field.attr)
-            else:
-                kwargs = non_context_kwargs.copy()
-                for name in field.context_args:
-                    kwargs[name] = self._context.context_arg(name)
-                field_value = getattr(value, field.method_name)(
-                    *field.partial_args, **kwargs)
+            field_value = self._resolve_field(value, field, non_context_kwargs)
+            if is_mutation:
+                # Finish performing the mutation before we continue
+                while isinstance(field_value, self._deferred_types):
+                    if isinstance(field_value, GraphQlDeferredValue):
+                        field_value.loader.dispatch(field_value.keys)
+                        field_value = field_value.value()
+                    else:
+                        field_value = field_value.result()
             field_value_with_errors = field_value
             if isinstance(field_value, GraphQlResultWithErrors):
                 self._append_exception_errors(
                     field_value.exception, field_value.exception_info)
                 field_value = field_value.result
 
+            if not is_mutation:
+                if isinstance(field_value, self._deferred_types):
+                    results[response_key] = None
+                    self._pending.append((
+                        value, field, arguments, selection_sets, results,
+                        response_key, self._null_target, field_value,
+                        self._pending_path()))
+                else:
+                    results[response_key] = self._execute_field_value(
+                        value, field, field_value, selection_sets)
+                return
+
             # Check the field's value's type
             field_type = field.descriptor.field_type
             if not self._is_output_of_type(field_value, field_type):
-                object_type = self._document.schema.object_type(value)
-                raise GraphQlFieldTypeError(
-                    '{:s}{{{:s}}} returned an instance of {:s}, but it must '
-                    'return a value of type {:s}'.format(
-                        object_type.name, field.descriptor.name,
-                        field_value.__class__.__name__, field_type.type_str()))
+                raise self._field_type_error(value, field, field_value)
         except Exception as exception:
-            if isinstance(value, GraphQlRootMutationObject):
+            if is_mutation:
                 self._context.mutation_end(
                     field.descriptor.name, non_context_kwargs, None, exception,
                     sys.exc_info())
             raise
-        if isinstance(value, GraphQlRootMutationObject):
+        if is_mutation:
             self._context.mutation_end(
                 field.descriptor.name, non_context_kwargs,
                 field_value_with_errors, None, None)
 
         # Execute the selection sets
-        selection_sets = list(
-            [field_query.selection_set for field_query in field_queries])
-        return self._execute_selection_sets(
+        results[response_key] = self._execute_selection_sets(
             field_value, field_type, selection_sets)
 
-    def _execute_field_queries(self, value, field, arguments, field_queries):
-        """Return the JSON value result of the specified field queries.
+    def _execute_selection_sets_single_pass(
+            self, value, field, field_value, selection_sets):
+        """Return the JSON value result of the specified field's value.
+
+        Return the JSON value result of executing the specified
+        selection sets on the specified field value, validating the
+        value as we go.  Raise a GraphQlFieldTypeError if the value is
+        not of the field's type, leaving _errors as it was before we
+        started.  Also raise any exception that a non-null nested field
+        raises, unless the value is not of the field's type, in which
+        case we favor the GraphQlFieldTypeError, as two-pass execution
+        would.
+
+        mixed value - The value whose field we queried.
+        GraphQlField field - The field.
+        mixed field_value - The value the field returned.
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets
+            of the field queries, in execution order.
+        return object - The execution result.
+        """
+        field_type = field.descriptor.field_type
+        errors_length = len(self._errors)
+        try:
+            return self._execute_selection_sets_checked(
+                field_value, field_type, selection_sets)
+        except _GraphQlOutputTypeMismatch:
+            del self._errors[errors_length:]
+            raise self._field_type_error(value, field, field_value)
+        except Exception:
+            exception_info = sys.exc_info()
+            if not self._is_output_of_type(field_value, field_type):
+                del self._errors[errors_length:]
+                raise self._field_type_error(value, field, field_value)
+            raise exception_info[0], exception_info[1], exception_info[2]
+
+    def _execute_field_queries(
+            self, value, field, arguments, selection_sets, results,
+            response_key):
+        """Compute the JSON value result of the specified field queries.
 
-        Return the JSON value result of executing the specified field
-        queries sharing the same response key on the specified value.
+        Set results[response_key] to the JSON value result of executing
+        the specified field queries sharing the same response key on the
+        specified value.  If the field is batched, as described in the
+        comments for graphql_batch_field, or its value is a
+        GraphQlDeferredValue or a future, we set it to None and add the
+        field to _pending instead, so that we may obtain its value
+        later.
 
         mixed value - The value whose field we are querying.
         GraphQlField field - The field we are requesting.
         dict<basestring, object> arguments - A map from the name of each
             supplied argument to its value, as in
             GraphQlFieldQuery.args.
-        list<GraphQlFieldQuery> field_queries - The field queries, in
-            execution order.
-        return object - The execution result.
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets
+            of the field queries, in execution order.
+        dict<basestring, object> results - The result object for
+            "value".
+        basestring response_key - The response key of the field queries.
         """
-        if isinstance(field.descriptor.field_type, GraphQlNonNullType):
-            return self._execute_field_queries_raise(
-                value, field, arguments, field_queries)
+        if field.is_batch:
+            results[response_key] = None
+            self._pending.append((
+                value, field, arguments, selection_sets, results,
+                response_key, self._null_target, None, self._pending_path()))
+        elif isinstance(field.descriptor.field_type, GraphQlNonNullType):
+            self._execute_field_queries_raise(
+                value, field, arguments, selection_sets, results,
+                response_key)
         else:
+            null_target = self._null_target
+            pending_length = len(self._pending)
+            self._null_target = (results, response_key, null_target)
             try:
-                return self._execute_field_queries_raise(
-                    value, field, arguments, field_queries)
+                self._execute_field_queries_raise(
+                    value, field, arguments, selection_sets, results,
+                    response_key)
             except Exception as exception:
+                del self._pending[pending_length:]
                 self._append_exception_errors(exception, sys.exc_info())
-                return None
+                results[response_key] = None
+            self._null_target = null_target
+
+    def _pending_path(self):
+        """Return the path to store in an element of _pending we are adding.
+
+        _GraphQlTracingExecutor overrides this to return the path of the
+        field, as in GraphQlTracer.field_start.  We do not keep track of
+        paths when we are not tracing, so this returns None.
+        """
+        return None
+
+    def _is_discarded(self, pending_field):
+        """Return whether the specified element of _pending is discarded.
+
+        An element is discarded if it is inside of a null target that we
+        set to None because another non-null element of _pending failed,
+        in which case we need not obtain its value.
+        """
+        if not self._nulled_targets:
+            return False
+        null_target = pending_field[6]
+        while null_target is not None:
+            if id(null_target) in self._nulled_targets:
+                return True
+            null_target = null_target[2]
+        return False
+
+    def _null_pending_field(self, pending_field):
+        """Set the appropriate value for a failed element of _pending to None.
+
+        This is the field's value if it is nullable, and otherwise its
+        null target, as in _null_target.
+        """
+        field, results, response_key, null_target = (
+            pending_field[1], pending_field[4], pending_field[5],
+            pending_field[6])
+        if isinstance(field.descriptor.field_type, GraphQlNonNullType):
+            null_target[0][null_target[1]] = None
+            self._nulled_targets[id(null_target)] = null_target
+        else:
+            results[response_key] = None
+
+    def _fail_pending_field(self, pending_field, exception, exception_info):
+        """Respond to failing to execute the specified element of _pending.
+
+        This appends the GraphQL errors for the exception to _errors and
+        sets the appropriate value to None.  We do nothing if the element
+        is discarded, as in _is_discarded.
+
+        tuple pending_field - The element of _pending.
+        Exception exception - The exception.
+        tuple<type, mixed, traceback> exception_info - Information about
+            the exception, as returned by sys.exc_info().
+        """
+        if not self._is_discarded(pending_field):
+            self._append_exception_errors(exception, exception_info)
+            self._null_pending_field(pending_field)
+
+    def _execute_batch(self, method, field, kwargs, pending_fields):
+        """Execute the specified elements of _pending using a single call.
+
+        function method - The method for obtaining the values of the
+            fields, as described in the comments for
+            graphql_batch_field.
+        GraphQlField field - The field.
+        dict<basestring, mixed> kwargs - The keyword arguments to pass
+            to "method", excluding the context arguments, as returned by
+            _field_kwargs.
+        list<tuple> pending_fields - The elements of _pending.  They must
+            all be for the same field and arguments.
+        """
+        try:
+            field_values = self._resolve_batch(
+                method, field, kwargs, pending_fields)
+            if (not isinstance(field_values, (list, tuple)) or
+                    len(field_values) != len(pending_fields)):
+                raise GraphQlFieldTypeError(
+                    'The batched field {:s} must return a list or tuple with '
+                    'one value for each object'.format(field.descriptor.name))
+        except Exception as exception:
+            # Report the failure once, rather than once per field
+            self._append_exception_errors(exception, sys.exc_info())
+            for pending_field in pending_fields:
+                self._null_pending_field(pending_field)
+            return
+
+        for pending_field, field_value in zip(pending_fields, field_values):
+            self._execute_pending_value(pending_field, field_value)
+
+    def _resolve_batch(self, method, field, kwargs, pending_fields):
+        """Return the values of the fields for the specified batch.
+
+        This calls "method", as in _execute_batch, and returns its return
+        value, before any validation.
+        """
+        if self._deadline is not None:
+            self._check_deadline()
+        kwargs = kwargs.copy()
+        for name in field.context_args:
+            kwargs[name] = self._context.context_arg(name)
+        return method(
+            [pending_field[0] for pending_field in pending_fields],
+            *field.partial_args, **kwargs)
+
+    def _execute_pending_value(self, pending_field, field_value):
+        """Execute an element of _pending, given the value of its field.
+
+        If field_value is a GraphQlDeferredValue or a future, we add the
+        field back to _pending instead.
+
+        tuple pending_field - The element of _pending.
+        mixed field_value - The value of the field.  This may be a
+            GraphQlResultWithErrors, a GraphQlDeferredValue, or a future.
+        """
+        if self._is_discarded(pending_field):
+            return
+        value, field, arguments, selection_sets, results, response_key = (
+            pending_field[:6])
+        if isinstance(field_value, self._deferred_types):
+            self._pending.append(
+                pending_field[:7] + (field_value, pending_field[8]))
+            return
+
+        if isinstance(field.descriptor.field_type, GraphQlNonNullType):
+            self._null_target = pending_field[6]
+        else:
+            self._null_target = (results, response_key, pending_field[6])
+        pending_length = len(self._pending)
+        try:
+            if isinstance(field_value, GraphQlResultWithErrors):
+                self._append_exception_errors(
+                    field_value.exception, field_value.exception_info)
+                field_value = field_value.result
+            results[response_key] = self._execute_field_value(
+                value, field, field_value, selection_sets)
+            if self._response_size is not None:
+                self._response_size.add(
+                    0, GraphQlExecutor._value_size(results[response_key]))
+        except Exception as exception:
+            del self._pending[pending_length:]
+            self._fail_pending_field(pending_field, exception, sys.exc_info())
+
+    def _execute_pending(self):
+        """Execute the field queries in _pending, until _pending is empty.
+
+        We execute the fields in rounds.  In each round, we obtain the
+        values of all of the fields in _pending and execute their
+        selection sets, which may add fields for the next round.  We
+        make one call to load_batch per GraphQlLoader and one call per
+        distinct batched field method and set of arguments, and we wait
+        for the futures only after we have encountered all of the
+        futures in the round, so that their work may overlap.
+        """
+        null_target = self._null_target
+        while self._pending:
+            pending = [
+                pending_field for pending_field in self._pending
+                if not self._is_discarded(pending_field)]
+            self._pending = []
+
+            # Load the deferred values and wait for the futures
+            deferred_fields = []
+            loader_keys = collections.OrderedDict()
+            for pending_field in pending:
+                deferred_value = pending_field[7]
+                if deferred_value is not None:
+                    deferred_fields.append(pending_field)
+                    if isinstance(deferred_value, GraphQlDeferredValue):
+                        loader_keys.setdefault(
+                            deferred_value.loader, []).extend(
+                                deferred_value.keys)
+            if self._deadline is not None and deferred_fields:
+                try:
+                    self._check_deadline()
+                except GraphQlTimeoutError as exception:
+                    exception_info = sys.exc_info()
+                    for pending_field in deferred_fields:
+                        self._fail_pending_field(
+                            pending_field, exception, exception_info)
+                    deferred_fields = []
+                    loader_keys = {}
+            for loader, keys in loader_keys.iteritems():
+                loader.dispatch(keys)
+
+            # A failed call to GraphQlLoader.load_batch raises the same
+            # exception for every key, so we only report each exception once
+            # per round.  This maps the IDs of the exceptions we have reported
+            # to the exceptions.
+            reported_exceptions = {}
+            for pending_field in deferred_fields:
+                deferred_value = pending_field[7]
+                try:
+                    if isinstance(deferred_value, GraphQlDeferredValue):
+                        field_value = deferred_value.value()
+                    else:
+                        field_value = deferred_value.result()
+                except Exception as exception:
+                    if self._is_discarded(pending_field):
+                        pass
+                    elif id(exception) in reported_exceptions:
+                        self._null_pending_field(pending_field)
+                    else:
+                        reported_exceptions[id(exception)] = exception
+                        self._fail_pending_field(
+                            pending_field, exception, sys.exc_info())
+                    continue
+                self._execute_pending_value(pending_field, field_value)
+
+            # Group the batched fields by method and arguments.  Arguments
+            # need not be hashable, so we compare them using ==.
+            batches = collections.OrderedDict()
+            for pending_field in pending:
+                if pending_field[7] is not None:
+                    continue
+                value, field, arguments = pending_field[:3]
+                try:
+                    method = getattr(value.__class__, field.method_name)
+                    kwargs = self._field_kwargs(field, arguments)
+                except Exception as exception:
+                    self._fail_pending_field(
+                        pending_field, exception, sys.exc_info())
+                    continue
+                method_batches = batches.setdefault((method, field), [])
+                for batch_kwargs, pending_fields in method_batches:
+                    if batch_kwargs == kwargs:
+                        pending_fields.append(pending_field)
+                        break
+                else:
+                    method_batches.append((kwargs, [pending_field]))
+
+            for (method, field), method_batches in batches.iteritems():
+                for kwargs, pending_fields in method_batches:
+                    # Skip the fields that an earlier batch discarded
+                    pending_fields = [
+                        pending_field for pending_field in pending_fields
+                        if not self._is_discarded(pending_field)]
+                    if pending_fields:
+                        self._execute_batch(
+                            method, field, kwargs, pending_fields)
+        self._null_target = null_target
 
     def _append_field_queries(self, selection_set, object_type, field_queries):
         """Append applicable field queries to field_queries.
@@ -426,7 +1133,8 @@ class GraphQlExecutor(object):
             # Check @include and @skip directives
             directives = field_query_or_fragment.directives
             if isinstance(field_query_or_fragment, GraphQlFragmentReference):
-                directives += field_query_or_fragment.fragment.directives
+                directives = (
+                    directives + field_query_or_fragment.fragment.directives)
             include = True
             for directive in directives:
                 if directive.directive_type.name == 'include':
@@ -451,19 +1159,31 @@ class GraphQlExecutor(object):
                         field_query_or_fragment.fragment.selection_set,
                         object_type, field_queries)
 
-    def _execute_selection_sets_base(self, value, selection_sets):
-        """Return the JSON value result of the specified selection sets.
+    def _compute_plan(self, selection_sets, object_type):
+        """Return the execution plan for the specified selection sets.
 
-        Return the JSON value result of executing the specified
-        selection sets on the specified value of a base type.
+        Return a plan for querying the specified selection sets on an
+        object of the specified type.  The plan takes the @include and
+        @skip directives and the fragment types into account, so that
+        _execute_selection_sets_base only has to call the appropriate
+        fields.
 
-        mixed value - The value whose fields we are querying.
-        list<GraphQlSelectionSet> selection_sets - The selection sets,
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets,
             in execution order.
-        return object - The execution result.
+        GraphQlObjectType object_type - The runtime type of the object
+            we are querying.
+        return list<tuple> - The plan.  This is a list with one element
+            for each response key, in order.  Each element is a tuple
+            (response_key, name, args, field, selection_sets), where
+            "response_key" is the response key, "name" is the name of
+            the field, "args" are the arguments of the first field query
+            for the response key, as in GraphQlFieldQuery.args, "field"
+            is the GraphQlField to call, or None if this is an implicit
+            field such as __typename, and "selection_sets" is a
+            tuple<GraphQlSelectionSet> of the field queries' selection
+            sets, in execution order.
         """
         # Compute a map from response key to field queries
-        object_type = self._document.schema.object_type(value)
         field_queries = []
         for selection_set in selection_sets:
             self._append_field_queries(
@@ -477,16 +1197,93 @@ class GraphQlExecutor(object):
             response_key_to_field_queries.setdefault(response_key, []).append(
                 field_query)
 
-        # Compute the results
-        results = collections.OrderedDict()
+        plan = []
         for response_key in response_keys:
             field_queries = response_key_to_field_queries[response_key]
             name = field_queries[0]['fieldQuery'].field_descriptor.name
             args = field_queries[0]['fieldQuery'].args
-            if name == '__typename':
+            child_selection_sets = tuple([
+                field_query['fieldQuery'].selection_set
+                for field_query in field_queries])
+            if (name == '__typename' or
+                    (object_type == self._document.schema.root_query_type() and
+                     (name == '__schema' or name == '__type'))):
+                # Implicit field
+                plan.append(
+                    (response_key, name, args, None, child_selection_sets))
+            else:
+                if isinstance(field_queries[0]['type'], GraphQlObjectType):
+                    has_field = name in field_queries[0]['type'].fields
+                else:
+                    has_field = (
+                        name in field_queries[0]['type'].field_descriptors)
+                if has_field:
+                    plan.append((
+                        response_key, name, args, object_type.fields[name],
+                        child_selection_sets))
+        return plan
+
+    def _plan(self, selection_sets, object_type):
+        """Return the execution plan for the specified selection sets.
+
+        This is the same as _compute_plan(selection_sets, object_type),
+        except that it caches the plan in _plans.
+        """
+        plan_key = (selection_sets, object_type)
+        plan = self._plans.get(plan_key)
+        if plan is None:
+            plan = self._compute_plan(selection_sets, object_type)
+            self._plans[plan_key] = plan
+        return plan
+
+    def _execute_selection_sets_base(self, value, selection_sets, plan=None):
+        """Return the JSON value result of the specified selection sets.
+
+        Return the JSON value result of executing the specified
+        selection sets on the specified value of a base type.
+
+        mixed value - The value whose fields we are querying.
+        tuple<GraphQlSelectionSet> selection_sets - The selection sets,
+            in execution order.
+        list<tuple> plan - The execution plan to follow, as returned by
+            _compute_plan, or None to use the plan for the selection
+            sets and the runtime type of "value".  Passing a plan is
+            useful for executing a subset of the fields.
+        return object - The execution result.  If "value" is not a root
+            object, this is a _GraphQlJsonFragment if _json_fragments is
+            True and we did not add any fields to _pending, and otherwise
+            it is a GraphQlResultObject if _compact_results is True.
+        """
+        object_type = self._document.schema.object_type(value)
+        if plan is None:
+            plan = self._plan(selection_sets, object_type)
+
+        # Compute the results.  For a GraphQlResultObject, we store the
+        # results in a list, so the key for each result is its index.
+        is_mutation = isinstance(value, GraphQlRootMutationObject)
+        is_root = is_mutation or isinstance(value, GraphQlRootQueryObject)
+        is_compact = self._compact_results and not is_root
+        pending_length = len(self._pending)
+        if is_compact:
+            results = [None] * len(plan)
+        else:
+            results = collections.OrderedDict()
+        for index, plan_element in enumerate(plan):
+            response_key, name, args, field, child_selection_sets = (
+                plan_element)
+            if is_compact:
+                response_key = index
+            if field is not None:
+                self._execute_field_queries(
+                    value, field, args, child_selection_sets, results,
+                    response_key)
+                if self._pending and is_mutation:
+                    # Finish executing each mutation field before performing
+                    # the next mutation
+                    self._execute_pending()
+            elif name == '__typename':
                 results[response_key] = object_type.name
-            elif (object_type == self._document.schema.root_query_type() and
-                    (name == '__schema' or name == '__type')):
+            else:
                 # Implicit root field
                 schema = self._document.schema
                 if name == '__schema':
@@ -502,41 +1299,179 @@ class GraphQlExecutor(object):
                 else:
                     results[response_key] = self._execute_selection_sets(
                         field_value, schema.object_type(field_value),
-                        list([
-                            field_query['fieldQuery'].selection_set
-                            for field_query in field_queries]))
+                        child_selection_sets)
+        if self._response_size is not None and (
+                self._measure_root or not is_root):
+            self._add_object_size(plan, results)
+
+        if is_compact:
+            plan_key = (selection_sets, object_type)
+            response_keys = self._response_keys.get(plan_key)
+            if response_keys is None:
+                keys = tuple([plan_element[0] for plan_element in plan])
+                response_keys = (keys, GraphQlResultObject.key_indices(keys))
+                self._response_keys[plan_key] = response_keys
+            results = GraphQlResultObject(
+                response_keys[0], results, response_keys[1])
+
+        # We may only encode the results once the fields in _pending have
+        # stopped referring to them
+        if (self._json_fragments and len(self._pending) == pending_length and
+                not is_root):
+            parts = []
+            GraphQlExecutor._append_json(results, parts)
+            return _GraphQlJsonFragment(''.join(parts))
+        return results
+
+    def _fork(self):
+        """Return a GraphQlExecutor for executing part of the operation.
+
+        The GraphQlExecutor has the same class as us, and it shares our
+        document, context, tracer, variables, and execution plans, but
+        it has its own errors and pending fields, so that it may execute
+        fields on a different thread.
+        """
+        executor = type(self)(
+            self._document, self._context, self._operation_name,
+            self._graphql_variables)
+        executor._tracer = self._tracer
+        executor._variables = self._variables
+        executor._plans = self._plans
+        executor._response_keys = self._response_keys
+        executor._json_fragments = self._json_fragments
+        executor._deadline = self._deadline
+        executor._response_size = self._response_size
+        return executor
+
+    def _execute_root_field(self, value, selection_sets, plan_element):
+        """Return the JSON value result of executing a single root field.
+
+        We call this on a GraphQlExecutor returned by _fork(), on one of
+        the threads of the thread pool.  It raises an exception if the
+        root field has a non-null type and we fail to execute it.
+
+        mixed value - The root query object.
+        tuple<GraphQlSelectionSet> selection_sets - The operation's
+            selection sets.
+        tuple plan_element - The element of the execution plan for the
+            root field, as returned by _compute_plan.
+        return dict<basestring, object> - A map from the root field's
+            response key to its result, or None if a non-null batched
+            field failed, meaning that the "data" entry of the response
+            must be None.
+        """
+        data = {}
+        self._null_target = (data, 'data', None)
+        results = self._execute_selection_sets_base(
+            value, selection_sets, [plan_element])
+        self._execute_pending()
+        if 'data' in data:
+            return None
+        return results
+
+    def _execute_root_fields_in_parallel(self, value, selection_sets, pool):
+        """Return the JSON value result of executing a query's root fields.
+
+        This is equivalent to
+        _execute_selection_sets_base(value, selection_sets), except
+        that we execute the root fields in parallel on the specified
+        thread pool, as in GraphQlContext.root_field_thread_pool().
+        Each root field has its own list of errors, which we append to
+        _errors in the order in which the root fields appear in the
+        plan, so that the order of the errors does not depend on the
+        timing of the threads.  We only report a timeout once, even if
+        several root fields time out.
+
+        mixed value - The root query object.
+        tuple<GraphQlSelectionSet> selection_sets - The operation's
+            selection sets.
+        object pool - The thread pool.
+        return object - The execution result.
+        """
+        object_type = self._document.schema.object_type(value)
+        plan = self._plan(selection_sets, object_type)
+        if len(plan) <= 1:
+            return self._execute_selection_sets_base(
+                value, selection_sets, plan)
+
+        executors_and_futures = []
+        for plan_element in plan:
+            executor = self._fork()
+            executor._measure_root = False
+            executors_and_futures.append((
+                executor,
+                pool.submit(
+                    executor._execute_root_field, value, selection_sets,
+                    plan_element)))
+
+        results = collections.OrderedDict()
+        for index, (executor, future) in enumerate(executors_and_futures):
+            try:
+                field_results = future.result()
+            except Exception:
+                exception_info = sys.exc_info()
+                try:
+                    self._append_fork_errors(executor)
+                finally:
+                    # Wait for the other root fields to finish, so that
+                    # they do not run after "execute" returns
+                    for _, other_future in (
+                            executors_and_futures[index + 1:]):
+                        try:
+                            other_future.result()
+                        except Exception:
+                            pass
+                raise exception_info[0], exception_info[1], exception_info[2]
+            self._append_fork_errors(executor)
+            if field_results is None:
+                self._null_target[0][self._null_target[1]] = None
             else:
-                if isinstance(field_queries[0]['type'], GraphQlObjectType):
-                    has_field = name in field_queries[0]['type'].fields
-                else:
-                    has_field = (
-                        name in field_queries[0]['type'].field_descriptors)
-                if has_field:
-                    field = object_type.fields[name]
-                    results[response_key] = self._execute_field_queries(
-                        value, field, args, list([
-                            field_query['fieldQuery']
-                            for field_query in field_queries]))
+                results.update(field_results)
+        if self._response_size is not None:
+            self._add_object_size(plan, results)
         return results
 
-    def _execute_query(self, query):
-        """Return the JSON value result of executing the given GraphQlQuery."""
+    def _execute_operation(self, value, selection_set):
+        """Return the JSON value result of executing an operation.
+
+        mixed value - The root query object or root mutation object.
+        GraphQlSelectionSet selection_set - The operation's selection
+            set.
+        return object - The execution result.
+        """
+        data = {}
+        self._null_target = (data, 'data', None)
         try:
-            return self._execute_selection_sets_base(
-                GraphQlRootQueryObject.instance(), [query.selection_set])
+            if isinstance(value, GraphQlRootQueryObject):
+                pool = self._context.root_field_thread_pool()
+            else:
+                pool = None
+            if pool is None:
+                results = self._execute_selection_sets_base(
+                    value, (selection_set,))
+            else:
+                results = self._execute_root_fields_in_parallel(
+                    value, (selection_set,), pool)
+            self._execute_pending()
         except Exception as exception:
+            del self._pending[:]
             self._append_exception_errors(exception, sys.exc_info())
             return None
+        if 'data' in data:
+            # A non-null batched field failed
+            return None
+        return results
+
+    def _execute_query(self, query):
+        """Return the JSON value result of executing the given GraphQlQuery."""
+        return self._execute_operation(
+            GraphQlRootQueryObject.instance(), query.selection_set)
 
     def _execute_mutation(self, mutation):
         """Execute the given GraphQlMutation and return its JSON value result.
         """
-        try:
-            return self._execute_selection_sets_base(
-                GraphQlRootMutationObject.instance(), [mutation.selection_set])
-        except Exception as exception:
-            self._append_exception_errors(exception, sys.exc_info())
-            return None
+        return self._execute_operation(
+            GraphQlRootMutationObject.instance(), mutation.selection_set)
 
     def _graphql_variables_to_python(self, operation):
         """Return the Python object representation of the variables.
@@ -568,13 +1503,65 @@ class GraphQlExecutor(object):
                 raise GraphQlVariablesError(str(exception))
         return python_variables
 
-    def _execute_document(self):
-        """Return the JSON value result of executing _document.
+    @staticmethod
+    def _append_directive_variable_names(selection_set, visited, names):
+        """Add the variables in the @include and @skip directives to "names".
 
-        Raise a GraphQlOperationNameError or GraphQlVariablesError if
-        there is an error with the operation name or variables.
+        Add the names of the variables that appear in the @include and
+        @skip directives in the specified selection set, including those
+        in nested selection sets and fragments, to "names".
+
+        GraphQlSelectionSet selection_set - The selection set.  This may
+            be None.
+        set<GraphQlSelectionSet> visited - The selection sets we have
+            visited so far.  We skip those in "visited".
+        set<basestring> names - The set to which to add the names.
+        """
+        if selection_set is None or selection_set in visited:
+            return
+        visited.add(selection_set)
+        for field_query_or_fragment in (
+                selection_set.field_queries_and_fragments):
+            directives = field_query_or_fragment.directives
+            if isinstance(field_query_or_fragment, GraphQlFragmentReference):
+                directives = (
+                    directives + field_query_or_fragment.fragment.directives)
+                child_selection_set = (
+                    field_query_or_fragment.fragment.selection_set)
+            else:
+                child_selection_set = field_query_or_fragment.selection_set
+            for directive in directives:
+                if directive.directive_type.name in ('include', 'skip'):
+                    condition = directive.args['if']
+                    if isinstance(condition, GraphQlVariableReference):
+                        names.add(condition.name)
+            GraphQlExecutor._append_directive_variable_names(
+                child_selection_set, visited, names)
+
+    def _init_plans(self, operation):
+        """Set _plans for the specified operation.
+
+        Assume we have already computed _variables.
+        """
+        with GraphQlExecutor._operation_plans_lock:
+            operation_plans = GraphQlExecutor._operation_plans.get(operation)
+        if operation_plans is None:
+            names = set()
+            GraphQlExecutor._append_directive_variable_names(
+                operation.selection_set, set(), names)
+            operation_plans = (sorted(names), {})
+
+        key = tuple([self._variables[name] for name in operation_plans[0]])
+        with GraphQlExecutor._operation_plans_lock:
+            operation_plans = GraphQlExecutor._operation_plans.setdefault(
+                operation, operation_plans)
+            self._plans = operation_plans[1].setdefault(key, {})
+
+    def _operation(self):
+        """Return the GraphQlOperation to execute.
+
+        Raise a GraphQlOperationNameError if there is no such operation.
         """
-        # Find the operation with name _operation_name
         if self._operation_name is None:
             if len(self._document.operations) != 1:
                 raise GraphQlOperationNameError(
@@ -590,45 +1577,405 @@ class GraphQlExecutor(object):
                 raise GraphQlOperationNameError(
                     u'There is no operation named {:s}'.format(
                         self._operation_name))
+        return operation
 
-        self._variables = self._graphql_variables_to_python(operation)
-        if isinstance(operation, GraphQlQuery):
-            result = self._execute_query(operation)
+    def _check_cost(self, operation):
+        """Estimate the cost of the specified operation, if applicable.
+
+        If GraphQlContext.cost_analyzer() returns a GraphQlCostAnalyzer,
+        pass the operation's cost to GraphQlContext.query_cost, and
+        raise a GraphQlQueryCostError if it exceeds the maximum.  Assume
+        we have already computed _variables.
+        """
+        cost_analyzer = self._context.cost_analyzer()
+        if cost_analyzer is None:
+            return
+        cost = cost_analyzer.operation_cost(operation, self._variables)
+        try:
+            self._context.query_cost(operation.name, cost)
+        except:
+            pass
+        max_cost = cost_analyzer.max_cost
+        if max_cost is not None and cost > max_cost:
+            raise GraphQlQueryCostError(
+                'The operation has an estimated cost of {:s}, which exceeds '
+                'the maximum of {:s}'.format(str(cost), str(max_cost)))
+
+    @staticmethod
+    def _type_module_name(t):
+        """Return the name of the module that the specified type refers to.
+
+        GraphQlBaseType t - The type.
+        return basestring - The name of the module containing the type's
+            class, scalar descriptor, or enum function, or None if it
+            does not refer to any module.
+        """
+        if isinstance(t, GraphQlObjectType):
+            return t.class_descriptor.module_name
+        elif isinstance(t, GraphQlScalarType):
+            return t.scalar_descriptor_class_descriptor.module_name
+        elif isinstance(t, GraphQlEnumType):
+            return t.func_descriptor.module_name
         else:
-            result = self._execute_mutation(operation)
+            return None
+
+    @staticmethod
+    def _append_module_names(selection_set, root_types, visited, module_names):
+        """Add the modules a selection set may need to module_names.
+
+        GraphQlSelectionSet selection_set - The selection set.
+        tuple<GraphQlObjectType> root_types - The root query type and
+            the root mutation type, if any.
+        set<GraphQlSelectionSet> visited - The selection sets we have
+            visited.
+        OrderedDict<basestring, None> module_names - An ordered set of
+            the names of the modules, to which to add the modules.
+        """
+        if selection_set in visited:
+            return
+        visited.add(selection_set)
+        base_type = selection_set.base_type
+        if isinstance(base_type, GraphQlObjectType):
+            object_types = [base_type]
+        else:
+            object_types = [
+                leaf_type for leaf_type in base_type.leaf_types()
+                if isinstance(leaf_type, GraphQlObjectType)]
+        types = list(object_types)
+
+        for field_query_or_fragment in (
+                selection_set.field_queries_and_fragments):
+            if isinstance(field_query_or_fragment, GraphQlFragmentReference):
+                GraphQlExecutor._append_module_names(
+                    field_query_or_fragment.fragment.selection_set,
+                    root_types, visited, module_names)
+                continue
+            field_descriptor = field_query_or_fragment.field_descriptor
+            for arg_type in field_descriptor.args.itervalues():
+                types.append(arg_type.base_type())
+            if field_query_or_fragment.selection_set is not None:
+                GraphQlExecutor._append_module_names(
+                    field_query_or_fragment.selection_set, root_types,
+                    visited, module_names)
+            else:
+                types.append(field_descriptor.field_type.base_type())
+            if base_type in root_types:
+                field = base_type.fields.get(field_descriptor.name)
+                if field is not None:
+                    # The first partial argument of a root field is the name
+                    # of the module containing its function
+                    module_names[field.partial_args[0]] = None
+
+        for t in types:
+            module_name = GraphQlExecutor._type_module_name(t)
+            if module_name is not None:
+                module_names[module_name] = None
+
+    def _prefetch_modules(self, operation):
+        """Start importing the modules the operation may need, if any.
+
+        We import the modules on a background thread, using
+        GraphQlImportTracker.prefetch, so that the imports may overlap
+        with the rest of the execution.  If we have already imported all
+        of the modules, we do nothing.  We prefetch all of the
+        operation's modules together, so that concurrent executions of
+        the operation share a single prefetch thread.
+        """
+        with GraphQlExecutor._operation_module_names_lock:
+            module_names = GraphQlExecutor._operation_module_names.get(
+                operation)
+        if module_names is None:
+            schema = self._document.schema
+            root_types = (
+                schema.root_query_type(), schema.root_mutation_type())
+            module_name_set = collections.OrderedDict()
+            GraphQlExecutor._append_module_names(
+                operation.selection_set, root_types, set(), module_name_set)
+            module_names = tuple(module_name_set.iterkeys())
+            with GraphQlExecutor._operation_module_names_lock:
+                GraphQlExecutor._operation_module_names[operation] = (
+                    module_names)
+
+        for module_name in module_names:
+            if module_name not in sys.modules:
+                GraphQlImportTracker.instance().prefetch(module_names)
+                break
+
+    def _execute_document(self):
+        """Return the JSON value result of executing _document.
+
+        Raise a GraphQlOperationNameError or GraphQlVariablesError if
+        there is an error with the operation name or variables, a
+        GraphQlQueryCostError if the operation is too expensive, or a
+        GraphQlResponseSizeError if the response is too large.
+        """
+        operation = self._operation()
+        if self._context.prefetch_modules():
+            self._prefetch_modules(operation)
+        self._variables = self._graphql_variables_to_python(operation)
+        self._check_cost(operation)
+        if self._tracer is not None:
+            self._tracer.execute_start(operation.name)
+        try:
+            self._init_plans(operation)
+            if isinstance(operation, GraphQlQuery):
+                result = self._execute_query(operation)
+            else:
+                result = self._execute_mutation(operation)
+        finally:
+            if self._tracer is not None:
+                self._tracer.execute_end(self._errors)
+            if self._response_size is not None:
+                try:
+                    self._context.response_size(
+                        self._response_size.num_objects,
+                        self._response_size.num_bytes)
+                except:
+                    pass
         if self._errors:
             return {'data': result, 'errors': self._errors}
         else:
             return {'data': result}
 
     @staticmethod
-    def execute(document_str, context, variables={}, operation_name=None):
+    def _create(document, context, operation_name, graphql_variables):
+        """Return a GraphQlExecutor for executing the specified document.
+
+        If GraphQlContext.tracer() returns a tracer that samples the
+        execution, this returns a _GraphQlTracingExecutor, so that we
+        do not do any tracing work when we are not tracing.  The
+        arguments are the same as for the constructor.
+        """
+        tracer = context.tracer()
+        if tracer is not None and tracer.is_sampled():
+            executor = _GraphQlTracingExecutor(
+                document, context, operation_name, graphql_variables)
+            executor._tracer = tracer
+            return executor
+        else:
+            return GraphQlExecutor(
+                document, context, operation_name, graphql_variables)
+
+    @staticmethod
+    def _hook_result(context, method_name, result):
+        """Return the "result" argument to pass to a GraphQlContext hook.
+
+        GraphQlContext context - The context.
+        basestring method_name - The name of the hook method, as in
+            GraphQlContext.result_access.
+        dict<basestring, object> result - The execution response.
+        return dict<basestring, object> - The argument.
+        """
+        access = context.result_access(method_name)
+        if access == GraphQlResultAccess.shared:
+            return result
+        elif access == GraphQlResultAccess.copy:
+            return copy.deepcopy(result)
+        else:
+            return None
+
+    @staticmethod
+    def _encode_json_leaf(value):
+        """Return the JSON encoding of the specified value.
+
+        This is faster than _json_encoder.encode for common values.
+
+        object value - The value.  This must not be a dict, list, tuple,
+            or GraphQlResultObject, but it may be a _GraphQlJsonFragment.
+        return str - The encoding.
+        """
+        if isinstance(value, _GraphQlJsonFragment):
+            return value
+        elif isinstance(value, basestring):
+            return json.encoder.encode_basestring_ascii(value)
+        elif value is None:
+            return 'null'
+        elif value is True:
+            return 'true'
+        elif value is False:
+            return 'false'
+        elif isinstance(value, (int, long)):
+            return str(value)
+        else:
+            return GraphQlExecutor._json_encoder.encode(value)
+
+    @staticmethod
+    def _append_json(value, parts):
+        """Append the JSON encoding of the specified value to "parts".
+
+        We encode _GraphQlJsonFragments verbatim.
+
+        object value - The JSON value.  This may contain
+            _GraphQlJsonFragments and GraphQlResultObjects.
+        list<str> parts - The list to which to append strings whose
+            concatenation is the encoding.
+        """
+        if isinstance(value, (dict, GraphQlResultObject)):
+            items = value.iteritems()
+            separator = '{'
+            for key, sub_value in items:
+                parts.append(separator)
+                parts.append(json.encoder.encode_basestring_ascii(key))
+                parts.append(':')
+                if isinstance(
+                        sub_value, (dict, list, tuple, GraphQlResultObject)):
+                    GraphQlExecutor._append_json(sub_value, parts)
+                else:
+                    parts.append(GraphQlExecutor._encode_json_leaf(sub_value))
+                separator = ','
+            parts.append('{}' if separator == '{' else '}')
+        elif isinstance(value, (list, tuple)):
+            separator = '['
+            for element in value:
+                parts.append(separator)
+                if isinstance(
+                        element, (dict, list, tuple, GraphQlResultObject)):
+                    GraphQlExecutor._append_json(element, parts)
+                else:
+                    parts.append(GraphQlExecutor._encode_json_leaf(element))
+                separator = ','
+            parts.append('[]' if separator == '[' else ']')
+        else:
+            parts.append(GraphQlExecutor._encode_json_leaf(value))
+
+    @staticmethod
+    def _json_parts(value):
+        """Return a generator for the JSON encoding of the specified value.
+
+        This is like _append_json, except that it yields the strings
+        rather than appending them to a list.  It yields the encoding of
+        each element of a dict or list separately, so that we do not
+        hold the encoding of a large list in memory.
+
+        object value - The JSON value.  This may contain
+            _GraphQlJsonFragments and GraphQlResultObjects.
+        return generator<str> - The generator.
+        """
+        if isinstance(value, (dict, GraphQlResultObject)):
+            items = value.iteritems()
+            separator = '{'
+            for key, sub_value in items:
+                yield separator
+                yield json.encoder.encode_basestring_ascii(key)
+                yield ':'
+                for part in GraphQlExecutor._json_parts(sub_value):
+                    yield part
+                separator = ','
+            yield '{}' if separator == '{' else '}'
+        elif isinstance(value, (list, tuple)):
+            separator = '['
+            for element in value:
+                yield separator
+                for part in GraphQlExecutor._json_parts(element):
+                    yield part
+                separator = ','
+            yield '[]' if separator == '[' else ']'
+        else:
+            yield GraphQlExecutor._encode_json_leaf(value)
+
+    @staticmethod
+    def _json_chunks(result):
+        """Return a generator for the JSON encoding of the specified response.
+
+        The generator yields strings of at least _CHUNK_SIZE characters,
+        apart from the last one, whose concatenation is the JSON
+        encoding.  The entries appear in the order "data", "errors",
+        "extensions".
+
+        dict<basestring, object> result - The execution response.  This
+            may contain _GraphQlJsonFragments and GraphQlResultObjects.
+        return generator<str> - The generator.
+        """
+        response = collections.OrderedDict()
+        for key in ('data', 'errors', 'extensions'):
+            if key in result:
+                response[key] = result[key]
+        parts = []
+        size = 0
+        for part in GraphQlExecutor._json_parts(response):
+            parts.append(part)
+            size += len(part)
+            if size >= GraphQlExecutor._CHUNK_SIZE:
+                yield ''.join(parts)
+                parts = []
+                size = 0
+        if parts:
+            yield ''.join(parts)
+
+    @staticmethod
+    def _add_tracer_extensions(executor, extensions):
+        """Return the "extensions" entry, including the tracer's entries.
+
+        GraphQlExecutor executor - The executor that executed the
+            document, or None if we did not create one.
+        dict<basestring, object> extensions - The return value of
+            GraphQlContext.extensions.
+        return dict<basestring, object> - The "extensions" entry, or
+            None if we should not include one.
+        """
+        if executor is None or executor._tracer is None:
+            return extensions
+        try:
+            tracer_extensions = executor._tracer.extensions()
+        except:
+            return extensions
+        if not tracer_extensions:
+            return extensions
+        if extensions is None:
+            return tracer_extensions
+        merged_extensions = dict(extensions)
+        merged_extensions.update(tracer_extensions)
+        return merged_extensions
+
+    @staticmethod
+    def _timeout_deadline(timeout):
+        """Return the deadline for a call with the specified timeout.
+
+        number timeout - The "timeout" argument to execute or the like.
+        return float - The deadline, as returned by time.time(), or None
+            if timeout is None.
+        """
+        if timeout is None:
+            return None
+        return time.time() + timeout
+
+    @staticmethod
+    def _execute_str(
+            document_str, context, variables, operation_name,
+            json_fragments, timeout):
         """Return the JSON value result of executing the specified document.
 
-        basestring document_str - The document to execute.
-        GraphQlContext context - The context.  See the comments for
-            GraphQlContext.
-        mixed variables - The variable values to pass to the document,
-            as in _graphql_variables.
-        basestring operation_name - The name of the operation to
-            execute.  This may be None if the document only has one
-            operation.
-        return object - The JSON value.
+        This is the same as execute, except that if json_fragments is
+        True, the result may contain _GraphQlJsonFragments, as in
+        _json_fragments.
         """
+        deadline = GraphQlExecutor._timeout_deadline(timeout)
         try:
             context.execute_document_str_start(document_str, operation_name)
         except:
             pass
+        executor = None
         try:
-            document = GraphQlParser(document_str, context.schema).parse()
+            document_cache = context.document_cache()
+            limits = context.parser_limits()
+            if document_cache is not None:
+                document = document_cache.document(
+                    document_str, context.schema, limits)
+            else:
+                document = GraphQlParser(
+                    document_str, context.schema, **limits).parse()
             context.parsed_document(document, operation_name)
-            executor = GraphQlExecutor(
+            executor = GraphQlExecutor._create(
                 document, context, operation_name, variables)
+            executor._json_fragments = json_fragments
+            executor._limit_deadline(deadline)
             result = executor._execute_document()
             exception = None
             exception_info = None
         except (GraphQlOperationNameError,
                 GraphQlParseError,
+                GraphQlQueryCostError,
+                GraphQlResponseSizeError,
                 GraphQlVariablesError) as exception:
             exception_info = sys.exc_info()
             result = {
@@ -637,39 +1984,36 @@ class GraphQlExecutor(object):
             }
         try:
             context.execute_document_str_end(
-                document_str, operation_name, copy.deepcopy(result),
+                document_str, operation_name,
+                GraphQlExecutor._hook_result(
+                    context, 'execute_document_str_end', result),
                 exception, exception_info)
         except:
             pass
         try:
             extensions = context.extensions(
-                copy.deepcopy(result), exception, exception_info)
+                GraphQlExecutor._hook_result(context, 'extensions', result),
+                exception, exception_info)
         except:
             extensions = None
+        extensions = GraphQlExecutor._add_tracer_extensions(
+            executor, extensions)
         if extensions is not None:
             result['extensions'] = extensions
         return result
 
     @staticmethod
-    def execute_document(document, context, variables={}, operation_name=None):
+    def _execute_document_object(
+            document, context, variables, operation_name, json_fragments,
+            timeout):
         """Return the JSON value result of executing the given GraphQlDocument.
 
-        If the callsite has a document string rather than a
-        GraphQlDocument, it should call execute instead, as execute
-        handles errors properly in that case.  execute_document is
-        useful as an optimization when executing a document multiple
-        times.
-
-        GraphQlDocument document - The document to execute.
-        GraphQlContext context - The context.  See the comments for
-            GraphQlContext.
-        mixed variables - The variable values to pass to the document,
-            as in _graphql_variables.
-        basestring operation_name - The name of the operation to
-            execute.  This may be None if the document only has one
-            operation.
-        return object - The JSON value.
+        This is the same as execute_document, except that if
+        json_fragments is True, the result may contain
+        _GraphQlJsonFragments, as in _json_fragments.
         """
+        deadline = GraphQlExecutor._timeout_deadline(timeout)
+        executor = None
         try:
             if document.schema != context.schema:
                 raise GraphQlSchemaMismatchError(
@@ -678,12 +2022,16 @@ class GraphQlExecutor(object):
                 context.execute_document_start(document, operation_name)
             except:
                 pass
-            executor = GraphQlExecutor(
+            executor = GraphQlExecutor._create(
                 document, context, operation_name, variables)
+            executor._json_fragments = json_fragments
+            executor._limit_deadline(deadline)
             result = executor._execute_document()
             exception = None
             exception_info = None
         except (GraphQlOperationNameError,
+                GraphQlQueryCostError,
+                GraphQlResponseSizeError,
                 GraphQlSchemaMismatchError,
                 GraphQlVariablesError) as exception:
             exception_info = sys.exc_info()
@@ -693,15 +2041,341 @@ class GraphQlExecutor(object):
             }
         try:
             context.execute_document_end(
-                document, operation_name, copy.deepcopy(result),
+                document, operation_name,
+                GraphQlExecutor._hook_result(
+                    context, 'execute_document_end', result),
                 exception, exception_info)
         except:
             pass
         try:
             extensions = context.extensions(
-                copy.deepcopy(result), exception, exception_info)
+                GraphQlExecutor._hook_result(context, 'extensions', result),
+                exception, exception_info)
         except:
             extensions = None
+        extensions = GraphQlExecutor._add_tracer_extensions(
+            executor, extensions)
         if extensions is not None:
             result['extensions'] = extensions
         return result
+
+    @staticmethod
+    def encode_json(result):
+        """Return the JSON encoding of the specified execution result.
+
+        This is like json.dumps(result, separators=(',', ':')), except
+        that it supports GraphQlResultObjects, as in
+        GraphQlContext.compact_results(), and preserves the order of
+        their fields.
+
+        object result - The JSON value result, as returned by execute or
+            execute_document, or a part of it.
+        return str - The encoding.
+        """
+        parts = []
+        GraphQlExecutor._append_json(result, parts)
+        return ''.join(parts)
+
+    @staticmethod
+    def _uses_json_fragments(context, method_name):
+        """Return whether to use _GraphQlJsonFragments for execute_chunks.
+
+        We may only use them if the context's hooks do not receive the
+        result, since the hooks expect plain JSON values.
+
+        GraphQlContext context - The context.
+        basestring method_name - The name of the hook method we call
+            when we finish executing the document, either
+            "execute_document_str_end" or "execute_document_end".
+        return bool - Whether to use _GraphQlJsonFragments.
+        """
+        return (
+            context.result_access(method_name) == GraphQlResultAccess.none and
+            context.result_access('extensions') == GraphQlResultAccess.none)
+
+    @staticmethod
+    def execute(
+            document_str, context, variables={}, operation_name=None,
+            timeout=None):
+        """Return the JSON value result of executing the specified document.
+
+        basestring document_str - The document to execute.
+        GraphQlContext context - The context.  See the comments for
+            GraphQlContext.
+        mixed variables - The variable values to pass to the document,
+            as in _graphql_variables.
+        basestring operation_name - The name of the operation to
+            execute.  This may be None if the document only has one
+            operation.
+        number timeout - The maximum number of seconds to spend
+            executing the document, or None if there is no maximum.
+            Once this time passes, we stop resolving fields, and the
+            result contains a GraphQlTimeoutError and whatever partial
+            data we computed.  If GraphQlContext.deadline() is earlier,
+            we use that deadline instead.
+        return object - The JSON value.
+        """
+        return GraphQlExecutor._execute_str(
+            document_str, context, variables, operation_name, False,
+            timeout)
+
+    @staticmethod
+    def execute_document(
+            document, context, variables={}, operation_name=None,
+            timeout=None):
+        """Return the JSON value result of executing the given GraphQlDocument.
+
+        If the callsite has a document string rather than a
+        GraphQlDocument, it should call execute instead, as execute
+        handles errors properly in that case.  execute_document is
+        useful as an optimization when executing a document multiple
+        times.
+
+        GraphQlDocument document - The document to execute.
+        GraphQlContext context - The context.  See the comments for
+            GraphQlContext.
+        mixed variables - The variable values to pass to the document,
+            as in _graphql_variables.
+        basestring operation_name - The name of the operation to
+            execute.  This may be None if the document only has one
+            operation.
+        number timeout - The maximum number of seconds to spend
+            executing the document, as in the "timeout" argument to
+            execute.
+        return object - The JSON value.
+        """
+        return GraphQlExecutor._execute_document_object(
+            document, context, variables, operation_name, False, timeout)
+
+    @staticmethod
+    def execute_chunks(
+            document_str, context, variables={}, operation_name=None,
+            timeout=None):
+        """Return the JSON-encoded result of executing the specified document.
+
+        This is like json.dumps(execute(...)), except that it returns an
+        iterator over chunks of the JSON string, so that we may write
+        them to a file or a socket one at a time, e.g. using
+        output.writelines(GraphQlExecutor.execute_chunks(...)).  The
+        response's entries appear in the order "data", "errors",
+        "extensions", and the fields appear in the same order as in
+        execute.
+
+        execute_chunks uses much less memory than execute for large
+        responses.  Rather than building a tree of OrderedDicts for the
+        entire response, it encodes each object value as a compact JSON
+        string as soon as it has finished executing the object's fields,
+        and it never holds the entire JSON string in memory.  Objects
+        with batched fields, GraphQlDeferredValues, or futures, and the
+        objects that contain them, remain OrderedDicts until the end of
+        execution, as do all objects if the context's hooks receive the
+        result (see GraphQlContext.result_access).
+
+        The arguments are the same as for execute.
+
+        return iterator<str> - The chunks.
+        """
+        result = GraphQlExecutor._execute_str(
+            document_str, context, variables, operation_name,
+            GraphQlExecutor._uses_json_fragments(
+                context, 'execute_document_str_end'),
+            timeout)
+        return GraphQlExecutor._json_chunks(result)
+
+    @staticmethod
+    def execute_document_chunks(
+            document, context, variables={}, operation_name=None,
+            timeout=None):
+        """Return the JSON-encoded result of executing the GraphQlDocument.
+
+        This is to execute_document as execute_chunks is to execute.
+        The arguments are the same as for execute_document.
+
+        return iterator<str> - The chunks.
+        """
+        result = GraphQlExecutor._execute_document_object(
+            document, context, variables, operation_name,
+            GraphQlExecutor._uses_json_fragments(
+                context, 'execute_document_end'),
+            timeout)
+        return GraphQlExecutor._json_chunks(result)
+
+
+class _GraphQlTracingExecutor(GraphQlExecutor):
+    """A GraphQlExecutor that notifies a GraphQlTracer of field events.
+
+    GraphQlExecutor._create returns a _GraphQlTracingExecutor if we are
+    tracing the execution.  It overrides some of GraphQlExecutor's
+    methods with versions that notify _tracer or keep track of _path.
+    """
+
+    # Private attributes:
+    # list<object> _path - The path of the field or list element we are
+    #     executing, consisting of response keys and list indices.  See
+    #     GraphQlTracer.field_start.
+    # list<list<tuple>> _trace_plans - The execution plans of the objects
+    #     whose fields we are executing, from outermost to innermost.
+
+    def __init__(self, document, context, operation_name, graphql_variables):
+        super(_GraphQlTracingExecutor, self).__init__(
+            document, context, operation_name, graphql_variables)
+        self._path = []
+        self._trace_plans = []
+
+    def _execute_selection_sets(self, value, t, selection_sets):
+        """Traced version of GraphQlExecutor._execute_selection_sets.
+
+        This adds the index of each list element to _path while we
+        execute it.
+        """
+        if isinstance(t, GraphQlNonNullType):
+            list_type = t.value_type
+        else:
+            list_type = t
+        if value is None or not isinstance(list_type, GraphQlListType):
+            return GraphQlExecutor._execute_selection_sets(
+                self, value, t, selection_sets)
+        result = []
+        self._path.append(None)
+        try:
+            for index, element in enumerate(value):
+                self._path[-1] = index
+                result.append(
+                    self._execute_selection_sets(
+                        element, list_type.element_type, selection_sets))
+        finally:
+            self._path.pop()
+        return result
+
+    def _execute_selection_sets_checked(self, value, t, selection_sets):
+        """Traced version of GraphQlExecutor._execute_selection_sets_checked.
+
+        This adds the index of each list element to _path while we
+        execute it.
+        """
+        if isinstance(t, GraphQlNonNullType):
+            list_type = t.value_type
+        else:
+            list_type = t
+        if (not isinstance(list_type, GraphQlListType) or
+                not isinstance(value, (list, tuple))):
+            return GraphQlExecutor._execute_selection_sets_checked(
+                self, value, t, selection_sets)
+        result = []
+        self._path.append(None)
+        try:
+            for index, element in enumerate(value):
+                self._path[-1] = index
+                result.append(
+                    self._execute_selection_sets_checked(
+                        element, list_type.element_type, selection_sets))
+        finally:
+            self._path.pop()
+        return result
+
+    def _execute_selection_sets_base(self, value, selection_sets, plan=None):
+        """Traced version of GraphQlExecutor._execute_selection_sets_base.
+
+        This adds the plan to _trace_plans while we execute it.
+        """
+        if plan is None:
+            plan = self._plan(
+                selection_sets, self._document.schema.object_type(value))
+        self._trace_plans.append(plan)
+        try:
+            return GraphQlExecutor._execute_selection_sets_base(
+                self, value, selection_sets, plan)
+        finally:
+            self._trace_plans.pop()
+
+    def _execute_field_queries(
+            self, value, field, arguments, selection_sets, results,
+            response_key):
+        """Traced version of GraphQlExecutor._execute_field_queries.
+
+        This adds the response key to _path while we execute the field
+        queries.
+        """
+        if isinstance(results, list):
+            # The keys of GraphQlResultObject results are plan indices
+            path_key = self._trace_plans[-1][response_key][0]
+        else:
+            path_key = response_key
+        self._path.append(path_key)
+        try:
+            GraphQlExecutor._execute_field_queries(
+                self, value, field, arguments, selection_sets, results,
+                response_key)
+        finally:
+            self._path.pop()
+
+    def _resolve_field(self, value, field, non_context_kwargs):
+        """Traced version of GraphQlExecutor._resolve_field.
+
+        This notifies _tracer of the start and end of the field.
+        """
+        path = tuple(self._path)
+        parent_type = self._document.schema.object_type(value)
+        self._tracer.field_start(path, parent_type, field, non_context_kwargs)
+        start_time = timeit.default_timer()
+        try:
+            field_value = GraphQlExecutor._resolve_field(
+                self, value, field, non_context_kwargs)
+        except Exception as exception:
+            exception_info = sys.exc_info()
+            self._tracer.field_end(
+                path, parent_type, field, non_context_kwargs, start_time,
+                timeit.default_timer() - start_time, exception)
+            raise exception_info[0], exception_info[1], exception_info[2]
+        self._tracer.field_end(
+            path, parent_type, field, non_context_kwargs, start_time,
+            timeit.default_timer() - start_time, None)
+        return field_value
+
+    def _pending_path(self):
+        """Traced version of GraphQlExecutor._pending_path.
+
+        This returns the current value of _path.
+        """
+        return tuple(self._path)
+
+    def _resolve_batch(self, method, field, kwargs, pending_fields):
+        """Traced version of GraphQlExecutor._resolve_batch.
+
+        This notifies _tracer of the start and end of each of the
+        batch's fields.
+        """
+        paths_and_types = []
+        for pending_field in pending_fields:
+            path = pending_field[8]
+            parent_type = self._document.schema.object_type(pending_field[0])
+            paths_and_types.append((path, parent_type))
+            self._tracer.field_start(path, parent_type, field, kwargs)
+        start_time = timeit.default_timer()
+        exception = None
+        try:
+            field_values = GraphQlExecutor._resolve_batch(
+                self, method, field, kwargs, pending_fields)
+        except Exception as exception:
+            exception_info = sys.exc_info()
+        duration = timeit.default_timer() - start_time
+        for path, parent_type in paths_and_types:
+            self._tracer.field_end(
+                path, parent_type, field, kwargs, start_time, duration,
+                exception)
+        if exception is not None:
+            raise exception_info[0], exception_info[1], exception_info[2]
+        return field_values
+
+    def _execute_pending_value(self, pending_field, field_value):
+        """Traced version of GraphQlExecutor._execute_pending_value.
+
+        This sets _path to the path of the field while we execute it.
+        """
+        path = self._path
+        self._path = list(pending_field[8])
+        try:
+            GraphQlExecutor._execute_pending_value(
+                self, pending_field, field_value)
+        finally:
+            self._path = path
@@ -0,0 +1,58 @@
+import bisect
+
+
+class GraphQlLatencyStats(object):
+    """Aggregate statistics about the durations of a kind of call.
+
+    For example, GraphQlStats uses a GraphQlLatencyStats for each GraphQL
+    field, to keep track of the calls to the field's method.
+
+    Public attributes:
+
+    tuple<float> bucket_bounds - The upper bounds of the histogram
+        buckets, in seconds, in increasing order.
+    list<int> bucket_counts - The number of calls in each histogram
+        bucket.  bucket_counts[i] is the number of calls that took at
+        most bucket_bounds[i] seconds and, if i > 0, more than
+        bucket_bounds[i - 1] seconds.  The last element, which has index
+        len(bucket_bounds), is the number of calls that took more than
+        bucket_bounds[-1] seconds.
+    int count - The number of calls.
+    int error_count - The number of calls that failed.
+    float max_time - The maximum duration of a call, in seconds, or 0 if
+        there have not been any calls.
+    float total_time - The total duration of the calls, in seconds.
+    """
+
+    def __init__(self, bucket_bounds):
+        self.bucket_bounds = bucket_bounds
+        self.bucket_counts = [0] * (len(bucket_bounds) + 1)
+        self.count = 0
+        self.error_count = 0
+        self.max_time = 0
+        self.total_time = 0
+
+    def record(self, duration, is_error):
+        """Add a call to the statistics.
+
+        float duration - The duration of the call, in seconds.
+        bool is_error - Whether the call failed.
+        """
+        self.count += 1
+        if is_error:
+            self.error_count += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.bucket_counts[
+            bisect.bisect_left(self.bucket_bounds, duration)] += 1
+
+    def copy(self):
+        """Return a copy of this GraphQlLatencyStats."""
+        stats = GraphQlLatencyStats(self.bucket_bounds)
+        stats.bucket_counts = list(self.bucket_counts)
+        stats.count = self.count
+        stats.error_count = self.error_count
+        stats.max_time = self.max_time
+        stats.total_time = self.total_time
+        return stats
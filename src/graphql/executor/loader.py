@@ -0,0 +1,246 @@
+import sys
+
+
+class GraphQlDeferredValue(object):
+    """A value that a GraphQlLoader will load later.
+
+    A method that returns the value of a GraphQL field may return a
+    GraphQlDeferredValue instead of the value itself.  GraphQlExecutor
+    collects the keys of the deferred values it encounters, loads them
+    using as few calls to the loaders as possible, and then uses the
+    loaded values as the values of the fields.  We obtain a
+    GraphQlDeferredValue by calling GraphQlLoader.load or
+    GraphQlLoader.load_many.
+
+    Public attributes:
+
+    tuple keys - The keys of the values we are loading.
+    GraphQlLoader loader - The loader that loads the values.
+    """
+
+    # Private attributes:
+    # list<function> _callbacks - The functions to apply to the loaded value,
+    #     in order, as in "then".
+    # bool _is_list - Whether the value is a list of the values of "keys",
+    #     rather than the value of the single element of "keys".
+
+    def __init__(self, loader, keys, is_list, callbacks):
+        """Private constructor."""
+        self.loader = loader
+        self.keys = keys
+        self._is_list = is_list
+        self._callbacks = callbacks
+
+    def then(self, func):
+        """Return a GraphQlDeferredValue for the result of applying "func".
+
+        Return a GraphQlDeferredValue whose value is the return value of
+        calling "func" on this GraphQlDeferredValue's value, once it is
+        loaded.  "func" may return another GraphQlDeferredValue, in
+        which case we load that value as well.
+
+        function func - The function.
+        return GraphQlDeferredValue - The deferred value.
+        """
+        return GraphQlDeferredValue(
+            self.loader, self.keys, self._is_list, self._callbacks + [func])
+
+    def value(self):
+        """Return the value, assuming "loader" has loaded "keys".
+
+        Raise any exception that occurred when loading the keys or
+        applying the functions passed to "then".  The return value may
+        be another GraphQlDeferredValue, if one of the functions passed
+        to "then" returned one.
+
+        return mixed - The value.
+        """
+        values = [self.loader.loaded_value(key) for key in self.keys]
+        if self._is_list:
+            value = values
+        else:
+            value = values[0]
+        for index, func in enumerate(self._callbacks):
+            value = func(value)
+            if isinstance(value, GraphQlDeferredValue):
+                for callback in self._callbacks[index + 1:]:
+                    value = value.then(callback)
+                return value
+        return value
+
+
+class GraphQlLoader(object):
+    """Loads values by key in batches, for use in GraphQL field methods.
+
+    GraphQlLoader serves a purpose similar to that of DataLoader in
+    JavaScript.  It is useful for fields whose values we look up by key,
+    such as an ID, in a database or backend service.  Rather than
+    looking up each value separately, a method that returns the value of
+    a field returns load(key), a GraphQlDeferredValue.  GraphQlExecutor
+    gathers the keys of all of the deferred values it encounters at
+    once, such as those for all of the elements of a list, and loads
+    them in a single call to load_batch.  A GraphQlLoader caches the
+    values it loads, so it does not load the same key more than once.
+
+    To create a loader, we may either pass a function to the
+    constructor or subclass GraphQlLoader and override load_batch.  A
+    loader's cache is not shared with other loaders, and it lasts until
+    we call "clear", so we should typically create a new loader for each
+    request.  See GraphQlLoaderRegistry.
+    """
+
+    # Private attributes:
+    # function _batch_func - The function that load_batch calls, if any.
+    # dict<object, tuple<type, mixed, traceback>> _exception_infos - A map
+    #     from each key we failed to load to information about the exception
+    #     we encountered, as returned by sys.exc_info().
+    # dict<object, mixed> _values - A map from each key we have loaded to its
+    #     value.
+
+    def __init__(self, batch_func=None):
+        """Initialize a GraphQlLoader.
+
+        function batch_func - The function that load_batch calls, if
+            any.  It takes the same argument and returns the same value
+            as load_batch.
+        """
+        self._batch_func = batch_func
+        self._values = {}
+        self._exception_infos = {}
+
+    def load_batch(self, keys):
+        """Return the values of the specified keys.
+
+        The default implementation calls the function passed to the
+        constructor.
+
+        list keys - The keys.  These are distinct and hashable.
+        return list - The values of the keys, in the same order as
+            "keys".  This may also be a tuple.
+        """
+        if self._batch_func is None:
+            raise NotImplementedError(
+                'Subclasses must implement load_batch')
+        return self._batch_func(keys)
+
+    def load(self, key):
+        """Return a GraphQlDeferredValue for the value of the specified key.
+
+        object key - The key.  This must be hashable.
+        return GraphQlDeferredValue - The deferred value.
+        """
+        return GraphQlDeferredValue(self, (key,), False, [])
+
+    def load_many(self, keys):
+        """Return a GraphQlDeferredValue for the list of the keys' values.
+
+        list keys - The keys.  These must be hashable.
+        return GraphQlDeferredValue - The deferred value.
+        """
+        return GraphQlDeferredValue(self, tuple(keys), True, [])
+
+    def clear(self):
+        """Remove all of the values we have loaded from the cache."""
+        self._values = {}
+        self._exception_infos = {}
+
+    def dispatch(self, keys):
+        """Load the specified keys, apart from those we have already loaded.
+
+        This calls load_batch at most once.  If load_batch raises an
+        exception or returns a value of the wrong length, then
+        loaded_value raises an exception for each of the keys.
+        GraphQlExecutor calls this method.
+
+        list keys - The keys.  These may contain duplicates.
+        """
+        keys_to_load = []
+        key_set = set()
+        for key in keys:
+            if (key not in self._values and
+                    key not in self._exception_infos and
+                    key not in key_set):
+                keys_to_load.append(key)
+                key_set.add(key)
+        if not keys_to_load:
+            return
+
+        try:
+            values = self.load_batch(keys_to_load)
+            if (not isinstance(values, (list, tuple)) or
+                    len(values) != len(keys_to_load)):
+                raise ValueError(
+                    '{:s}.load_batch must return a list or tuple with one '
+                    'value for each key'.format(self.__class__.__name__))
+        except Exception:
+            exception_info = sys.exc_info()
+            for key in keys_to_load:
+                self._exception_infos[key] = exception_info
+            return
+        for key, value in zip(keys_to_load, values):
+            self._values[key] = value
+
+    def loaded_value(self, key):
+        """Return the value of the specified key.
+
+        Raise the exception we encountered when loading the key, if
+        any.  Raise a KeyError if we have not loaded the key.
+
+        object key - The key.
+        return mixed - The value.
+        """
+        exception_info = self._exception_infos.get(key)
+        if exception_info is not None:
+            raise exception_info[0], exception_info[1], exception_info[2]
+        return self._values[key]
+
+
+class GraphQlLoaderRegistry(object):
+    """A collection of GraphQlLoaders, identified by name.
+
+    Each GraphQlContext has a GraphQlLoaderRegistry, which GraphQL field
+    methods may obtain using the "loaders" context argument.  See
+    GraphQlContext.context_arg.
+    """
+
+    # Private attributes:
+    # dict<basestring, GraphQlLoader> _loaders - A map from the name of each
+    #     loader to the loader.
+
+    def __init__(self):
+        self._loaders = {}
+
+    def register(self, name, loader):
+        """Add the specified loader to the registry.
+
+        basestring name - The name of the loader.  If the registry
+            already has a loader with this name, we replace it.
+        GraphQlLoader loader - The loader.
+        """
+        self._loaders[name] = loader
+
+    def loader(self, name):
+        """Return the loader with the specified name.
+
+        Raise a ValueError if there is no such loader.
+
+        basestring name - The name.
+        return GraphQlLoader - The loader.
+        """
+        loader = self._loaders.get(name)
+        if loader is None:
+            raise ValueError(u'Unknown loader {:s}'.format(name))
+        return loader
+
+    def load(self, name, key):
+        """Equivalent implementation is loader(name).load(key)."""
+        return self.loader(name).load(key)
+
+    def load_many(self, name, keys):
+        """Equivalent implementation is loader(name).load_many(keys)."""
+        return self.loader(name).load_many(keys)
+
+    def clear(self):
+        """Remove all of the values the loaders have loaded from the cache."""
+        for loader in self._loaders.itervalues():
+            loader.clear()
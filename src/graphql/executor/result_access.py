@@ -0,0 +1,17 @@
+class GraphQlResultAccess(object):
+    """An enumeration of the ways a GraphQlContext hook may see a result.
+
+    See GraphQlContext.result_access.
+    """
+
+    # The hook does not use the result, so we pass None in its place
+    none = 1
+
+    # The hook receives the result object itself, which it must not modify,
+    # and which it must not retain, since we may modify the result after
+    # calling the hook
+    shared = 2
+
+    # The hook receives a deep copy of the result, which it may modify or
+    # retain
+    copy = 3
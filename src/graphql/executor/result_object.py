@@ -0,0 +1,162 @@
+import collections
+import itertools
+
+
+class GraphQlResultObject(object):
+    """A compact representation of the JSON value result of an object.
+
+    If GraphQlContext.compact_results() returns True, GraphQlExecutor
+    represents the result of executing the selection sets of each object
+    value as a GraphQlResultObject rather than an OrderedDict.  This
+    applies to all of the objects in the "data" entry of the response,
+    apart from "data" itself.  A GraphQlResultObject stores the values
+    in a list, along with a tuple of the response keys that it shares
+    with the results of all other objects of the same type that we
+    queried using the same selection sets, so it requires far fewer
+    Python objects and operations than an OrderedDict.
+
+    GraphQlResultObject supports read-only dictionary access, so for
+    example dict(result_object) returns a dict with the same entries.
+    A GraphQlResultObject is equal to any GraphQlResultObject or dict
+    with the same entries.
+    To encode a result that contains GraphQlResultObjects as JSON, we
+    may call GraphQlExecutor.encode_json.  To convert it to an ordinary
+    JSON value, we may call GraphQlResultObject.to_json_value.
+    """
+
+    # Private attributes:
+    # tuple<basestring> _keys - The response keys, in order.
+    # dict<basestring, int> _indices - A map from each response key to its
+    #     index in _keys.  Like _keys, this is shared with other
+    #     GraphQlResultObjects that have the same keys.
+    # list<object> _values - The JSON value results of the fields, in the
+    #     same order as _keys.
+
+    __slots__ = ('_keys', '_indices', '_values')
+
+    def __init__(self, keys, values, indices=None):
+        """Initialize a GraphQlResultObject.
+
+        tuple<basestring> keys - The response keys, in order.
+        list<object> values - The JSON value results of the fields, in
+            the same order as "keys".
+        dict<basestring, int> indices - A map from each response key to
+            its index in "keys", or None to compute this from "keys".
+        """
+        if indices is None:
+            indices = GraphQlResultObject.key_indices(keys)
+        self._keys = keys
+        self._indices = indices
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._indices[key]]
+
+    def __contains__(self, key):
+        return key in self._indices
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __eq__(self, other):
+        if not isinstance(other, (GraphQlResultObject, dict)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for key, value in self.iteritems():
+            if key not in other or value != other[key]:
+                return False
+        return True
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    # GraphQlResultObjects compare equal to dictionaries, which are not
+    # hashable
+    __hash__ = None
+
+    def __repr__(self):
+        return 'GraphQlResultObject({:s})'.format(repr(self.to_dict()))
+
+    def get(self, key, default=None):
+        """Return the value for the specified key, or "default" if absent."""
+        index = self._indices.get(key)
+        if index is not None:
+            return self._values[index]
+        else:
+            return default
+
+    def keys(self):
+        """Return a list of the response keys, in order."""
+        return list(self._keys)
+
+    def values(self):
+        """Return a list of the field results, in order."""
+        return list(self._values)
+
+    def items(self):
+        """Return a list of the (key, value) pairs, in order."""
+        return zip(self._keys, self._values)
+
+    def iterkeys(self):
+        """Return an iterator over the response keys, in order."""
+        return iter(self._keys)
+
+    def itervalues(self):
+        """Return an iterator over the field results, in order."""
+        return iter(self._values)
+
+    def iteritems(self):
+        """Return an iterator over the (key, value) pairs, in order."""
+        return itertools.izip(self._keys, self._values)
+
+    @staticmethod
+    def key_indices(keys):
+        """Return a map from each of the specified keys to its index.
+
+        GraphQlExecutor computes this once for each execution plan and
+        passes it to the GraphQlResultObjects for the plan.
+
+        tuple<basestring> keys - The response keys.
+        return dict<basestring, int> - The indices.
+        """
+        return {key: index for index, key in enumerate(keys)}
+
+    def to_dict(self):
+        """Return the OrderedDict representation of this result.
+
+        This converts any nested GraphQlResultObjects as well.
+
+        return OrderedDict<basestring, object> - The result.
+        """
+        results = collections.OrderedDict()
+        for key, value in self.iteritems():
+            results[key] = GraphQlResultObject.to_json_value(value)
+        return results
+
+    @staticmethod
+    def to_json_value(value):
+        """Return the specified result, with dictionaries in place of objects.
+
+        object value - The JSON value result, e.g. the return value of
+            GraphQlExecutor.execute.  This may contain
+            GraphQlResultObjects.
+        return object - The result, with OrderedDicts in place of any
+            GraphQlResultObjects.
+        """
+        if isinstance(value, GraphQlResultObject):
+            return value.to_dict()
+        elif isinstance(value, dict):
+            results = value.__class__()
+            for key, sub_value in value.iteritems():
+                results[key] = GraphQlResultObject.to_json_value(sub_value)
+            return results
+        elif isinstance(value, list):
+            return [
+                GraphQlResultObject.to_json_value(element)
+                for element in value]
+        else:
+            return value
@@ -36,5 +36,5 @@ class GraphQlRootQueryObject(object):
         dict<basestring, mixed> **kwargs - The keyword arguments to pass
             to the function.
         """
-        return GraphQlFuncDescriptor(
-            module_name, class_name, func_name).load_func()(**kwargs)
+        return GraphQlFuncDescriptor.cached_func(
+            module_name, class_name, func_name)(**kwargs)
@@ -0,0 +1,207 @@
+import threading
+
+from latency_stats import GraphQlLatencyStats
+
+
+class GraphQlStats(object):
+    """Accumulates latency statistics about GraphQL fields and operations.
+
+    GraphQlStats keeps a GraphQlLatencyStats for each field, identified
+    by the name of its parent type and the name of the field, and for
+    each operation, identified by its name.  It is meant to be
+    long-lived, so that it accumulates statistics across all of the
+    executions in a process, which lets us find slow or failing fields
+    in production without capturing traces.  GraphQlStats is
+    thread-safe.
+
+    To collect statistics, GraphQlContext.tracer() should return a
+    GraphQlStatsTracer.  By default, a GraphQlStatsTracer reports to the
+    shared instance returned by instance().  To read the statistics, we
+    may call "snapshot", or we may call "text" to export them in the
+    Prometheus text format.
+    """
+
+    # The default upper bounds of the histogram buckets, in seconds
+    DEFAULT_BUCKET_BOUNDS = (
+        0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+
+    # The singleton instance of GraphQlStats, or None if we have not created
+    # this yet.
+    _instance = None
+
+    # The lock for creating _instance
+    _instance_lock = threading.Lock()
+
+    # Private attributes:
+    # tuple<float> _bucket_bounds - The upper bounds of the histogram
+    #     buckets, as in GraphQlLatencyStats.bucket_bounds.
+    # dict<tuple<basestring, basestring>, GraphQlLatencyStats> _field_stats -
+    #     A map from the parent type name and the field name of each field we
+    #     have recorded to its statistics.
+    # Lock _lock - The lock for accessing the statistics.
+    # dict<basestring, GraphQlLatencyStats> _operation_stats - A map from the
+    #     name of each operation we have recorded to its statistics.  The key
+    #     for anonymous operations is None.
+
+    def __init__(self, bucket_bounds=DEFAULT_BUCKET_BOUNDS):
+        """Initialize a GraphQlStats.
+
+        tuple<float> bucket_bounds - The upper bounds of the histogram
+            buckets, in seconds, in increasing order.
+        """
+        if list(bucket_bounds) != sorted(bucket_bounds):
+            raise ValueError('The bucket bounds must be in increasing order')
+        self._bucket_bounds = tuple(bucket_bounds)
+        self._field_stats = {}
+        self._operation_stats = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def instance():
+        """Return the shared GraphQlStats."""
+        if GraphQlStats._instance is None:
+            with GraphQlStats._instance_lock:
+                if GraphQlStats._instance is None:
+                    GraphQlStats._instance = GraphQlStats()
+        return GraphQlStats._instance
+
+    def record_field(self, type_name, field_name, duration, is_error):
+        """Add a call to the method of the specified field to the statistics.
+
+        basestring type_name - The name of the field's parent type.
+        basestring field_name - The name of the field.
+        float duration - The duration of the call, in seconds.
+        bool is_error - Whether the call raised an exception.
+        """
+        key = (type_name, field_name)
+        with self._lock:
+            stats = self._field_stats.get(key)
+            if stats is None:
+                stats = GraphQlLatencyStats(self._bucket_bounds)
+                self._field_stats[key] = stats
+            stats.record(duration, is_error)
+
+    def record_operation(self, operation_name, duration, is_error):
+        """Add an execution of the specified operation to the statistics.
+
+        basestring operation_name - The name of the operation, or None
+            if it is anonymous.
+        float duration - The duration of the execution, in seconds.
+        bool is_error - Whether the execution encountered any errors.
+        """
+        with self._lock:
+            stats = self._operation_stats.get(operation_name)
+            if stats is None:
+                stats = GraphQlLatencyStats(self._bucket_bounds)
+                self._operation_stats[operation_name] = stats
+            stats.record(duration, is_error)
+
+    def snapshot(self, reset=False):
+        """Return a copy of the statistics.
+
+        bool reset - Whether to clear the statistics after copying them,
+            as in "reset".  This happens atomically, so no calls are
+            lost between the snapshot and the reset.
+        return dict<basestring, dict> - A map with two entries.
+            "fields" is a map from the parent type name and field name
+            of each field to its GraphQlLatencyStats, and "operations"
+            is a map from the name of each operation to its
+            GraphQlLatencyStats.  The key for anonymous operations is
+            None.
+        """
+        with self._lock:
+            if reset:
+                field_stats = self._field_stats
+                operation_stats = self._operation_stats
+                self._field_stats = {}
+                self._operation_stats = {}
+            else:
+                field_stats = {}
+                for key, stats in self._field_stats.iteritems():
+                    field_stats[key] = stats.copy()
+                operation_stats = {}
+                for key, stats in self._operation_stats.iteritems():
+                    operation_stats[key] = stats.copy()
+        return {'fields': field_stats, 'operations': operation_stats}
+
+    def reset(self):
+        """Clear the statistics."""
+        with self._lock:
+            self._field_stats = {}
+            self._operation_stats = {}
+
+    @staticmethod
+    def _label_value(value):
+        """Return the Prometheus representation of the given label value.
+
+        basestring value - The label value, or None.
+        return basestring - The representation, including quotes.
+        """
+        if value is None:
+            value = u''
+        value = value.replace(u'\\', u'\\\\').replace(
+            u'"', u'\\"').replace(u'\n', u'\\n')
+        return u'"{:s}"'.format(value)
+
+    def text(self):
+        """Return the statistics in the Prometheus text exposition format.
+
+        The field metrics are named graphql_field_*, with "type" and
+        "field" labels, and the operation metrics are named
+        graphql_operation_*, with an "operation" label.  Each has a
+        *_duration_seconds histogram, a *_max_duration_seconds gauge,
+        and an *_errors_total counter.
+
+        return unicode - The text.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, kind in (
+                ('graphql_field', 'fields'),
+                ('graphql_operation', 'operations')):
+            labels_and_stats = []
+            for key in sorted(snapshot[kind].iterkeys()):
+                if kind == 'fields':
+                    labels = u'type={:s},field={:s}'.format(
+                        GraphQlStats._label_value(key[0]),
+                        GraphQlStats._label_value(key[1]))
+                else:
+                    labels = u'operation={:s}'.format(
+                        GraphQlStats._label_value(key))
+                labels_and_stats.append((labels, snapshot[kind][key]))
+
+            lines.append(
+                u'# TYPE {:s}_duration_seconds histogram'.format(name))
+            for labels, stats in labels_and_stats:
+                cumulative_count = 0
+                for bound, count in zip(
+                        stats.bucket_bounds, stats.bucket_counts):
+                    cumulative_count += count
+                    lines.append(
+                        u'{:s}_duration_seconds_bucket{{{:s},le="{:s}"}} '
+                        u'{:d}'.format(
+                            name, labels, repr(float(bound)),
+                            cumulative_count))
+                lines.append(
+                    u'{:s}_duration_seconds_bucket{{{:s},le="+Inf"}} '
+                    u'{:d}'.format(name, labels, stats.count))
+                lines.append(
+                    u'{:s}_duration_seconds_sum{{{:s}}} {:s}'.format(
+                        name, labels, repr(float(stats.total_time))))
+                lines.append(
+                    u'{:s}_duration_seconds_count{{{:s}}} {:d}'.format(
+                        name, labels, stats.count))
+
+            lines.append(
+                u'# TYPE {:s}_max_duration_seconds gauge'.format(name))
+            for labels, stats in labels_and_stats:
+                lines.append(
+                    u'{:s}_max_duration_seconds{{{:s}}} {:s}'.format(
+                        name, labels, repr(float(stats.max_time))))
+
+            lines.append(u'# TYPE {:s}_errors_total counter'.format(name))
+            for labels, stats in labels_and_stats:
+                lines.append(
+                    u'{:s}_errors_total{{{:s}}} {:d}'.format(
+                        name, labels, stats.error_count))
+        return u''.join([u'{:s}\n'.format(line) for line in lines])
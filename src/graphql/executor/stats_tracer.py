@@ -0,0 +1,61 @@
+import timeit
+
+from stats import GraphQlStats
+from tracer import GraphQlTracer
+
+
+class GraphQlStatsTracer(GraphQlTracer):
+    """A GraphQlTracer that adds the timings to a GraphQlStats.
+
+    GraphQlStatsTracer records the duration of each call to a field's
+    method, and the duration of the execution of each operation, in a
+    long-lived GraphQlStats.  For batched fields, as described in the
+    comments for graphql_batch_field, it records the duration of the
+    batch once for each object in the batch.  A GraphQlStatsTracer
+    should only be used for a single execution, so
+    GraphQlContext.tracer() should return a new instance each time.  To
+    record statistics alongside another tracer, such as a
+    GraphQlApolloTracer that only traces a sample of the executions, we
+    may combine them using GraphQlCompositeTracer.
+
+    Public attributes:
+
+    GraphQlStats stats - The statistics to which we add the timings.
+    """
+
+    # Private attributes:
+    # basestring _operation_name - The name of the operation we are
+    #     executing, or None if it is anonymous.
+    # float _start_time - The time at which we started executing the
+    #     document, as returned by timeit.default_timer().
+
+    def __init__(self, stats=None, sample_rate=1):
+        """Initialize a GraphQlStatsTracer.
+
+        GraphQlStats stats - The statistics to which to add the timings,
+            or None to use GraphQlStats.instance().
+        float sample_rate - The fraction of the executions to trace, as
+            in GraphQlTracer.sample_rate.
+        """
+        super(GraphQlStatsTracer, self).__init__(sample_rate)
+        if stats is None:
+            stats = GraphQlStats.instance()
+        self.stats = stats
+        self._operation_name = None
+        self._start_time = None
+
+    def execute_start(self, operation_name):
+        self._operation_name = operation_name
+        self._start_time = timeit.default_timer()
+
+    def execute_end(self, errors):
+        self.stats.record_operation(
+            self._operation_name, timeit.default_timer() - self._start_time,
+            bool(errors))
+
+    def field_end(
+            self, path, parent_type, field, arguments, start_time, duration,
+            exception):
+        self.stats.record_field(
+            parent_type.name, field.descriptor.name, duration,
+            exception is not None)
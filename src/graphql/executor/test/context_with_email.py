@@ -22,4 +22,4 @@ class GraphQlContextWithEmail(GraphQlContext):
         if name == 'email':
             return self._email
         else:
-            raise ValueError(u'Unknown context argument {:s}'.format(name))
+            return super(GraphQlContextWithEmail, self).context_arg(name)
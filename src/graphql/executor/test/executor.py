@@ -1,14 +1,33 @@
+import copy
+import json
+import sys
+import time
 import unittest
 
 from context_with_email import GraphQlContextWithEmail
 from graphql.document import GraphQlParser
+from graphql.executor import GraphQlApolloTracer
+from graphql.executor import GraphQlCompositeTracer
 from graphql.executor import GraphQlContext
+from graphql.executor import GraphQlCostAnalyzer
+from graphql.executor import GraphQlDocumentCache
 from graphql.executor import GraphQlExecutor
+from graphql.executor import GraphQlLatencyStats
+from graphql.executor import GraphQlLoader
+from graphql.executor import GraphQlResultAccess
+from graphql.executor import GraphQlResultObject
+from graphql.executor import GraphQlStats
+from graphql.executor import GraphQlStatsTracer
+from graphql.executor import GraphQlTracer
 from graphql.executor.test.star_wars_extra import get_sw_ship
 from graphql.executor.test.star_wars_extra import SwShip
 from graphql.executor.test.star_wars_extra import SwUsers
+from graphql.schema import GraphQlFuncDescriptor
+from graphql.schema import GraphQlImportTracker
 from graphql.schema import GraphQlSchemaFactory
 from silent_context import SilentGraphQlContext
+from thread_pool import SimpleFuture
+from thread_pool import SimpleThreadPool
 from tracking_context import TrackingGraphQlContext
 
 
@@ -364,6 +383,118 @@ class GraphQlExecutorTest(unittest.TestCase):
             context, {'if': False})
         self.assertEqual({'data': {'human': {}}}, result)
 
+    def test_execution_plans(self):
+        """Test reuse of the field collection results for multiple objects.
+        """
+        context = self._context()
+        document = GraphQlParser(
+            'query ($skip: Boolean!) {\n'
+            '  hero {\n'
+            '    friends {\n'
+            '      name\n'
+            '      ... on Human {homePlanet @skip(if: $skip)}\n'
+            '      ...DroidFields\n'
+            '    }\n'
+            '  }\n'
+            '}\n'
+            'fragment DroidFields on Droid @include(if: $skip) {\n'
+            '  primaryFunction\n'
+            '}\n',
+            context.schema).parse()
+        result = GraphQlExecutor.execute_document(
+            document, context, {'skip': False})
+        self.assertEqual(
+            {
+                'data': {
+                    'hero': {
+                        'friends': [
+                            {
+                                'name': 'Luke Skywalker',
+                                'homePlanet': 'Tatooine',
+                            },
+                            {'name': 'Han Solo', 'homePlanet': None},
+                            {'name': 'Leia Organa', 'homePlanet': 'Alderaan'},
+                        ],
+                    },
+                },
+            }, result)
+
+        result = GraphQlExecutor.execute_document(
+            document, context, {'skip': True})
+        self.assertEqual(
+            {
+                'data': {
+                    'hero': {
+                        'friends': [
+                            {'name': 'Luke Skywalker'},
+                            {'name': 'Han Solo'},
+                            {'name': 'Leia Organa'},
+                        ],
+                    },
+                },
+            }, result)
+
+        result = GraphQlExecutor.execute_document(
+            document, context, {'skip': False})
+        self.assertEqual(
+            'Tatooine',
+            result['data']['hero']['friends'][0]['homePlanet'])
+
+        result = GraphQlExecutor.execute(
+            '{human(id: "1000"){friends{name ...DroidFields}}} '
+            'fragment DroidFields on Droid {primaryFunction}',
+            context)
+        self.assertEqual(
+            {
+                'data': {
+                    'human': {
+                        'friends': [
+                            {'name': 'Han Solo'},
+                            {'name': 'Leia Organa'},
+                            {'name': 'C-3PO', 'primaryFunction': 'Protocol'},
+                            {'name': 'R2-D2', 'primaryFunction': 'Astromech'},
+                        ],
+                    },
+                },
+            }, result)
+
+    def test_root_func_cache(self):
+        """Test that we only load each root field's function once."""
+        loads = []
+        load_func = GraphQlFuncDescriptor.load_func
+
+        def counting_load_func(func_descriptor):
+            loads.append(func_descriptor.func_name)
+            return load_func(func_descriptor)
+
+        context = self._context()
+        document_str = '{hero {name}, human(id: "1000") {name}}'
+        funcs = GraphQlFuncDescriptor._funcs
+        GraphQlFuncDescriptor._funcs = {}
+        GraphQlFuncDescriptor.load_func = counting_load_func
+        try:
+            expected_result = GraphQlExecutor.execute(document_str, context)
+            self.assertEqual(['hero', 'human'], sorted(loads))
+            for i in xrange(3):
+                self.assertEqual(
+                    expected_result,
+                    GraphQlExecutor.execute(document_str, context))
+            self.assertEqual(['hero', 'human'], sorted(loads))
+
+            # GraphQlSchema.warm_up should fill the same cache
+            GraphQlFuncDescriptor._funcs = {}
+            del loads[:]
+            context.schema.warm_up(['Query'])
+            num_loads = len(loads)
+            self.assertIn('hero', loads)
+            self.assertEqual(
+                expected_result,
+                GraphQlExecutor.execute(document_str, context))
+            self.assertEqual(num_loads, len(loads))
+        finally:
+            GraphQlFuncDescriptor.load_func = load_func
+            GraphQlFuncDescriptor._funcs = funcs
+
     def test_gexecute_document(self):
         """Test GraphQlExecutor.execute_document."""
         context = self._context()
@@ -377,6 +508,57 @@ class GraphQlExecutorTest(unittest.TestCase):
         self.assertEqual(
             {'data': {'human': {'name': 'Luke Skywalker'}}}, result)
 
+    def test_document_cache(self):
+        """Test GraphQlDocumentCache and its use in GraphQlExecutor.execute.
+        """
+        context = SilentGraphQlContext(self._context().schema)
+        cache = GraphQlDocumentCache(2)
+        context.document_cache = lambda: cache
+        document_str = (
+            '{human(id: "1000"){...HumanFields @include(if: true)}} '
+            'fragment HumanFields on Human @include(if: true){name}')
+        for i in xrange(3):
+            result = GraphQlExecutor.execute(document_str, context)
+            self.assertEqual(
+                {'data': {'human': {'name': 'Luke Skywalker'}}}, result)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(1, cache.size())
+
+        document = cache.document(document_str, context.schema)
+        self.assertIs(document, cache.document(document_str, context.schema))
+        fragment_reference = (
+            document.operations[0].selection_set.field_queries_and_fragments[
+                0].selection_set.field_queries_and_fragments[0])
+        self.assertEqual(1, len(fragment_reference.directives))
+
+        cache.document('{hero{name}}', context.schema)
+        cache.document('{hero{id}}', context.schema)
+        self.assertEqual(2, cache.size())
+        self.assertEqual(1, cache.evictions)
+        cache.document('{hero{name}}', context.schema)
+        self.assertEqual(1, cache.evictions)
+        cache.set_max_size(1)
+        self.assertEqual(1, cache.size())
+        self.assertEqual(2, cache.evictions)
+
+        result = GraphQlExecutor.execute('{hero{name}', context)
+        self._validate_error_response(result)
+        self.assertEqual(1, cache.size())
+        cache.clear()
+        self.assertEqual(0, cache.size())
+
+        cache.document('{hero{name}}', context.schema)
+        context.parser_limits = lambda: {'max_depth': 1}
+        result = GraphQlExecutor.execute('{hero{name}}', context)
+        self._validate_error_response(result)
+        context.parser_limits = lambda: {'max_depth': 2, 'max_length': 20}
+        hits = cache.hits
+        for i in xrange(2):
+            result = GraphQlExecutor.execute('{hero{name}}', context)
+            self.assertEqual({'data': {'hero': {'name': 'R2-D2'}}}, result)
+        self.assertEqual(hits + 1, cache.hits)
+
     def test_mutations(self):
         """Test GraphQlExecutor on documents with mutations."""
         SwShip.reset()
@@ -617,6 +799,985 @@ class GraphQlExecutorTest(unittest.TestCase):
         self.assertGreater(len(result['errors']), 0)
         self.assertIsNone(result['data'])
 
+    def test_batch_fields(self):
+        """Test GraphQlExecutor on fields annotated with graphql_batch_field.
+        """
+        SwShip.reset()
+        context = SilentGraphQlContext(self._extra_schema())
+        SwShip.batch_call_count = 0
+        result = GraphQlExecutor.execute(
+            '{fleets{name, ships{name, nameLength}}}', context)
+        self.assertEqual(
+            {
+                'data': {
+                    'fleets': [
+                        {
+                            'name': 'Rebel Alliance',
+                            'ships': [
+                                {
+                                    'name': 'Millennium Falcon',
+                                    'nameLength': 17,
+                                },
+                                {'name': 'X-wing', 'nameLength': 6},
+                            ],
+                        },
+                        {
+                            'name': 'Smugglers',
+                            'ships': [
+                                {
+                                    'name': 'Millennium Falcon',
+                                    'nameLength': 17,
+                                },
+                            ],
+                        },
+                    ],
+                },
+            }, result)
+        self.assertEqual(1, SwShip.batch_call_count)
+
+        SwShip.batch_call_count = 0
+        result = GraphQlExecutor.execute(
+            '{fleets{ships{id, escorts{id, nameLength}, '
+            'allEscorts: escorts(count: 2){id}}}, ship(id: "3001"){'
+            'escorts{id, escorts{id}}}}',
+            context)
+        self.assertEqual(
+            {
+                'data': {
+                    'fleets': [
+                        {
+                            'ships': [
+                                {
+                                    'id': '3000',
+                                    'escorts': [
+                                        {'id': '3001', 'nameLength': 6},
+                                    ],
+                                    'allEscorts': [{'id': '3001'}],
+                                },
+                                {
+                                    'id': '3001',
+                                    'escorts': [
+                                        {'id': '3000', 'nameLength': 17},
+                                    ],
+                                    'allEscorts': [{'id': '3000'}],
+                                },
+                            ],
+                        },
+                        {
+                            'ships': [
+                                {
+                                    'id': '3000',
+                                    'escorts': [
+                                        {'id': '3001', 'nameLength': 6},
+                                    ],
+                                    'allEscorts': [{'id': '3001'}],
+                                },
+                            ],
+                        },
+                    ],
+                    'ship': {'escorts': [{'id': '3000', 'escorts': [
+                        {'id': '3001'}]}]},
+                },
+            }, result)
+        self.assertEqual(4, SwShip.batch_call_count)
+
+        result = GraphQlExecutor.execute(
+            '{fleets{ships{brokenNameLength}}}', context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual('GraphQlFieldTypeError', result['errors'][0]['type'])
+        self.assertEqual(
+            {
+                'fleets': [
+                    {
+                        'ships': [
+                            {'brokenNameLength': None},
+                            {'brokenNameLength': None},
+                        ],
+                    },
+                    {'ships': [{'brokenNameLength': None}]},
+                ],
+            }, result['data'])
+
+        result = GraphQlExecutor.execute(
+            '{fleets{name}, ship(id: "3000"){escorts(count: -1){name}}}',
+            context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        self.assertEqual(1, len(result['errors']))
+        self.assertIsNone(result['data'])
+
+        # Once a non-null batched field fails, we should skip the other
+        # fields under the value it sets to None
+        SwShip.batch_call_count = 0
+        result = GraphQlExecutor.execute(
+            '{ship(id: "3000"){escorts(count: -1){id}, '
+            'escorts2: escorts(count: 1){nameLength}}}',
+            context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        self.assertIsNone(result['data'])
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual(1, SwShip.batch_call_count)
+
+        result = GraphQlExecutor.execute(
+            '{fleets{name, ships{escorts(count: -1){id}, brokenNameLength}}}',
+            context)
+        self.assertIsNone(result['data'])
+        self.assertEqual(1, len(result['errors']))
+        self.assertNotEqual(
+            'GraphQlFieldTypeError', result['errors'][0]['type'])
+
+    def test_loaders(self):
+        """Test GraphQlLoader and GraphQlDeferredValue."""
+        SwShip.reset()
+        loaded_ship_ids = []
+
+        def load_ships(ship_ids):
+            loaded_ship_ids.append(ship_ids)
+            return [get_sw_ship(ship_id) for ship_id in ship_ids]
+
+        def load_ships_broken(ship_ids):
+            loaded_ship_ids.append(ship_ids)
+            raise RuntimeError('The ship database is down')
+
+        context = SilentGraphQlContext(self._extra_schema())
+        context.loaders.register('ships', GraphQlLoader(load_ships))
+        document_str = (
+            '{fleets{flagship{name}, flagshipName, loadedShips{id}}, '
+            'loadedShip(id: "3001"){name}}')
+        expected_result = {
+            'data': {
+                'fleets': [
+                    {
+                        'flagship': {'name': 'Millennium Falcon'},
+                        'flagshipName': 'Millennium Falcon',
+                        'loadedShips': [{'id': '3000'}, {'id': '3001'}],
+                    },
+                    {
+                        'flagship': {'name': 'Millennium Falcon'},
+                        'flagshipName': 'Millennium Falcon',
+                        'loadedShips': [{'id': '3000'}],
+                    },
+                ],
+                'loadedShip': {'name': 'X-wing'},
+            },
+        }
+        result = GraphQlExecutor.execute(document_str, context)
+        self.assertEqual(expected_result, result)
+        self.assertEqual([['3000', '3001']], loaded_ship_ids)
+
+        result = GraphQlExecutor.execute(document_str, context)
+        self.assertEqual(expected_result, result)
+        self.assertEqual([['3000', '3001']], loaded_ship_ids)
+
+        context.loaders.clear()
+        result = GraphQlExecutor.execute(
+            '{a: loadedShip(id: "3000"){id}, b: loadedShip(id: "3002"){id}}',
+            context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        # Both fields fail because of the same failed batch load
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual({'a': None, 'b': None}, result['data'])
+        self.assertEqual(
+            [['3000', '3001'], ['3000', '3002']], loaded_ship_ids)
+
+        del loaded_ship_ids[:]
+        context.loaders.register('ships', GraphQlLoader(load_ships_broken))
+        result = GraphQlExecutor.execute(
+            '{fleets{name}, loadedShip(id: "3000"){id}}', context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual('RuntimeError', result['errors'][0]['type'])
+        self.assertEqual(
+            {
+                'fleets': [{'name': 'Rebel Alliance'}, {'name': 'Smugglers'}],
+                'loadedShip': None,
+            }, result['data'])
+
+        result = GraphQlExecutor.execute(
+            '{fleets{flagshipName}, loadedShip(id: "3000"){id}}', context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        self.assertGreater(len(result['errors']), 0)
+        self.assertIsNone(result['data'])
+        self.assertEqual([['3000']], loaded_ship_ids)
+
+        # We should report a failed batch load once, not once per field
+        result = GraphQlExecutor.execute(
+            '{a: loadedShip(id: "3001"){id}, b: loadedShip(id: "3002"){id}, '
+            'c: loadedShip(id: "3001"){id}}',
+            context)
+        self.assertEqual({'a': None, 'b': None, 'c': None}, result['data'])
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual('RuntimeError', result['errors'][0]['type'])
+        self.assertEqual([['3000'], ['3001', '3002']], loaded_ship_ids)
+
+    def test_futures(self):
+        """Test field methods that return futures."""
+        class FutureContext(SilentGraphQlContext):
+            def __init__(self, schema):
+                super(FutureContext, self).__init__(schema)
+                self.thread_pool = SimpleThreadPool()
+
+            def context_arg(self, name):
+                if name == 'thread_pool':
+                    return self.thread_pool
+                return super(FutureContext, self).context_arg(name)
+
+            def future_types(self):
+                return (SimpleFuture,)
+
+        context = FutureContext(self._extra_schema())
+        result = GraphQlExecutor.execute(
+            '{fleets{name, shipsAsync{name, nameLength}}}', context)
+        self.assertEqual(
+            {
+                'data': {
+                    'fleets': [
+                        {
+                            'name': 'Rebel Alliance',
+                            'shipsAsync': [
+                                {
+                                    'name': 'Millennium Falcon',
+                                    'nameLength': 17,
+                                },
+                                {'name': 'X-wing', 'nameLength': 6},
+                            ],
+                        },
+                        {
+                            'name': 'Smugglers',
+                            'shipsAsync': [
+                                {
+                                    'name': 'Millennium Falcon',
+                                    'nameLength': 17,
+                                },
+                            ],
+                        },
+                    ],
+                },
+            }, result)
+        self.assertEqual(
+            ['submit', 'submit', 'result', 'result'],
+            context.thread_pool.events)
+
+        result = GraphQlExecutor.execute(
+            '{fleets{name, shipsAsync(broken: true){name}}}', context)
+        self.assertEqual(set(['data', 'errors']), set(result.iterkeys()))
+        # The first failure sets "data" to None, so we discard the second
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual('RuntimeError', result['errors'][0]['type'])
+        self.assertIsNone(result['data'])
+
+    def test_execute_chunks(self):
+        """Test GraphQlExecutor.execute_chunks."""
+        class ExtensionsContext(SilentGraphQlContext):
+            def extensions(self, result, exception, exception_info):
+                return {'fleetCount': len(result['data']['fleets'])}
+
+        SwShip.reset()
+        context = SilentGraphQlContext(self._extra_schema())
+        context.loaders.register(
+            'ships',
+            GraphQlLoader(
+                lambda ship_ids: [
+                    get_sw_ship(ship_id) for ship_id in ship_ids]))
+        extensions_context = ExtensionsContext(self._extra_schema())
+        document_strs = [
+            '{hero{name, friends{name, friends{id}}}}',
+            '{fleets{name, ships{name, nameLength, brokenNameLength}}}',
+            '{fleets{flagship{name}, loadedShips{id, escorts(count: 1){id}}}}',
+            '{fleets{name}, human(id: "9999"){name}, a: __typename}',
+            '{fleets{name, ships{name, escorts(count: -1){id}}}}',
+            '{fleets{name, ships{name}}, hero{friends{name}}}',
+            '{hero{name',
+        ]
+        original_chunk_size = GraphQlExecutor._CHUNK_SIZE
+        try:
+            for chunk_size in (original_chunk_size, 10):
+                GraphQlExecutor._CHUNK_SIZE = chunk_size
+                for document_str in document_strs:
+                    for cur_context in (context, extensions_context):
+                        if ('fleets' not in document_str and
+                                cur_context is extensions_context):
+                            continue
+                        chunks = list(
+                            GraphQlExecutor.execute_chunks(
+                                document_str, cur_context))
+                        for chunk in chunks[:-1]:
+                            self.assertGreaterEqual(len(chunk), chunk_size)
+                        json_str = ''.join(chunks)
+                        expected_result = GraphQlExecutor.execute(
+                            document_str, cur_context)
+                        self.assertEqual(
+                            expected_result, json.loads(json_str))
+                        if 'data' in expected_result:
+                            self.assertTrue(json_str.startswith('{"data":'))
+        finally:
+            GraphQlExecutor._CHUNK_SIZE = original_chunk_size
+
+        document_str = '{fleets{name, ships{name}}, hero{friends{name}}}'
+        document = GraphQlParser(document_str, context.schema).parse()
+        json_str = ''.join(
+            GraphQlExecutor.execute_document_chunks(document, context))
+        self.assertEqual(
+            GraphQlExecutor.execute_document(document, context),
+            json.loads(json_str))
+        self.assertEqual(
+            '{"data":{"fleets":[{"name":"Rebel Alliance","ships":['
+            '{"name":"Millennium Falcon"},{"name":"X-wing"}]},'
+            '{"name":"Smugglers","ships":[{"name":"Millennium Falcon"}]}],'
+            '"hero":{"friends":[{"name":"Luke Skywalker"},'
+            '{"name":"Han Solo"},{"name":"Leia Organa"}]}}}',
+            json_str)
+
+    def test_compact_results(self):
+        """Test GraphQlContext.compact_results."""
+        class CompactContext(SilentGraphQlContext):
+            def compact_results(self):
+                return True
+
+        SwShip.reset()
+        context = SilentGraphQlContext(self._extra_schema())
+        compact_context = CompactContext(self._extra_schema())
+        for cur_context in (context, compact_context):
+            cur_context.loaders.register(
+                'ships',
+                GraphQlLoader(
+                    lambda ship_ids: [
+                        get_sw_ship(ship_id) for ship_id in ship_ids]))
+        document_strs = [
+            '{hero{name, friends{name, friends{id}}}}',
+            '{fleets{name, ships{name, nameLength, brokenNameLength}}}',
+            '{fleets{flagship{name}, loadedShips{id, escorts(count: 1){id}}}}',
+            '{fleets{name, ships{name, escorts(count: -1){id}}}}',
+            '{__schema{queryType{name}}, __typename}',
+        ]
+        for document_str in document_strs:
+            expected_result = GraphQlExecutor.execute(document_str, context)
+            result = GraphQlExecutor.execute(document_str, compact_context)
+            self.assertEqual(
+                expected_result, GraphQlResultObject.to_json_value(result))
+            self.assertEqual(
+                expected_result,
+                json.loads(GraphQlExecutor.encode_json(result)))
+            self.assertEqual(
+                expected_result,
+                json.loads(
+                    ''.join(
+                        GraphQlExecutor.execute_chunks(
+                            document_str, compact_context))))
+
+        result = GraphQlExecutor.execute(
+            '{fleets{name, ships{name, nameLength}}}', compact_context)
+        self.assertEqual(['fleets'], list(result['data'].iterkeys()))
+        fleets = result['data']['fleets']
+        self.assertIsInstance(fleets[0], GraphQlResultObject)
+        self.assertEqual(['name', 'ships'], fleets[0].keys())
+        self.assertEqual('Rebel Alliance', fleets[0]['name'])
+        self.assertIs(fleets[0]._keys, fleets[1]._keys)
+        self.assertIs(fleets[0]._indices, fleets[1]._indices)
+        self.assertIs(
+            fleets[0]['ships'][0]._keys, fleets[1]['ships'][0]._keys)
+        self.assertEqual(
+            [('name', 'X-wing'), ('nameLength', 6)],
+            list(fleets[0]['ships'][1].iteritems()))
+        self.assertEqual(
+            [('name', 'X-wing'), ('nameLength', 6)],
+            fleets[0]['ships'][1].items())
+        self.assertEqual(['X-wing', 6], fleets[0]['ships'][1].values())
+        self.assertEqual(
+            {'name': 'X-wing', 'nameLength': 6}, dict(fleets[0]['ships'][1]))
+        self.assertEqual(6, fleets[0]['ships'][1].get('nameLength'))
+        self.assertIsNone(fleets[0]['ships'][1].get('id'))
+        self.assertNotIn('id', fleets[0])
+        self.assertRaises(KeyError, lambda: fleets[0]['id'])
+
+        # GraphQlResultObjects should compare equal by their entries
+        self.assertEqual(result, copy.deepcopy(result))
+        self.assertEqual(
+            GraphQlResultObject.to_json_value(result['data']),
+            result['data'])
+        self.assertEqual(
+            {'nameLength': 6, 'name': 'X-wing'}, fleets[0]['ships'][1])
+        self.assertEqual(
+            fleets[0]['ships'][1], {'name': 'X-wing', 'nameLength': 6})
+        self.assertNotEqual({'name': 'X-wing'}, fleets[0]['ships'][1])
+        self.assertNotEqual(
+            {'name': 'X-wing', 'nameLength': 7}, fleets[0]['ships'][1])
+        self.assertNotEqual(fleets[0], fleets[1])
+        self.assertNotEqual(fleets[0], ['name', 'ships'])
+        self.assertRaises(TypeError, lambda: hash(fleets[0]))
+
+    def test_tracing(self):
+        """Test GraphQlTracer and GraphQlApolloTracer."""
+        class RecordingTracer(GraphQlTracer):
+            def __init__(self, sample_rate=1):
+                super(RecordingTracer, self).__init__(sample_rate)
+                self.events = []
+
+            def execute_start(self, operation_name):
+                self.events.append('start')
+
+            def execute_end(self, errors):
+                self.events.append('end')
+
+            def field_start(self, path, parent_type, field, arguments):
+                self.events.append(('fieldStart', path))
+
+            def field_end(
+                    self, path, parent_type, field, arguments, start_time,
+                    duration, exception):
+                self.events.append((
+                    'fieldEnd', path, parent_type.name, field.descriptor.name,
+                    arguments, exception is not None))
+
+        class TracingContext(SilentGraphQlContext):
+            def __init__(self, schema, tracer, is_compact):
+                super(TracingContext, self).__init__(schema)
+                self._tracer = tracer
+                self._is_compact = is_compact
+
+            def tracer(self):
+                return self._tracer
+
+            def compact_results(self):
+                return self._is_compact
+
+        SwShip.reset()
+        document_str = (
+            '{fleets{n: name, ships{nameLength, escorts(count: 1){id}}}}')
+        for is_compact in (False, True):
+            tracer = RecordingTracer()
+            context = TracingContext(self._extra_schema(), tracer, is_compact)
+            result = GraphQlExecutor.execute(document_str, context)
+            self.assertNotIn('errors', result)
+            self.assertEqual('start', tracer.events[0])
+            self.assertEqual('end', tracer.events[-1])
+            field_ends = [
+                event[1:] for event in tracer.events
+                if event[0] == 'fieldEnd']
+            self.assertEqual(
+                [
+                    (('fleets',), 'Query', 'fleets', {}, False),
+                    (('fleets', 0, 'n'), 'Fleet', 'name', {}, False),
+                    (('fleets', 0, 'ships'), 'Fleet', 'ships', {}, False),
+                    (('fleets', 1, 'n'), 'Fleet', 'name', {}, False),
+                    (('fleets', 1, 'ships'), 'Fleet', 'ships', {}, False),
+                    (
+                        ('fleets', 0, 'ships', 0, 'nameLength'), 'Ship',
+                        'nameLength', {}, False),
+                    (
+                        ('fleets', 0, 'ships', 1, 'nameLength'), 'Ship',
+                        'nameLength', {}, False),
+                    (
+                        ('fleets', 1, 'ships', 0, 'nameLength'), 'Ship',
+                        'nameLength', {}, False),
+                    (
+                        ('fleets', 0, 'ships', 0, 'escorts'), 'Ship',
+                        'escorts', {'count': 1}, False),
+                    (
+                        ('fleets', 0, 'ships', 1, 'escorts'), 'Ship',
+                        'escorts', {'count': 1}, False),
+                    (
+                        ('fleets', 1, 'ships', 0, 'escorts'), 'Ship',
+                        'escorts', {'count': 1}, False),
+                    (
+                        ('fleets', 0, 'ships', 0, 'escorts', 0, 'id'),
+                        'Ship', 'id', {}, False),
+                    (
+                        ('fleets', 0, 'ships', 1, 'escorts', 0, 'id'),
+                        'Ship', 'id', {}, False),
+                    (
+                        ('fleets', 1, 'ships', 0, 'escorts', 0, 'id'),
+                        'Ship', 'id', {}, False),
+                ], field_ends)
+            self.assertEqual(
+                [('fieldStart', event[0]) for event in field_ends],
+                [
+                    event for event in tracer.events
+                    if event[0] == 'fieldStart'])
+
+        tracer = RecordingTracer()
+        context = TracingContext(self._extra_schema(), tracer, False)
+        result = GraphQlExecutor.execute(
+            '{hero{name, friends{id}}, human(id: "9999"){name}, '
+            'fleets{shipsBroken: ships{escorts(count: -1){id}}}}',
+            context)
+        self.assertIn(
+            (
+                'fieldEnd', ('fleets', 0, 'shipsBroken', 1, 'escorts'), 'Ship',
+                'escorts', {'count': -1}, True),
+            tracer.events)
+        self.assertIn(
+            ('fieldEnd', ('hero', 'friends', 2, 'id'), 'Human', 'id', {},
+             False),
+            tracer.events)
+
+        # Forked executors should trace the fields they execute
+        tracer = RecordingTracer()
+        context = TracingContext(self._extra_schema(), tracer, False)
+        context.root_field_thread_pool = lambda: SimpleThreadPool()
+        result = GraphQlExecutor.execute(
+            '{hero{name}, fleets{n: name}}', context)
+        self.assertNotIn('errors', result)
+        self.assertEqual(
+            sorted([
+                ('fieldEnd', ('fleets',), 'Query', 'fleets', {}, False),
+                ('fieldEnd', ('fleets', 0, 'n'), 'Fleet', 'name', {}, False),
+                ('fieldEnd', ('fleets', 1, 'n'), 'Fleet', 'name', {}, False),
+                ('fieldEnd', ('hero',), 'Query', 'hero', {}, False),
+                ('fieldEnd', ('hero', 'name'), 'Droid', 'name', {}, False),
+            ]),
+            sorted([
+                event for event in tracer.events
+                if event[0] == 'fieldEnd']))
+
+        # If a root field raises an exception, we should wait for the other
+        # root fields to finish before ending the execution
+        class SlowHeroTracer(RecordingTracer):
+            def field_end(
+                    self, path, parent_type, field, arguments, start_time,
+                    duration, exception):
+                if path[0] == 'hero':
+                    time.sleep(0.001)
+                super(SlowHeroTracer, self).field_end(
+                    path, parent_type, field, arguments, start_time,
+                    duration, exception)
+
+        tracer = SlowHeroTracer()
+        context = TracingContext(self._extra_schema(), tracer, False)
+        context.root_field_thread_pool = lambda: SimpleThreadPool()
+        result = GraphQlExecutor.execute(
+            '{fastestShip{id}, hero{friends{friends{friends{name}}}}}',
+            context)
+        self.assertIsNone(result['data'])
+        self.assertIn(
+            ('fieldEnd', ('hero',), 'Query', 'hero', {}, False),
+            tracer.events)
+        self.assertEqual('end', tracer.events[-1])
+
+        tracer = RecordingTracer(0)
+        context = TracingContext(self._extra_schema(), tracer, False)
+        GraphQlExecutor.execute(document_str, context)
+        self.assertEqual([], tracer.events)
+
+        tracer = GraphQlApolloTracer()
+        context = TracingContext(self._extra_schema(), tracer, False)
+        result = GraphQlExecutor.execute(
+            '{fleets{name}, hero{name}}', context)
+        self.assertEqual(
+            set(['data', 'extensions']), set(result.iterkeys()))
+        tracing = result['extensions']['tracing']
+        self.assertEqual(1, tracing['version'])
+        self.assertRegexpMatches(
+            tracing['startTime'],
+            r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z$')
+        self.assertGreaterEqual(tracing['duration'], 0)
+        resolvers = tracing['execution']['resolvers']
+        self.assertEqual(
+            [
+                (['fleets'], 'Query', 'fleets', '[Fleet!]!'),
+                (['fleets', 0, 'name'], 'Fleet', 'name', 'String!'),
+                (['fleets', 1, 'name'], 'Fleet', 'name', 'String!'),
+                (['hero'], 'Query', 'hero', 'Character'),
+                (['hero', 'name'], 'Droid', 'name', 'String'),
+            ],
+            [
+                (
+                    resolver['path'], resolver['parentType'],
+                    resolver['fieldName'], resolver['returnType'])
+                for resolver in resolvers])
+        for resolver in resolvers:
+            self.assertGreaterEqual(resolver['startOffset'], 0)
+            self.assertGreaterEqual(resolver['duration'], 0)
+        json.dumps(result)
+
+    def test_stats(self):
+        """Test GraphQlStats and GraphQlStatsTracer."""
+        class StatsContext(SilentGraphQlContext):
+            def __init__(self, schema, stats):
+                super(StatsContext, self).__init__(schema)
+                self._stats = stats
+
+            def tracer(self):
+                return GraphQlStatsTracer(self._stats)
+
+        latency_stats = GraphQlLatencyStats((0.1, 1))
+        for duration in (0.05, 0.1, 0.5, 2, 3):
+            latency_stats.record(duration, duration > 1)
+        self.assertEqual([2, 1, 2], latency_stats.bucket_counts)
+        self.assertEqual(5, latency_stats.count)
+        self.assertEqual(2, latency_stats.error_count)
+        self.assertEqual(3, latency_stats.max_time)
+        self.assertAlmostEqual(5.65, latency_stats.total_time)
+
+        SwShip.reset()
+        stats = GraphQlStats((0.5, 1))
+        context = StatsContext(self._extra_schema(), stats)
+        GraphQlExecutor.execute(
+            'query Fleets {fleets{name, ships{name}}}', context)
+        GraphQlExecutor.execute(
+            '{fleets{ships{escorts(count: -1){id}}}}', context)
+        snapshot = stats.snapshot()
+        self.assertEqual(
+            set([
+                ('Query', 'fleets'), ('Fleet', 'name'), ('Fleet', 'ships'),
+                ('Ship', 'name'), ('Ship', 'escorts')]),
+            set(snapshot['fields'].iterkeys()))
+        self.assertEqual(2, snapshot['fields'][('Query', 'fleets')].count)
+        self.assertEqual(3, snapshot['fields'][('Ship', 'name')].count)
+        self.assertEqual(
+            0, snapshot['fields'][('Ship', 'name')].error_count)
+        self.assertEqual(
+            [3, 0, 0], snapshot['fields'][('Ship', 'name')].bucket_counts)
+        self.assertEqual(3, snapshot['fields'][('Ship', 'escorts')].count)
+        self.assertEqual(
+            3, snapshot['fields'][('Ship', 'escorts')].error_count)
+        self.assertEqual(
+            set(['Fleets', None]), set(snapshot['operations'].iterkeys()))
+        self.assertEqual(1, snapshot['operations']['Fleets'].count)
+        self.assertEqual(0, snapshot['operations']['Fleets'].error_count)
+        self.assertEqual(1, snapshot['operations'][None].error_count)
+
+        text = stats.text()
+        self.assertIn(
+            u'graphql_field_duration_seconds_bucket{type="Ship",'
+            u'field="name",le="0.5"} 3\n',
+            text)
+        self.assertIn(
+            u'graphql_field_duration_seconds_bucket{type="Ship",'
+            u'field="name",le="+Inf"} 3\n',
+            text)
+        self.assertIn(
+            u'graphql_field_errors_total{type="Ship",field="escorts"} 3\n',
+            text)
+        self.assertIn(
+            u'graphql_operation_duration_seconds_count{operation="Fleets"} '
+            u'1\n',
+            text)
+        self.assertIn(
+            u'graphql_operation_errors_total{operation=""} 1\n', text)
+        self.assertEqual(
+            1, text.count(u'# TYPE graphql_field_errors_total counter'))
+
+        snapshot = stats.snapshot(True)
+        self.assertEqual(1, snapshot['operations']['Fleets'].count)
+        self.assertEqual(
+            {'fields': {}, 'operations': {}}, stats.snapshot())
+        GraphQlExecutor.execute('query Fleets {fleets{name}}', context)
+        self.assertEqual(1, stats.snapshot()['operations']['Fleets'].count)
+        stats.reset()
+        self.assertEqual(
+            {'fields': {}, 'operations': {}}, stats.snapshot())
+        self.assertIs(GraphQlStats.instance(), GraphQlStats.instance())
+        self.assertIs(GraphQlStats.instance(), GraphQlStatsTracer().stats)
+
+        # GraphQlCompositeTracer should record the statistics of the
+        # executions that the GraphQlApolloTracer does not sample
+        class CompositeContext(SilentGraphQlContext):
+            def __init__(self, schema, stats, apollo_sample_rate):
+                super(CompositeContext, self).__init__(schema)
+                self._stats = stats
+                self._apollo_sample_rate = apollo_sample_rate
+
+            def tracer(self):
+                return GraphQlCompositeTracer([
+                    GraphQlStatsTracer(self._stats),
+                    GraphQlApolloTracer(self._apollo_sample_rate)])
+
+        stats = GraphQlStats()
+        context = CompositeContext(self._extra_schema(), stats, 0)
+        result = GraphQlExecutor.execute(
+            'query Fleets {fleets{name}}', context)
+        self.assertNotIn('extensions', result)
+        self.assertEqual(1, stats.snapshot()['operations']['Fleets'].count)
+
+        context = CompositeContext(self._extra_schema(), stats, 1)
+        result = GraphQlExecutor.execute(
+            'query Fleets {fleets{name}}', context)
+        self.assertEqual(
+            3, len(result['extensions']['tracing']['execution']['resolvers']))
+        self.assertEqual(2, stats.snapshot()['operations']['Fleets'].count)
+        self.assertEqual(
+            4, stats.snapshot()['fields'][('Fleet', 'name')].count)
+
+    def test_query_cost(self):
+        """Test GraphQlCostAnalyzer and GraphQlContext.cost_analyzer."""
+        class CostContext(SilentGraphQlContext):
+            def __init__(self, schema, max_cost):
+                super(CostContext, self).__init__(schema)
+                self._max_cost = max_cost
+                self.costs = []
+
+            def cost_analyzer(self):
+                return GraphQlCostAnalyzer(self._max_cost)
+
+            def query_cost(self, operation_name, cost):
+                self.costs.append((operation_name, cost))
+
+        schema = self._extra_schema()
+        analyzer = GraphQlCostAnalyzer()
+        document = GraphQlParser(
+            '{fleets{name, ships{name, escorts(count: 3){id}}}}',
+            schema).parse()
+        self.assertEqual(104, analyzer.document_cost(document))
+        document = GraphQlParser(
+            'query Escorts($count: Int) {\n'
+            '    fleets {ships {escorts(count: $count) {id}}}\n'
+            '}\n'
+            'query Fleets {fleets {... on Fleet {name}, __typename}}\n',
+            schema).parse()
+        self.assertEqual(
+            124, analyzer.document_cost(document, 'Escorts', {'count': 5}))
+        self.assertEqual(224, analyzer.document_cost(document, 'Escorts'))
+        self.assertEqual(2, analyzer.document_cost(document, 'Fleets'))
+        self.assertEqual(
+            44,
+            GraphQlCostAnalyzer(None, 1, 4).document_cost(
+                document, 'Escorts'))
+
+        SwShip.reset()
+        SwShip.batch_call_count = 0
+        context = CostContext(schema, 110)
+        result = GraphQlExecutor.execute(
+            'query Fleets {fleets{name, ships{name, escorts(count: 3){id}}}}',
+            context)
+        self.assertNotIn('errors', result)
+        self.assertEqual([('Fleets', 104)], context.costs)
+        self.assertEqual(1, SwShip.batch_call_count)
+
+        result = GraphQlExecutor.execute(
+            '{fleets{name, ships{name, escorts(count: 5){id}}}}', context)
+        self.assertEqual(['errors'], result.keys())
+        self.assertEqual(
+            'GraphQlQueryCostError', result['errors'][0]['type'])
+        self.assertEqual([('Fleets', 104), (None, 144)], context.costs)
+        self.assertEqual(1, SwShip.batch_call_count)
+
+        result = GraphQlExecutor.execute(
+            'query ($count: Int) {\n'
+            '    fleets {ships {escorts(count: $count) {id}}}\n'
+            '}',
+            context, {'count': 2})
+        self.assertNotIn('errors', result)
+        self.assertEqual((None, 64), context.costs[-1])
+        result = GraphQlExecutor.execute_document(
+            GraphQlParser(
+                '{fleets{ships{escorts{id}}}}', context.schema).parse(),
+            context)
+        self.assertEqual(
+            'GraphQlQueryCostError', result['errors'][0]['type'])
+
+    def test_deadline(self):
+        """Test GraphQlContext.deadline and the "timeout" argument."""
+        class DeadlineContext(TrackingGraphQlContext):
+            def __init__(self, schema, deadline):
+                super(DeadlineContext, self).__init__(schema)
+                self._deadline = deadline
+
+            def deadline(self):
+                return self._deadline
+
+        schema = self._context().schema
+        document_str = '{hero {name}, human(id: "1000") {name}}'
+        context = DeadlineContext(schema, time.time() - 1)
+        result = GraphQlExecutor.execute(document_str, context)
+        self.assertEqual({'hero': None, 'human': None}, result['data'])
+        self.assertEqual(
+            [{
+                'message':
+                    'The deadline for executing the document has passed',
+            }],
+            result['errors'])
+        self.assertEqual({'mutationCount': 0}, result['extensions'])
+        self.assertEqual('execute_document_str_end', context.calls[-2])
+
+        context = DeadlineContext(schema, None)
+        result = GraphQlExecutor.execute_document(
+            GraphQlParser(document_str, schema).parse(), context, timeout=0)
+        self.assertEqual({'hero': None, 'human': None}, result['data'])
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual('execute_document_end', context.calls[-2])
+
+        context = DeadlineContext(schema, time.time() + 1000)
+        result = GraphQlExecutor.execute(document_str, context, timeout=1000)
+        self.assertNotIn('errors', result)
+        self.assertEqual(
+            'Luke Skywalker', result['data']['human']['name'])
+        result = GraphQlExecutor.execute(document_str, context, timeout=0)
+        self.assertEqual({'hero': None, 'human': None}, result['data'])
+
+        # Root fields executed in parallel should report the timeout once
+        context = DeadlineContext(schema, time.time() - 1)
+        context.root_field_thread_pool = lambda: SimpleThreadPool()
+        result = GraphQlExecutor.execute(document_str, context)
+        self.assertEqual({'hero': None, 'human': None}, result['data'])
+        self.assertEqual(
+            [{
+                'message':
+                    'The deadline for executing the document has passed',
+            }],
+            result['errors'])
+
+    def test_response_size_limits(self):
+        """Test GraphQlContext.response_size_limits."""
+        class SizeContext(SilentGraphQlContext):
+            def __init__(self, schema, limits):
+                super(SizeContext, self).__init__(schema)
+                self._limits = limits
+                self.size = None
+
+            def response_size_limits(self):
+                return self._limits
+
+            def response_size(self, num_objects, num_bytes):
+                self.size = (num_objects, num_bytes)
+
+            def extensions(self, result, exception, exception_info):
+                return {'limits': self._limits, 'size': self.size}
+
+        schema = self._context().schema
+        document_str = '{hero {name, friends {name, friends {name}}}}'
+        result = GraphQlExecutor.execute(
+            document_str, SizeContext(schema, {'max_objects': 16}))
+        self.assertNotIn('errors', result)
+        self.assertEqual(
+            {'max_objects': 16}, result['extensions']['limits'])
+        num_objects, num_bytes = result['extensions']['size']
+        self.assertEqual(16, num_objects)
+        data = GraphQlExecutor.encode_json(result['data'])
+        encoded_size = len(data)
+        self.assertTrue(encoded_size <= num_bytes <= 2 * encoded_size)
+
+        result = GraphQlExecutor.execute(
+            document_str, SizeContext(schema, {'max_objects': 15}))
+        self.assertEqual(['errors', 'extensions'], sorted(result.keys()))
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual(
+            'GraphQlResponseSizeError', result['errors'][0]['type'])
+        self.assertEqual(16, result['extensions']['size'][0])
+
+        context = SizeContext(schema, {'max_bytes': 100})
+        result = GraphQlExecutor.execute_document(
+            GraphQlParser(document_str, schema).parse(), context)
+        self.assertEqual(
+            'GraphQlResponseSizeError', result['errors'][0]['type'])
+        self.assertNotIn('data', result)
+        self.assertTrue(100 < context.size[1] < num_bytes)
+
+        result = json.loads(
+            ''.join(
+                GraphQlExecutor.execute_chunks(
+                    document_str, SizeContext(schema, {'max_bytes': 10000}))))
+        self.assertEqual(json.loads(data), result['data'])
+        self.assertEqual(16, result['extensions']['size'][0])
+
+        # Root fields executed in parallel should add to the same size
+        document_str = (
+            '{hero {name, friends {name}}, '
+            'human(id: "1000") {name, friends {name}}}')
+        context = SizeContext(schema, {'max_objects': 100})
+        GraphQlExecutor.execute(document_str, context)
+        serial_size = context.size
+        context = SizeContext(schema, {'max_objects': 100})
+        context.root_field_thread_pool = lambda: SimpleThreadPool()
+        GraphQlExecutor.execute(document_str, context)
+        self.assertEqual(serial_size, context.size)
+
+    def test_prefetch_modules(self):
+        """Test GraphQlContext.prefetch_modules."""
+        class PrefetchContext(GraphQlContext):
+            def prefetch_modules(self):
+                return True
+
+        schema = self._extra_schema()
+        document = GraphQlParser(
+            '{hero(episode: EMPIRE) {name}, fleets {ships {name}}}',
+            schema).parse()
+        result = GraphQlExecutor.execute_document(
+            document, PrefetchContext(schema))
+        self.assertNotIn('errors', result)
+        self.assertEqual('Luke Skywalker', result['data']['hero']['name'])
+        self.assertEqual(
+            set([
+                'graphql.executor.root_query_object',
+                'graphql.executor.test.star_wars.droid',
+                'graphql.executor.test.star_wars.episode',
+                'graphql.executor.test.star_wars.heroes',
+                'graphql.executor.test.star_wars.human',
+                'graphql.executor.test.star_wars_extra.fleet',
+                'graphql.executor.test.star_wars_extra.ship',
+                'graphql.scalar_descriptors.strict.string']),
+            set(
+                GraphQlExecutor._operation_module_names[
+                    document.operations[0]]))
+
+        # The prefetched modules should be recorded as background imports
+        module_name = 'graphql.executor.test.star_wars.episode'
+        package = sys.modules['graphql.executor.test.star_wars']
+        module = sys.modules.pop(module_name)
+        tracker = GraphQlImportTracker.instance()
+        try:
+            result = GraphQlExecutor.execute_document(
+                document, PrefetchContext(schema))
+            self.assertNotIn('errors', result)
+            deadline = time.time() + 10
+            while (module_name not in
+                    [import_[0] for import_ in tracker.imports()] and
+                    time.time() < deadline):
+                time.sleep(0.01)
+            self.assertIn(
+                (module_name, True),
+                [
+                    (imported_module_name, is_background)
+                    for imported_module_name, duration, is_background
+                    in tracker.imports()])
+        finally:
+            sys.modules[module_name] = module
+            package.episode = module
+
+    def test_result_access(self):
+        """Test GraphQlContext.result_access."""
+        class ResultContext(GraphQlContext):
+            def __init__(self, schema, access):
+                super(ResultContext, self).__init__(schema)
+                self.access = access
+                self.results = []
+
+            def result_access(self, method_name):
+                if method_name == 'extensions':
+                    return self.access
+                else:
+                    return GraphQlResultAccess.none
+
+            def extensions(self, result, exception, exception_info):
+                self.results.append(result)
+                return None
+
+        schema = self._extra_schema()
+        context = GraphQlContext(schema)
+        self.assertEqual(
+            GraphQlResultAccess.none, context.result_access('extensions'))
+        self.assertEqual(
+            GraphQlResultAccess.copy,
+            TrackingGraphQlContext(schema).result_access('extensions'))
+
+        context = ResultContext(schema, GraphQlResultAccess.none)
+        result = GraphQlExecutor.execute('{hero{name}}', context)
+        self.assertEqual({'data': {'hero': {'name': 'R2-D2'}}}, result)
+        self.assertEqual([None], context.results)
+
+        context = ResultContext(schema, GraphQlResultAccess.shared)
+        result = GraphQlExecutor.execute('{hero{name}}', context)
+        self.assertEqual({'data': {'hero': {'name': 'R2-D2'}}}, result)
+        self.assertIs(result, context.results[0])
+
+        context = ResultContext(schema, GraphQlResultAccess.copy)
+        document = GraphQlParser('{hero{name}}', schema).parse()
+        result = GraphQlExecutor.execute_document(document, context)
+        self.assertEqual({'data': {'hero': {'name': 'R2-D2'}}}, result)
+        self.assertEqual(result, context.results[0])
+        self.assertIsNot(result, context.results[0])
+        self.assertIsNot(result['data'], context.results[0]['data'])
+
     def test_context_calls(self):
         """Test that GraphQlExecutor makes the proper calls to GraphQlContext.
         """
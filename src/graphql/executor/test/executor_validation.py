@@ -5,6 +5,7 @@ from graphql.executor import GraphQlExecutor
 from graphql.schema import GraphQlSchemaFactory
 from graphql.executor.test.star_wars_extra import SwUsers
 from silent_context import SilentGraphQlContext
+from thread_pool import SimpleThreadPool
 
 
 class GraphQlExecutorValidationTest(unittest.TestCase):
@@ -241,6 +242,61 @@ class GraphQlExecutorValidationTest(unittest.TestCase):
         self.assertEqual('GraphQlFieldTypeError', result['errors'][0]['type'])
         self.assertIsNone(result['data'])
 
+    def test_single_pass_broken_fields(self):
+        """Test single-pass serialization on fields with the wrong type.
+
+        Test that GraphQlExecutor produces the same results for fields
+        that return the wrong type of object whether or not
+        GraphQlContext.single_pass_serialization() returns True.
+        """
+        context = self._extra_context()
+        single_pass_context = self._extra_context()
+        single_pass_context.single_pass_serialization = lambda: True
+        for document_str in [
+                '{fastestShip{name}}',
+                '{slowestShip{name}, ship(id: "3000"){name}}',
+                '{allShips{name}}',
+                '{largestShip{name}, ship(id: "3000"){name}}',
+                '{ship(id: "3000"){brokenId, name}}',
+                '{hero{name, friends{name, appearsIn}}}',
+                '{__schema{types{name, kind}}}']:
+            self.assertEqual(
+                GraphQlExecutor.execute(document_str, context),
+                GraphQlExecutor.execute(document_str, single_pass_context))
+
+    def test_root_field_thread_pool(self):
+        """Test GraphQlContext.root_field_thread_pool.
+
+        Test that GraphQlExecutor produces the same results, including
+        the same errors in the same order, whether or not it executes
+        the root fields in parallel.
+        """
+        context = self._extra_context()
+        parallel_context = self._extra_context()
+        pool = SimpleThreadPool()
+        parallel_context.root_field_thread_pool = lambda: pool
+        for document_str in [
+                '{hero{name}, human(id: "1000"){name, friends{name}}, '
+                'droid(id: "2001"){name}}',
+                '{hero{name}, largestShip{name}, ship(id: "3000"){name}, '
+                'search(name: "Luke Skywalker"){__typename}, '
+                'ship2: largestShip{id}}',
+                '{hero{name}, largestShip{name}, slowestShip{name}, '
+                'fastestShip{name}}',
+                '{fleets{name, ships{nameLength, brokenNameLength}}, '
+                'ship(id: "3000"){escorts(count: -1){name}}, hero{name}}',
+                '{__typename, hero{name}, __schema{queryType{name}}}']:
+            self.assertEqual(
+                GraphQlExecutor.execute(document_str, context),
+                GraphQlExecutor.execute(document_str, parallel_context))
+        self.assertGreater(len(pool.thread_names), 1)
+
+        result = GraphQlExecutor.execute(
+            'mutation {setFavoriteShip(id: "3000"){name}}', parallel_context)
+        self.assertEqual(
+            {'data': {'setFavoriteShip': {'name': 'Millennium Falcon'}}},
+            result)
+
     def test_schema_mismatch(self):
         """Test the case where GraphQlDocument.schema != GraphQlContext.schema.
         """
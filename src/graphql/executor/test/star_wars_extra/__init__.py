@@ -6,6 +6,7 @@ additions.
 """
 
 from faction import SwFaction
+from fleet import SwFleet
 from introduce_ship_mutation import SwIntroduceShipMutation
 from search import SwSearch
 from ship import get_sw_ship
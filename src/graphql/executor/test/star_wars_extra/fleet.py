@@ -0,0 +1,98 @@
+from graphql import graphql_attr_field
+from graphql import graphql_field
+from graphql import graphql_object
+from graphql import graphql_root_field
+from ship import get_sw_ship
+
+
+@graphql_object('Fleet', 'A group of space ships')
+@graphql_attr_field(
+    'name', 'name', 'String!', 'The name of the fleet', cost=0)
+class SwFleet(object):
+    """A group of space ships.
+
+    Public attributes:
+
+    basestring name - The name of the fleet.
+    """
+
+    # Private attributes:
+    # list<basestring> _ship_ids - The IDs of the ships in the fleet.
+
+    def __init__(self, name, ship_ids):
+        self.name = name
+        self._ship_ids = ship_ids
+
+    @graphql_field('ships', '[Ship!]!', {}, [], 'The ships in the fleet')
+    def ships(self):
+        """Return the SwShips in the fleet."""
+        return [get_sw_ship(ship_id) for ship_id in self._ship_ids]
+
+    @graphql_field(
+        'flagship', 'Ship!', {}, ['loaders'],
+        'The most important ship in the fleet')
+    def flagship(self, loaders):
+        """Return the SwShip that is the fleet's flagship.
+
+        This obtains the ship using the "ships" GraphQlLoader.
+        """
+        return loaders.load('ships', self._ship_ids[0])
+
+    @graphql_field(
+        'flagshipName', 'String!', {}, ['loaders'],
+        "The name of the fleet's flagship")
+    def flagship_name(self, loaders):
+        """Return the name of the fleet's flagship.
+
+        This obtains the ship using the "ships" GraphQlLoader.
+        """
+        return loaders.load('ships', self._ship_ids[0]).then(
+            lambda ship: ship.name)
+
+    @graphql_field(
+        'loadedShips', '[Ship!]!', {}, ['loaders'],
+        'The ships in the fleet')
+    def loaded_ships(self, loaders):
+        """Return the SwShips in the fleet.
+
+        This obtains the ships using the "ships" GraphQlLoader.
+        """
+        return loaders.load_many('ships', self._ship_ids)
+
+    @graphql_field(
+        'shipsAsync', '[Ship!]!', {'broken': 'Boolean'}, ['thread_pool'],
+        'The ships in the fleet')
+    def ships_async(self, thread_pool, broken=False):
+        """Return a future for the SwShips in the fleet.
+
+        This obtains the ships by submitting a task to the "thread_pool"
+        context argument, which behaves like a
+        concurrent.futures.ThreadPoolExecutor.  If "broken" is True, the
+        task raises a RuntimeError.
+        """
+        def ships():
+            if broken:
+                raise RuntimeError('The ship database is down')
+            return [get_sw_ship(ship_id) for ship_id in self._ship_ids]
+        return thread_pool.submit(ships)
+
+    @staticmethod
+    @graphql_root_field(
+        'loadedShip', 'Ship', {'id': 'ID!'}, ['loaders'],
+        'The ship with the specified ID')
+    def loaded_ship(id, loaders):
+        """Return the SwShip with the specified ID.
+
+        This obtains the ship using the "ships" GraphQlLoader.
+        """
+        return loaders.load('ships', id)
+
+    @staticmethod
+    @graphql_root_field(
+        'fleets', '[Fleet!]!', {}, [], 'All of the fleets', cost=2,
+        multiplier=2)
+    def fleets():
+        """Return all of the SwFleets."""
+        return [
+            SwFleet('Rebel Alliance', ['3000', '3001']),
+            SwFleet('Smugglers', ['3000'])]
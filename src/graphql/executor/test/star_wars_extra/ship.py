@@ -1,4 +1,5 @@
 from graphql import graphql_attr_field
+from graphql import graphql_batch_field
 from graphql import graphql_field
 from graphql import graphql_mutation
 from graphql import graphql_object
@@ -17,6 +18,10 @@ class SwShip(object):
     basestring ship_id - The ID of the ship.
     """
 
+    # The number of times we have called a method annotated with
+    # graphql_batch_field
+    batch_call_count = 0
+
     # The ID of the user's favorite ship
     _favorite_ship_id = '3001'
 
@@ -38,6 +43,46 @@ class SwShip(object):
         """Broken method that is supposed to return the ID of the ship."""
         return int(self.ship_id)
 
+    @staticmethod
+    @graphql_batch_field(
+        'nameLength', 'Int!', {}, [], "The length of the ship's name")
+    def name_lengths(ships):
+        """Return the lengths of the names of the specified SwShips."""
+        SwShip.batch_call_count += 1
+        return [len(ship.name) for ship in ships]
+
+    @staticmethod
+    @graphql_batch_field(
+        'brokenNameLength', 'Int', {}, [], "The length of the ship's name")
+    def broken_name_lengths(ships):
+        """Broken method supposed to return the lengths of the ships' names.
+        """
+        SwShip.batch_call_count += 1
+        return [len(ship.name) for ship in ships[1:]]
+
+    @classmethod
+    @graphql_batch_field(
+        'escorts', '[Ship!]!', {'count': 'Int'}, [],
+        'The ships that escort the ship', multiplier='count')
+    def escorts(cls, ships, count=1):
+        """Return lists of the SwShips that escort the specified SwShips.
+
+        Each ship is escorted by the "count" ships with the next highest
+        IDs, wrapping around to the lowest ID.
+        """
+        cls.batch_call_count += 1
+        if count < 0:
+            raise ValueError('The number of escorts may not be negative')
+        ship_ids = sorted(cls._ships.iterkeys())
+        escorts = []
+        for ship in ships:
+            index = ship_ids.index(ship.ship_id)
+            escorts.append([
+                cls(ship_id, cls._ships[ship_id])
+                for ship_id in (ship_ids[index + 1:] + ship_ids[:index])[
+                    :count]])
+        return escorts
+
     @staticmethod
     def introduce_ship(name):
         """Add a ship with the specified name to our records."""
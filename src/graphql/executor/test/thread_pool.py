@@ -0,0 +1,86 @@
+import sys
+import threading
+
+
+class SimpleFuture(object):
+    """The result of a task submitted to a SimpleThreadPool.
+
+    This behaves like a concurrent.futures.Future, as far as the result
+    method is concerned.
+    """
+
+    # Private attributes:
+    # threading.Event _done - The event that is set when the task finishes.
+    # list<basestring> _events - The SimpleThreadPool.events list to which we
+    #     append 'result' when "result" is called.
+    # tuple<type, mixed, traceback> _exception_info - Information about the
+    #     exception the task raised, if any, as returned by sys.exc_info().
+    # mixed _result - The task's return value.
+
+    def __init__(self, events):
+        self._events = events
+        self._done = threading.Event()
+        self._exception_info = None
+        self._result = None
+
+    def set_result(self, result):
+        """Finish the task with the specified return value."""
+        self._result = result
+        self._done.set()
+
+    def set_exception_info(self, exception_info):
+        """Finish the task with the specified exception information."""
+        self._exception_info = exception_info
+        self._done.set()
+
+    def result(self):
+        """Wait for the task to finish, and return its return value.
+
+        Raise the exception the task raised, if any.
+        """
+        self._events.append('result')
+        self._done.wait()
+        exception_info = self._exception_info
+        if exception_info is not None:
+            raise exception_info[0], exception_info[1], exception_info[2]
+        return self._result
+
+
+class SimpleThreadPool(object):
+    """Runs each submitted task on a new thread.
+
+    This behaves like a concurrent.futures.ThreadPoolExecutor, as far as
+    the submit method is concerned, so that the tests do not depend on
+    concurrent.futures.
+
+    Public attributes:
+
+    list<basestring> events - The events that have occurred, in order:
+        'submit' for each call to "submit" and 'result' for each call to
+        SimpleFuture.result.
+    set<basestring> thread_names - The names of the threads on which we
+        have run tasks.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.thread_names = set()
+
+    def submit(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on a new thread.
+
+        return SimpleFuture - The result of the task.
+        """
+        self.events.append('submit')
+        future = SimpleFuture(self.events)
+
+        def run():
+            self.thread_names.add(threading.current_thread().name)
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception:
+                future.set_exception_info(sys.exc_info())
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return future
@@ -0,0 +1,109 @@
+import random
+
+
+class GraphQlTracer(object):
+    """Receives events about the resolution of GraphQL fields.
+
+    A tracer is useful for finding out which fields' methods make the
+    execution of a document slow.  To trace an execution, we override
+    GraphQlContext.tracer to return a GraphQlTracer.  GraphQlExecutor
+    calls field_start immediately before it obtains the value of each
+    field, by calling the field's method or accessing its attribute, and
+    field_end immediately afterward.  For batched fields, as described
+    in the comments for graphql_batch_field, we call field_start and
+    field_end for each of the batch's fields, with the same timing.  If
+    a field's method returns a GraphQlDeferredValue or a future, the
+    duration does not include the time it takes to load the value.
+
+    The times are in seconds, as returned by timeit.default_timer().
+    The events may occur on multiple threads if
+    GraphQlContext.root_field_thread_pool() returns a thread pool.
+
+    When GraphQlContext.tracer() returns None, or when is_sampled()
+    returns False, GraphQlExecutor does not do any tracing work at all.
+    The base class does nothing with the events.
+
+    Public attributes:
+
+    float sample_rate - The fraction of the executions to trace, as in
+        is_sampled().
+    """
+
+    def __init__(self, sample_rate=1):
+        self.sample_rate = sample_rate
+
+    def is_sampled(self):
+        """Return whether to trace the current execution.
+
+        GraphQlExecutor calls this once per execution, before sending any
+        events to the tracer.  By default, this returns True with
+        probability sample_rate.
+
+        return bool - Whether to trace the execution.
+        """
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def execute_start(self, operation_name):
+        """Respond to starting to execute a document.
+
+        basestring operation_name - The name of the operation we are
+            executing, or None if it is anonymous.
+        """
+        pass
+
+    def execute_end(self, errors):
+        """Respond to finishing executing a document.
+
+        list<dict<basestring, object>> errors - The GraphQL errors we
+            encountered while executing the operation.  The tracer must
+            not modify them.
+        """
+        pass
+
+    def field_start(self, path, parent_type, field, arguments):
+        """Respond to starting to obtain the value of a field.
+
+        tuple path - The path of the field in the response, consisting
+            of response keys and list indices, e.g.
+            ('hero', 'friends', 0, 'name').
+        GraphQlObjectType parent_type - The type of the object whose
+            field we are obtaining.
+        GraphQlField field - The field.  field.descriptor.name is its
+            name.
+        dict<basestring, mixed> arguments - The keyword arguments to the
+            field's method, excluding context arguments.  The tracer must
+            not modify them.
+        """
+        pass
+
+    def field_end(
+            self, path, parent_type, field, arguments, start_time, duration,
+            exception):
+        """Respond to finishing obtaining the value of a field.
+
+        tuple path - The path of the field in the response, as in
+            field_start.
+        GraphQlObjectType parent_type - The type of the object whose
+            field we obtained.
+        GraphQlField field - The field.
+        dict<basestring, mixed> arguments - The keyword arguments to the
+            field's method, excluding context arguments.
+        float start_time - The time at which we started to obtain the
+            value.
+        float duration - The number of seconds it took to obtain the
+            value.
+        Exception exception - The exception that obtaining the value
+            raised, if any.
+        """
+        pass
+
+    def extensions(self):
+        """Return entries to add to the "extensions" entry of the response.
+
+        GraphQlExecutor adds the entries to those returned by
+        GraphQlContext.extensions after it finishes executing the
+        document.  The base class returns None.
+
+        return dict<basestring, object> - The entries, or None.
+        """
+        return None
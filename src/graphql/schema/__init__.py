@@ -14,6 +14,7 @@ from factory import GraphQlSchemaFactory
 from field import GraphQlField
 from field_descriptor import GraphQlFieldDescriptor
 from func_descriptor import GraphQlFuncDescriptor
+from import_tracker import GraphQlImportTracker
 from input_object_type import GraphQlInputObjectType
 from input_value import GraphQlInputValue
 from interface_type import GraphQlInterfaceType
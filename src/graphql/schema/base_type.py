@@ -1,3 +1,5 @@
+import threading
+
 from type import GraphQlType
 
 
@@ -25,11 +27,68 @@ class GraphQlBaseType(GraphQlType):
         parent.  It does not include this.
     """
 
+    # The lock for calling the functions passed to set_loader.  Loading is
+    # rare, so we share a single lock between all types.
+    _loader_lock = threading.RLock()
+
+    # Private attributes:
+    # function _loader - The function passed to set_loader, or None if we
+    #     have already called it or there is no such function.
+
     def __init__(self, name, description):
         self.name = name
         self.description = description
         self.parent_types = []
         self.child_types = []
+        self._loader = None
+
+    def set_loader(self, loader):
+        """Arrange to add this type's fields lazily.
+
+        We call loader() the first time we access this type's fields,
+        e.g. GraphQlObjectType.fields.  It should add the fields using
+        add_field or the like.  Loading the fields lazily saves time and
+        memory for rarely used types in large schemas.  See
+        GraphQlSchema.create_from_json.
+
+        function loader - The function.
+        """
+        self._loader = loader
+
+    def _load(self):
+        """Call the function passed to set_loader, if we have not already.
+        """
+        if self._loader is not None:
+            with GraphQlBaseType._loader_lock:
+                loader = self._loader
+                if loader is not None:
+                    try:
+                        loader()
+                    except:
+                        # Discard any fields the loader added, so that the
+                        # next access calls it again rather than reporting
+                        # duplicate fields
+                        self._clear_fields()
+                        raise
+                    self._loader = None
+
+    def _clear_fields(self):
+        """Remove the fields we have added so far, if this type has fields.
+
+        We call this if the function passed to set_loader fails.  The
+        default implementation does nothing.
+        """
+        pass
+
+    def warm_up(self):
+        """Import and load the Python code that this type refers to, if any.
+
+        Types load the classes and functions they refer to on demand,
+        the first time we use them.  Calling warm_up() does so ahead of
+        time.  See GraphQlSchema.warm_up.  The default implementation
+        does nothing.
+        """
+        pass
 
     def add_parent_type(self, parent_type):
         """Equivalent implementation is contractual."""
@@ -1,6 +1,7 @@
-import importlib
 import inspect
 
+from import_tracker import GraphQlImportTracker
+
 
 class GraphQlClassDescriptor(object):
     """Identifies a Python class.
@@ -33,7 +34,8 @@ class GraphQlClassDescriptor(object):
 
     def load_class(self):
         """Return the class that this identifies."""
-        module = importlib.import_module(self.module_name)
+        module = GraphQlImportTracker.instance().import_module(
+            self.module_name)
         return getattr(module, self.class_name)
 
     def __eq__(self, other):
@@ -70,13 +70,16 @@ class GraphQlEnumType(GraphQlBaseType):
         if self._python_to_graphql is None:
             graphql_to_python = self._graphql_to_python_map()
             self._python_to_graphql = {}
-            for graphql, python in graphql_to_python.iteritems():
-                self._python_to_graphql[python] = graphql
+            for graphql, python_value in graphql_to_python.iteritems():
+                self._python_to_graphql[python_value] = graphql
         if python not in self._python_to_graphql:
             raise ValueError(
                 'There is no GraphQL enum value for {:s}'.format(str(python)))
         return self._python_to_graphql[python]
 
+    def warm_up(self):
+        self._graphql_to_python_map()
+
     def field_descriptor(self, name):
         raise ValueError('Enum types do not have fields')
 
@@ -244,7 +244,8 @@ class GraphQlSchemaFactory(object):
     def _field(
             type_name, field_name, field_type_str, arguments, description,
             is_deprecated, deprecation_reason, method_name, partial_args,
-            partial_kwargs, context_args, attr, base_types):
+            partial_kwargs, context_args, attr, is_batch, cost, multiplier,
+            base_types):
         """Return a GraphQlField object for a field annotation.
 
         basestring type_name - The name of the type of object to which
@@ -278,6 +279,12 @@ class GraphQlSchemaFactory(object):
         basestring attr - The name of the attribute containing the
             field's value, as in getattr.  This is None if we obtain the
             field's value using a method.
+        bool is_batch - Whether method_name computes the field's values
+            for many objects at once, as in GraphQlField.is_batch.
+        number cost - The estimated cost of obtaining the field's value,
+            as in GraphQlField.cost.
+        int|basestring multiplier - The estimated number of objects in
+            the field's value, as in GraphQlField.multiplier.
         dict<basestring, GraphQlBaseType> base_types - A map from the
             name of each base type to the type.
         return GraphQlField - The field.
@@ -291,6 +298,9 @@ class GraphQlSchemaFactory(object):
                 'The GraphQL field {:s}{{{:s}}} may not be specified using an '
                 'attribute unless it has no method name or arguments'.format(
                     type_name, field_name))
+        GraphQlSchemaFactory._assert_valid_multiplier(
+            multiplier, arguments,
+            'the field {:s}{{{:s}}}'.format(type_name, field_name))
         arg_types = {}
         for arg_name, arg_type_str in arguments.iteritems():
             arg_types[arg_name] = GraphQlSchema.parse_type(
@@ -307,7 +317,24 @@ class GraphQlSchemaFactory(object):
             deprecation_reason)
         return GraphQlField(
             descriptor, method_name, partial_args, partial_kwargs,
-            context_args, attr)
+            context_args, attr, is_batch, cost, multiplier)
+
+    @staticmethod
+    def _assert_valid_multiplier(multiplier, arguments, source):
+        """Raise if the specified field multiplier is invalid.
+
+        int|basestring multiplier - The multiplier, as in
+            GraphQlField.multiplier.
+        dict<basestring, basestring> arguments - A map from the names of
+            the arguments to the field to their GraphQL types.
+        basestring source - A string identifying the field, for the
+            exception message.
+        """
+        if (isinstance(multiplier, basestring) and
+                multiplier not in arguments):
+            raise ValueError(
+                'The multiplier of {:s} refers to the argument {:s}, which '
+                'is not one of its arguments'.format(source, multiplier))
 
     @staticmethod
     def _assert_can_override(
@@ -397,6 +424,7 @@ class GraphQlSchemaFactory(object):
         classes = {}
         method_names = {}
         attrs = {}
+        is_batches = {}
         for parent_class in inspect.getmro(cls):
             class_fields = []
 
@@ -409,7 +437,9 @@ class GraphQlSchemaFactory(object):
                         attr_field['fieldType'], {}, attr_field['description'],
                         attr_field['isDeprecated'],
                         attr_field['deprecationReason'], None, None, None,
-                        None, attr_field['attr'], base_types))
+                        None, attr_field['attr'], False,
+                        attr_field['cost'], attr_field['multiplier'],
+                        base_types))
             class_custom_fields_funcs = getattr(
                 parent_class, '_graphql_custom_class_field_funcs', [])
             for func in class_custom_fields_funcs:
@@ -422,10 +452,13 @@ class GraphQlSchemaFactory(object):
                         field_info['deprecationReason'],
                         field_info['methodName'], field_info['partialArgs'],
                         field_info['partialKwargs'], field_info['contextArgs'],
-                        None, base_types))
+                        None, False, field_info.get('cost'),
+                        field_info.get('multiplier'), base_types))
 
             # Compute the fields from the class's method's decorators
             for key, value in parent_class.__dict__.iteritems():
+                if isinstance(value, (classmethod, staticmethod)):
+                    value = value.__func__
                 if callable(value) and hasattr(value, '_graphql_field_name'):
                     class_fields.append(
                         GraphQlSchemaFactory._field(
@@ -436,7 +469,9 @@ class GraphQlSchemaFactory(object):
                             value._graphql_field_is_deprecated,
                             value._graphql_field_deprecation_reason, key, (),
                             {}, value._graphql_field_context_args, None,
-                            base_types))
+                            getattr(value, '_graphql_field_is_batch', False),
+                            value._graphql_field_cost,
+                            value._graphql_field_multiplier, base_types))
 
             # Validate and add the fields
             for field in class_fields:
@@ -454,8 +489,10 @@ class GraphQlSchemaFactory(object):
                     classes[name] = parent_class
                     method_names[name] = field.method_name
                     attrs[name] = field.attr
+                    is_batches[name] = field.is_batch
                 elif (field.method_name != method_names[name] or
-                        field.attr != attrs[name]):
+                        field.attr != attrs[name] or
+                        field.is_batch != is_batches[name]):
                     raise ValueError(
                         'Duplicate field {:s}{{{:s}}}'.format(
                             type_name, field.descriptor.name))
@@ -489,6 +526,9 @@ class GraphQlSchemaFactory(object):
                 'the root field {:s}'.format(field_name))
             args = {}
             arg_type_strs = root_field_func._graphql_root_field_args
+            GraphQlSchemaFactory._assert_valid_multiplier(
+                root_field_func._graphql_root_field_multiplier,
+                arg_type_strs, 'the root field {:s}'.format(field_name))
             for arg_name, arg_type_str in arg_type_strs.iteritems():
                 args[arg_name] = GraphQlSchema.parse_type(
                     arg_type_str, base_types, True, False,
@@ -509,7 +549,9 @@ class GraphQlSchemaFactory(object):
                         func_descriptor.module_name,
                         func_descriptor.class_name,
                         func_descriptor.func_name),
-                    {}, root_field_func._graphql_root_field_context_args))
+                    {}, root_field_func._graphql_root_field_context_args,
+                    False, root_field_func._graphql_root_field_cost,
+                    root_field_func._graphql_root_field_multiplier))
         return root_fields
 
     @staticmethod
@@ -15,11 +15,24 @@ class GraphQlField(object):
         include in the keyword arguments to method_name.  This is None
         if we obtain the field's value using an attribute.  See
         GraphQlContext.context_arg.
+    number cost - The estimated cost of obtaining the field's value for
+        a single object, for GraphQlCostAnalyzer, or None to use
+        GraphQlCostAnalyzer.default_cost.
     GraphQlFieldDescriptor descriptor - A descriptor describing the
         field's "interface".
+    bool is_batch - Whether method_name computes the field's values for
+        many objects at once, as described in the comments for
+        graphql_batch_field.  If so, method_name is the name of a static
+        method or class method, and we pass it the list of objects as
+        its first argument, before partial_args.
     basestring method_name - The name of the method to call to determine
         the field's value.  This is None if we obtain the field's value
         using an attribute.
+    int|basestring multiplier - The estimated number of objects in the
+        field's value, by which GraphQlCostAnalyzer multiplies the cost
+        of the field's selection set, or None to use the default.  This
+        may also be the name of an argument to the field whose value is
+        the estimate, such as "first" or "count".
     tuple partial_args - The positional arguments to pass to
         method_name.  Each element must be a JSON value.  This is None
         if we obtain the field's value using an attribute.
@@ -32,7 +45,8 @@ class GraphQlField(object):
 
     def __init__(
             self, descriptor, method_name, partial_args, partial_kwargs,
-            context_args, attr):
+            context_args, attr, is_batch=False, cost=None,
+            multiplier=None):
         self.descriptor = descriptor
         self.method_name = method_name
         self.partial_args = partial_args
@@ -42,18 +56,23 @@ class GraphQlField(object):
         else:
             self.context_args = None
         self.attr = attr
+        self.is_batch = is_batch
+        self.cost = cost
+        self.multiplier = multiplier
 
     @staticmethod
     def create_from_method(
             descriptor, method_name, partial_args, partial_kwargs,
-            context_args):
+            context_args, is_batch=False, cost=None, multiplier=None):
         """Return a GraphQlField for a field we obtain using a method call."""
         return GraphQlField(
             descriptor, method_name, partial_args, partial_kwargs,
-            context_args, None)
+            context_args, None, is_batch, cost, multiplier)
 
     @staticmethod
-    def create_from_attr(descriptor, attr):
+    def create_from_attr(descriptor, attr, cost=None, multiplier=None):
         """Return a GraphQlField for a field we obtain by using an attribute.
         """
-        return GraphQlField(descriptor, None, None, None, None, attr)
+        return GraphQlField(
+            descriptor, None, None, None, None, attr, False, cost,
+            multiplier)
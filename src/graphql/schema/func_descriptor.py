@@ -1,5 +1,7 @@
-import importlib
 import inspect
+import threading
+
+from import_tracker import GraphQlImportTracker
 
 
 class GraphQlFuncDescriptor(object):
@@ -21,6 +23,13 @@ class GraphQlFuncDescriptor(object):
         the method or function.
     """
 
+    # A map from the module, class, and function names of each function we
+    # have loaded using cached_func to the function
+    _funcs = {}
+
+    # The lock for adding entries to _funcs
+    _funcs_lock = threading.Lock()
+
     def __init__(self, module_name, class_name, func_name):
         self.module_name = module_name
         self.class_name = class_name
@@ -43,13 +52,33 @@ class GraphQlFuncDescriptor(object):
 
     def load_func(self):
         """Return the static method or function that this identifies."""
-        module = importlib.import_module(self.module_name)
+        module = GraphQlImportTracker.instance().import_module(
+            self.module_name)
         if self.class_name is None:
             return getattr(module, self.func_name)
         else:
             cls = getattr(module, self.class_name)
             return getattr(cls, self.func_name)
 
+    @staticmethod
+    def cached_func(module_name, class_name, func_name):
+        """Return the static method or function with the specified names.
+
+        This is equivalent to GraphQlFuncDescriptor(module_name,
+        class_name, func_name).load_func(), but we only load each
+        function once, so we import it on demand without paying for the
+        lookup on every call.  The arguments are the same as for the
+        constructor.
+        """
+        key = (module_name, class_name, func_name)
+        func = GraphQlFuncDescriptor._funcs.get(key)
+        if func is None:
+            func = GraphQlFuncDescriptor(
+                module_name, class_name, func_name).load_func()
+            with GraphQlFuncDescriptor._funcs_lock:
+                func = GraphQlFuncDescriptor._funcs.setdefault(key, func)
+        return func
+
     def __eq__(self, other):
         return (
             isinstance(other, GraphQlFuncDescriptor) and
@@ -0,0 +1,142 @@
+import importlib
+import sys
+import threading
+import timeit
+
+
+class GraphQlImportTracker(object):
+    """Imports the Python modules that GraphQL schemas refer to.
+
+    GraphQlClassDescriptor and GraphQlFuncDescriptor import modules on
+    demand using the shared instance returned by instance().
+    GraphQlImportTracker keeps track of each module it imports and how
+    long the import took, so that we can tell which imports requests
+    paid for.  It distinguishes between imports on threads started using
+    start_thread, such as GraphQlSchema.warm_up_in_background and
+    prefetch, and imports on other threads, i.e. on the request path.
+    GraphQlImportTracker is thread-safe.
+    """
+
+    # The singleton instance of GraphQlImportTracker, or None if we have not
+    # created this yet.
+    _instance = None
+
+    # Private attributes:
+    # list<tuple<basestring, float, bool>> _imports - The imports we have
+    #     performed, as in imports().
+    # local _local - Thread-local storage.  _local.is_background indicates
+    #     whether the current thread is one we started using start_thread.
+    # Lock _lock - The lock for accessing _imports and _prefetch_threads.
+    # dict<tuple<basestring>, Thread> _prefetch_threads - A map from the
+    #     module names of each call to prefetch whose thread is still running
+    #     to the thread.
+
+    def __init__(self):
+        self._imports = []
+        self._prefetch_threads = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def instance():
+        """Return the shared GraphQlImportTracker."""
+        if GraphQlImportTracker._instance is None:
+            GraphQlImportTracker._instance = GraphQlImportTracker()
+        return GraphQlImportTracker._instance
+
+    def import_module(self, module_name):
+        """Import and return the module with the specified name.
+
+        This is the same as importlib.import_module(module_name), except
+        that if the module has not been imported yet, we record the
+        import.
+        """
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+        start_time = timeit.default_timer()
+        module = importlib.import_module(module_name)
+        duration = timeit.default_timer() - start_time
+        is_background = getattr(self._local, 'is_background', False)
+        with self._lock:
+            self._imports.append((module_name, duration, is_background))
+        return module
+
+    def imports(self):
+        """Return the imports we have performed, in order.
+
+        return list<tuple<basestring, float, bool>> - A list of the
+            imports.  Each element consists of the name of the module,
+            the duration of the import in seconds, and whether we
+            performed the import on a thread we started using
+            start_thread rather than on the request path.
+        """
+        with self._lock:
+            return list(self._imports)
+
+    def clear(self):
+        """Forget the imports we have performed so far."""
+        with self._lock:
+            del self._imports[:]
+
+    def start_thread(self, target, args=()):
+        """Call target(*args) on a new background thread.
+
+        The imports that target performs count as background imports,
+        as in imports().
+
+        return Thread - The thread, which we have already started.  It
+            is a daemon thread, so it does not prevent the process from
+            exiting.
+        """
+        def run():
+            self._local.is_background = True
+            target(*args)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _import_modules(self, module_names):
+        """Import the specified modules, ignoring any errors.
+
+        list<basestring> module_names - The names of the modules.
+        """
+        for module_name in module_names:
+            try:
+                self.import_module(module_name)
+            except Exception:
+                # The request path will report the error, if it needs the
+                # module
+                pass
+
+    def _prefetch_modules(self, key):
+        """Import the specified modules for a call to prefetch.
+
+        tuple<basestring> key - The names of the modules, as in
+            _prefetch_threads.
+        """
+        try:
+            self._import_modules(key)
+        finally:
+            with self._lock:
+                del self._prefetch_threads[key]
+
+    def prefetch(self, module_names):
+        """Import the specified modules on a background thread.
+
+        We ignore any errors importing the modules.  If we are already
+        prefetching the same modules, in the same order, we return the
+        existing thread rather than starting another one.
+
+        list<basestring> module_names - The names of the modules.
+        return Thread - The thread, as in start_thread.
+        """
+        key = tuple(module_names)
+        with self._lock:
+            thread = self._prefetch_threads.get(key)
+            if thread is None:
+                thread = self.start_thread(self._prefetch_modules, (key,))
+                self._prefetch_threads[key] = thread
+        return thread
@@ -12,9 +12,21 @@ class GraphQlInputObjectType(GraphQlBaseType):
         fields' names to their types.
     """
 
+    # Private attributes:
+    # dict<basestring, GraphQlType> _fields - The fields we have added so far.
+    #     Contrast with "fields", which loads them first if necessary.
+
     def __init__(self, name, description):
         super(GraphQlInputObjectType, self).__init__(name, description)
-        self.fields = {}
+        self._fields = {}
+
+    @property
+    def fields(self):
+        self._load()
+        return self._fields
+
+    def _clear_fields(self):
+        self._fields.clear()
 
     def add_field(self, name, t):
         """Add the specified field to this.
@@ -22,10 +34,10 @@ class GraphQlInputObjectType(GraphQlBaseType):
         basestring name - The name of the field.
         GraphQlType - The type of the field.
         """
-        if name in self.fields:
+        if name in self._fields:
             raise ValueError(
                 'Duplicate field {:s}.{:s}'.format(self.name, name))
-        self.fields[name] = t
+        self._fields[name] = t
 
     def field_descriptor(self, name):
         raise ValueError('Input objects do not have result fields')
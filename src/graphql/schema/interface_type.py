@@ -13,9 +13,22 @@ class GraphQlInterfaceType(GraphQlBaseType):
         as "__typename".
     """
 
+    # Private attributes:
+    # dict<basestring, GraphQlFieldDescriptor> _field_descriptors - The field
+    #     descriptors we have added so far.  Contrast with field_descriptors,
+    #     which loads them first if necessary.
+
     def __init__(self, name, description):
         super(GraphQlInterfaceType, self).__init__(name, description)
-        self.field_descriptors = {}
+        self._field_descriptors = {}
+
+    @property
+    def field_descriptors(self):
+        self._load()
+        return self._field_descriptors
+
+    def _clear_fields(self):
+        self._field_descriptors.clear()
 
     def add_field_descriptor(self, field_descriptor):
         """Add the specified field to field_descriptors.
@@ -23,11 +36,11 @@ class GraphQlInterfaceType(GraphQlBaseType):
         GraphQlFieldDescriptor field_descriptor - The field's
             description.
         """
-        if field_descriptor.name in self.field_descriptors:
+        if field_descriptor.name in self._field_descriptors:
             raise RuntimeError(
                 'Duplicate field {:s}{{{:s}}}'.format(
                     self.name, field_descriptor.name))
-        self.field_descriptors[field_descriptor.name] = (
+        self._field_descriptors[field_descriptor.name] = (
             field_descriptor)
 
     def field_descriptor(self, name):
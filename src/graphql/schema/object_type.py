@@ -15,21 +15,36 @@ class GraphQlObjectType(GraphQlBaseType):
         to all objects, such as "__typename".
     """
 
+    # Private attributes:
+    # dict<basestring, GraphQlField> _fields - The fields we have added so
+    #     far.  Contrast with "fields", which loads them first if necessary.
+
     def __init__(self, name, description, class_descriptor):
         super(GraphQlObjectType, self).__init__(name, description)
         self.class_descriptor = class_descriptor
-        self.fields = {}
+        self._fields = {}
+
+    @property
+    def fields(self):
+        self._load()
+        return self._fields
+
+    def _clear_fields(self):
+        self._fields.clear()
 
     def add_field(self, field):
         """Add the specified field to "fields".
 
         GraphQlField field - The field.
         """
-        if field.descriptor.name in self.fields:
+        if field.descriptor.name in self._fields:
             raise RuntimeError(
                 'Duplicate field {:s}{{{:s}}}'.format(
                     self.name, field.descriptor.name))
-        self.fields[field.descriptor.name] = field
+        self._fields[field.descriptor.name] = field
+
+    def warm_up(self):
+        self.class_descriptor.load_class()
 
     def field_descriptor(self, name):
         if name not in self.fields:
@@ -33,6 +33,9 @@ class GraphQlScalarType(GraphQlBaseType):
             self._scalar_descriptor = scalar_descriptor_class(self.name)
         return self._scalar_descriptor
 
+    def warm_up(self):
+        self.scalar_descriptor()
+
     def field_descriptor(self, name):
         raise ValueError('Scalar types do not have fields')
 
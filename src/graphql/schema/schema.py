@@ -1,5 +1,10 @@
+import functools
+import gc
 import inspect
+import marshal
 import re
+import struct
+import weakref
 
 from class_descriptor import GraphQlClassDescriptor
 from directive_location import GraphQlDirectiveLocation
@@ -10,6 +15,7 @@ from field_descriptor import GraphQlFieldDescriptor
 from func_descriptor import GraphQlFuncDescriptor
 from graphql import graphql_field
 from graphql import graphql_object
+from import_tracker import GraphQlImportTracker
 from input_object_type import GraphQlInputObjectType
 from interface_type import GraphQlInterfaceType
 from list_type import GraphQlListType
@@ -36,11 +42,22 @@ class GraphQlSchema(object):
     # The default name of the GraphQL type of the root query object.
     _DEFAULT_QUERY_TYPE_NAME = 'Query'
 
+    # The regular expression that matches valid GraphQL identifiers.
+    _IDENTIFIER_RE = re.compile('^[_A-Za-z][_0-9A-Za-z]*$')
+
     # An integer indicating the current version of the format used in to_json()
     # and create_from_json.  If we change the format, we should increment
     # _VERSION, so that we know to ignore any serializations created with an
     # older _VERSION value.
-    _VERSION = 11
+    _VERSION = 13
+
+    # The bytes at the beginning of every return value of to_snapshot(),
+    # before the version numbers.
+    _SNAPSHOT_MAGIC = 'GraphQlSchema\0'
+
+    # The struct format of the version numbers in a snapshot's header: _VERSION
+    # followed by the marshal.version that encoded the snapshot
+    _SNAPSHOT_VERSION_FORMAT = '<II'
 
     # Private attributes:
     # dict<basestring, GraphQlBaseType> _base_types - A map from the name of
@@ -48,6 +65,12 @@ class GraphQlSchema(object):
     # dict<GraphQlClassDescriptor, GraphQlObjectType>
     #     _class_descriptor_to_object_types - A map from the class descriptor
     #     of each object type to the type.
+    # WeakKeyDictionary<type, GraphQlObjectType> _class_to_object_type - A
+    #     cache of the results of class_type.  This maps each class we have
+    #     looked up to its GraphQlObjectType, or to None if it does not have
+    #     one.  The keys are weak references, so that caching a class does
+    #     not prevent it from being garbage collected, e.g. if it was created
+    #     dynamically.
     # dict<basestring, GraphQlFieldDescriptor> _common_field_descriptors - A
     #     map from the name of each field common to all objects to its
     #     GraphQlFieldDescriptor.  For example, the "__typename" field is
@@ -65,7 +88,14 @@ class GraphQlSchema(object):
 
     def __init__(
             self, base_types, query_type_name=_DEFAULT_QUERY_TYPE_NAME,
-            mutation_type_name=_DEFAULT_MUTATION_TYPE_NAME):
+            mutation_type_name=_DEFAULT_MUTATION_TYPE_NAME,
+            validate_fields=True):
+        """Initialize the schema.
+
+        bool validate_fields - Whether to check the types' fields for
+            errors.  This requires us to load any fields the types load
+            lazily, as in GraphQlBaseType.set_loader.
+        """
         self._base_types = base_types
         self._query_type_name = query_type_name
         self._mutation_type_name = mutation_type_name
@@ -130,25 +160,29 @@ class GraphQlSchema(object):
                 field_descriptor)
 
         # Make sure no type declares a common field
-        for t in base_types.itervalues():
-            if isinstance(t, GraphQlInterfaceType):
-                field_names = set(t.field_descriptors.keys())
-            elif isinstance(t, GraphQlObjectType):
-                field_names = set(t.fields.keys())
-            else:
-                continue
-            for common_field_name in self._common_field_descriptors.iterkeys():
-                if common_field_name in field_names:
-                    raise ValueError(
-                        'The {:s} type may not declare a field named {:s}, '
-                        'because this is a reserved field common to all '
-                        'object types.'.format(t.name, common_field_name))
+        if validate_fields:
+            common_field_names = self._common_field_descriptors.keys()
+            for t in base_types.itervalues():
+                if isinstance(t, GraphQlInterfaceType):
+                    field_names = set(t.field_descriptors.keys())
+                elif isinstance(t, GraphQlObjectType):
+                    field_names = set(t.fields.keys())
+                else:
+                    continue
+                for common_field_name in common_field_names:
+                    if common_field_name in field_names:
+                        raise ValueError(
+                            'The {:s} type may not declare a field named '
+                            '{:s}, because this is a reserved field common '
+                            'to all object types.'.format(
+                                t.name, common_field_name))
 
         # Compute _class_descriptor_to_object_type
         self._class_descriptor_to_object_type = {}
         for t in base_types.itervalues():
             if isinstance(t, GraphQlObjectType):
                 self._class_descriptor_to_object_type[t.class_descriptor] = t
+        self._class_to_object_type = weakref.WeakKeyDictionary()
 
         # Compute _directives
         non_null_bool_type = GraphQlNonNullType(base_types['Boolean'])
@@ -182,7 +216,7 @@ class GraphQlSchema(object):
         Return whether the specified string is a valid identifier for a
         GraphQL type, field name, etc.
         """
-        return re.search('^[_A-Za-z][_0-9A-Za-z]*$', identifier) is not None
+        return GraphQlSchema._IDENTIFIER_RE.search(identifier) is not None
 
     def _field_descriptor_json(self, field_descriptor):
         """Return the JSON representation of the specified field descriptor.
@@ -210,6 +244,10 @@ class GraphQlSchema(object):
         """
         field_json = {}
         field_json.update(self._field_descriptor_json(field.descriptor))
+        if field.cost is not None:
+            field_json['cost'] = field.cost
+        if field.multiplier is not None:
+            field_json['multiplier'] = field.multiplier
         if field.attr is not None:
             field_json['attr'] = field.attr
         else:
@@ -218,6 +256,8 @@ class GraphQlSchema(object):
             if field.partial_args or field.partial_kwargs:
                 field_json['partialArgs'] = field.partial_args
                 field_json['partialKwargs'] = field.partial_kwargs
+            if field.is_batch:
+                field_json['isBatch'] = True
         return field_json
 
     def to_json(self):
@@ -445,7 +485,8 @@ class GraphQlSchema(object):
             field_json, type_name, base_types)
         if 'attr' in field_json:
             return GraphQlField.create_from_attr(
-                field_descriptor, field_json['attr'])
+                field_descriptor, field_json['attr'], field_json.get('cost'),
+                field_json.get('multiplier'))
         else:
             if 'partialArgs' in field_json:
                 partial_args = tuple(field_json['partialArgs'])
@@ -455,10 +496,51 @@ class GraphQlSchema(object):
                 partial_kwargs = {}
             return GraphQlField.create_from_method(
                 field_descriptor, field_json['method'],
-                partial_args, partial_kwargs, field_json['contextArgs'])
+                partial_args, partial_kwargs, field_json['contextArgs'],
+                field_json.get('isBatch', False), field_json.get('cost'),
+                field_json.get('multiplier'))
 
     @staticmethod
-    def create_from_json(json):
+    def _add_object_fields(t, fields_json, base_types):
+        """Add the fields in the specified JSON value to a GraphQlObjectType.
+
+        GraphQlObjectType t - The type.
+        list<object> fields_json - The JSON representations of the
+            fields, as in to_json().
+        dict<basestring, GraphQlBaseType> base_types - A map from the
+            name of each base type to the type.
+        """
+        for field_json in fields_json:
+            t.add_field(
+                GraphQlSchema._field_from_json(field_json, t.name, base_types))
+
+    @staticmethod
+    def _add_interface_fields(t, fields_json, base_types):
+        """Add the fields in the given JSON value to a GraphQlInterfaceType.
+
+        This is like _add_object_fields, but for interfaces.
+        """
+        for field_descriptor_json in fields_json:
+            t.add_field_descriptor(
+                GraphQlSchema._field_descriptor_from_json(
+                    field_descriptor_json, t.name, base_types))
+
+    @staticmethod
+    def _add_input_object_fields(t, fields_json, base_types):
+        """Add the fields in the JSON value to a GraphQlInputObjectType.
+
+        This is like _add_object_fields, but for input objects.  The
+        JSON value is a map from the name of each field to its type
+        string.
+        """
+        for field_name, field_type_str in fields_json.iteritems():
+            field_type = GraphQlSchema.parse_type(
+                field_type_str, base_types, True, False,
+                'the field {:s}.{:s}'.format(t.name, field_name))
+            t.add_field(field_name, field_type)
+
+    @staticmethod
+    def create_from_json(json, lazy=False):
         """Return the GraphQlSchema represented by the specified JSON value.
 
         Return the GraphQlSchema object for the specified JSON value
@@ -467,8 +549,41 @@ class GraphQlSchema(object):
         return value from a previous serialization format.
 
         object json - The JSON value.
+        bool lazy - Whether to load the types' fields lazily, the first
+            time the parser, the executor, introspection, or the like
+            accesses them, rather than up front.  This is faster and
+            uses less memory for large schemas, since most processes
+            only use a fraction of the types.  However, we skip the
+            validation of the fields, and we only report errors in a
+            type's fields when we load them, so we should only use lazy
+            loading for JSON values that to_json() produced.  We load
+            the fields of the root query and mutation types up front.
         return GraphQlSchema - The schema.
         """
+        return GraphQlSchema._call_without_gc(
+            GraphQlSchema._create_from_json, json, lazy)
+
+    @staticmethod
+    def _call_without_gc(func, *args):
+        """Return func(*args), suspending garbage collection during the call.
+
+        Creating a large schema triggers many garbage collection passes,
+        each of which traverses all of the objects we have created so
+        far.  None of the objects are garbage, so it is much faster to
+        suspend garbage collection while we create them.
+        """
+        is_gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return func(*args)
+        finally:
+            if is_gc_enabled:
+                gc.enable()
+
+    @staticmethod
+    def _create_from_json(json, lazy):
+        """Implementation of create_from_json, apart from garbage collection.
+        """
         if json['version'] != GraphQlSchema._VERSION:
             raise ValueError(
                 'The JSON value is not from a compatible implementation of '
@@ -531,34 +646,91 @@ class GraphQlSchema(object):
                 t.add_parent_type(base_types[parent])
                 base_types[parent].add_child_type(t)
 
-        # Create the GraphQlFieldDescriptors and GraphQlFields, and reference
-        # them in the appropriate type objects
-        for object_json in json['objects']:
-            t = base_types[object_json['name']]
-            for field_json in object_json['fields']:
-                field = GraphQlSchema._field_from_json(
-                    field_json, t.name, base_types)
-                t.add_field(field)
-        for interface_json in json['interfaces']:
-            t = base_types[interface_json['name']]
-            for field_descriptor_json in interface_json['fields']:
-                field_descriptor = GraphQlSchema._field_descriptor_from_json(
-                    field_descriptor_json, t.name, base_types)
-                t.add_field_descriptor(field_descriptor)
-
-        # Add the GraphQlInputObject fields
-        for input_object_json in json['inputObjects']:
-            name = input_object_json['name']
-            input_object_type = base_types[name]
-            for field_name, field_type_str in (
-                    input_object_json['fields'].iteritems()):
-                field_type = GraphQlSchema.parse_type(
-                    field_type_str, base_types, True, False,
-                    'the field {:s}.{:s}'.format(name, field_name))
-                input_object_type.add_field(field_name, field_type)
+        # Add the fields to the types, or arrange to add them lazily
+        for type_json, add_fields in (
+                [(object_json, GraphQlSchema._add_object_fields)
+                 for object_json in json['objects']] +
+                [(interface_json, GraphQlSchema._add_interface_fields)
+                 for interface_json in json['interfaces']] +
+                [(input_object_json, GraphQlSchema._add_input_object_fields)
+                 for input_object_json in json['inputObjects']]):
+            t = base_types[type_json['name']]
+            if lazy:
+                t.set_loader(
+                    functools.partial(
+                        add_fields, t, type_json['fields'], base_types))
+            else:
+                add_fields(t, type_json['fields'], base_types)
+
+        schema = GraphQlSchema(
+            base_types, json['queryType'], json['mutationType'], not lazy)
+        if lazy:
+            # Load the root types' fields up front
+            schema.root_query_type().fields
+            if json['mutationType'] is not None:
+                schema.root_mutation_type().fields
+        return schema
+
+    def to_snapshot(self):
+        """Return a compact binary representation of this.
+
+        This is an alternative to to_json() that is faster to load.  It
+        consists of a header identifying the format, its version, and
+        the marshal format version, followed by the marshal encoding of
+        the JSON value representation.  Since the marshal format is
+        specific to the Python version, create_from_snapshot rejects
+        snapshots with a different marshal.version.  We may reconstruct
+        the GraphQlSchema later using create_from_snapshot, provided we
+        call it before the serialization format changes.
+
+        return str - The snapshot.
+        """
+        return (
+            GraphQlSchema._SNAPSHOT_MAGIC +
+            struct.pack(
+                GraphQlSchema._SNAPSHOT_VERSION_FORMAT,
+                GraphQlSchema._VERSION, marshal.version) +
+            marshal.dumps(self.to_json()))
 
-        return GraphQlSchema(
-            base_types, json['queryType'], json['mutationType'])
+    @staticmethod
+    def create_from_snapshot(snapshot, lazy=True):
+        """Return the GraphQlSchema represented by the specified snapshot.
+
+        Return the GraphQlSchema object for the specified binary
+        representation produced in to_snapshot().  Raise a ValueError
+        if we determine that "snapshot" is not a return value of
+        to_snapshot() or is a return value from a previous serialization
+        format.
+
+        str snapshot - The snapshot.
+        bool lazy - Whether to load the types' fields lazily, as in the
+            "lazy" argument to create_from_json.  Snapshots are normally
+            produced by to_snapshot(), so this defaults to True.
+        return GraphQlSchema - The schema.
+        """
+        magic_length = len(GraphQlSchema._SNAPSHOT_MAGIC)
+        header_length = magic_length + struct.calcsize(
+            GraphQlSchema._SNAPSHOT_VERSION_FORMAT)
+        if (len(snapshot) < header_length or
+                snapshot[:magic_length] != GraphQlSchema._SNAPSHOT_MAGIC):
+            raise ValueError('The value is not a GraphQlSchema snapshot')
+        version, marshal_version = struct.unpack(
+            GraphQlSchema._SNAPSHOT_VERSION_FORMAT,
+            snapshot[magic_length:header_length])
+        if version != GraphQlSchema._VERSION:
+            raise ValueError(
+                'The snapshot is not from a compatible implementation of '
+                'GraphQlSchema.  Try generating the GraphQL schema again.')
+        if marshal_version != marshal.version:
+            raise ValueError(
+                'The snapshot was created using a different marshal format '
+                'version.  Try generating the snapshot again.')
+        try:
+            json = GraphQlSchema._call_without_gc(
+                marshal.loads, snapshot[header_length:])
+        except (EOFError, TypeError, ValueError):
+            raise ValueError('The snapshot is truncated or corrupt')
+        return GraphQlSchema.create_from_json(json, lazy)
 
     def get_type(self, type_str):
         """Return the GraphQlType for the specified GraphQL type string.
@@ -604,6 +776,60 @@ class GraphQlSchema(object):
         else:
             return None
 
+    def warm_up(self, type_names=None, progress=None):
+        """Import and load the Python code that the schema refers to.
+
+        A GraphQlSchema, particularly one obtained from create_from_json,
+        imports the modules for its object classes, scalar descriptors,
+        enumerations, and root fields on demand, the first time a
+        document uses them.  This is good for start-up time, but it
+        means that the first requests a process serves pay for the
+        imports.  warm_up performs the imports ahead of time instead.
+        Raise if we fail to load any of the code.
+
+        collection<basestring> type_names - The names of the base types
+            to warm up, or None to warm up all of them.  Warming up the
+            root query or mutation type loads the functions for its
+            fields, as in GraphQlFuncDescriptor.cached_func.
+        function progress - A function to call after we warm up each
+            type, or None.  We call progress(num_warmed, num_types),
+            where num_warmed is the number of types we have warmed up
+            so far and num_types is the number of types to warm up.
+        """
+        if type_names is None:
+            type_names = self._base_types.keys()
+        types = []
+        for name in sorted(type_names):
+            t = self._base_types.get(name)
+            if t is None:
+                raise ValueError(
+                    'There is no base type named {:s}'.format(name))
+            types.append(t)
+
+        root_type_names = (self._query_type_name, self._mutation_type_name)
+        for index, t in enumerate(types):
+            t.warm_up()
+            if t.name in root_type_names:
+                for field in t.fields.itervalues():
+                    if field.method_name in ('execute_mutation', 'field'):
+                        GraphQlFuncDescriptor.cached_func(*field.partial_args)
+            if progress is not None:
+                progress(index + 1, len(types))
+
+    def warm_up_in_background(self, type_names=None, progress=None):
+        """Call warm_up on a background thread.
+
+        This enables a process to start serving requests immediately,
+        while it loads the code the requests will need.  The arguments
+        are the same as for warm_up.  Note that "progress" is called on
+        the background thread.
+
+        return Thread - The thread, as in
+            GraphQlImportTracker.start_thread.
+        """
+        return GraphQlImportTracker.instance().start_thread(
+            self.warm_up, (type_names, progress))
+
     def directive(self, name):
         """Return the GraphQlDirectiveType with the specified name.
 
@@ -614,18 +840,40 @@ class GraphQlSchema(object):
         else:
             return None
 
-    def class_type(self, cls):
-        """Return the GraphQlObjectType of the specified Python class, if any.
-
-        Return the GraphQlObjectType of instances of the specified
-        Python class, if any.
-        """
+    def _compute_class_type(self, cls):
+        """Compute the return value of class_type(cls), without caching."""
         for cls in inspect.getmro(cls):
+            runtime_type_name = cls.__dict__.get('_graphql_runtime_type_name')
+            if runtime_type_name is not None:
+                t = self._base_types.get(runtime_type_name)
+                if isinstance(t, GraphQlObjectType):
+                    return t
+                else:
+                    return None
             descriptor = GraphQlClassDescriptor.create_from_class(cls)
             if descriptor in self._class_descriptor_to_object_type:
                 return self._class_descriptor_to_object_type[descriptor]
         return None
 
+    def class_type(self, cls):
+        """Return the GraphQlObjectType of the specified Python class, if any.
+
+        Return the GraphQlObjectType of instances of the specified
+        Python class, if any.  This is determined by the first element
+        of inspect.getmro(cls) that has a graphql_object or
+        graphql_runtime_type annotation.  We cache the results, so
+        annotations applied after the first call to class_type(cls)
+        have no effect.  The cache holds weak references to the
+        classes.
+        """
+        try:
+            return self._class_to_object_type[cls]
+        except KeyError:
+            pass
+        object_type = self._compute_class_type(cls)
+        self._class_to_object_type[cls] = object_type
+        return object_type
+
     def object_type(self, value):
         """Return the GraphQlObjectType of the specified Python object, if any.
         """
@@ -0,0 +1,58 @@
+"""Converts a GraphQlSchema JSON file to a snapshot file.
+
+Usage:
+
+    python -m graphql.schema.snapshot schema.json schema.snapshot
+
+The input file contains the JSON encoding of the return value of
+GraphQlSchema.to_json(), and we write the return value of
+GraphQlSchema.to_snapshot() to the output file.  We may then load the
+schema using GraphQlSchema.create_from_snapshot, which is much faster
+than create_from_json for large schemas.
+"""
+
+import argparse
+import json
+import sys
+
+from graphql.schema import GraphQlSchema
+
+
+def convert(json_filename, snapshot_filename):
+    """Convert the specified GraphQlSchema JSON file to a snapshot file.
+
+    basestring json_filename - The name of the JSON file.
+    basestring snapshot_filename - The name of the file to which to
+        write the snapshot.
+    """
+    with open(json_filename, 'r') as f:
+        schema = GraphQlSchema.create_from_json(json.load(f))
+    snapshot = schema.to_snapshot()
+    with open(snapshot_filename, 'wb') as f:
+        f.write(snapshot)
+
+
+def main(args):
+    """Run the command-line tool with the specified arguments.
+
+    list<basestring> args - The command-line arguments, excluding the
+        program name.
+    return int - The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description='Convert a GraphQlSchema JSON file to a snapshot file')
+    parser.add_argument(
+        'json_filename', help='The file containing the JSON schema')
+    parser.add_argument(
+        'snapshot_filename', help='The file to which to write the snapshot')
+    parsed_args = parser.parse_args(args)
+    try:
+        convert(parsed_args.json_filename, parsed_args.snapshot_filename)
+    except (IOError, ValueError) as exception:
+        sys.stderr.write('{:s}\n'.format(str(exception)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,6 +1,21 @@
+import gc
+import json
+import marshal
+import os
+import shutil
+import StringIO
+import struct
+import sys
+import tempfile
+import threading
 import unittest
+import weakref
 
+from graphql import graphql_runtime_type
+from graphql.executor.test.star_wars import SwDroid
+from graphql.executor.test.star_wars import SwHuman
 from graphql.schema import GraphQlEnumType
+from graphql.schema import GraphQlImportTracker
 from graphql.schema import GraphQlInputObjectType
 from graphql.schema import GraphQlInterfaceType
 from graphql.schema import GraphQlObjectType
@@ -8,6 +23,7 @@ from graphql.schema import GraphQlScalarType
 from graphql.schema import GraphQlSchema
 from graphql.schema import GraphQlSchemaFactory
 from graphql.schema import GraphQlUnionType
+from graphql.schema import snapshot as snapshot_tool
 
 
 class GraphQlSchemaTest(unittest.TestCase):
@@ -153,3 +169,200 @@ class GraphQlSchemaTest(unittest.TestCase):
             'graphql.scalar_descriptors.strict'])
         schema2 = GraphQlSchema.create_from_json(schema1.to_json())
         self._assert_schemas_equal(schema1, schema2)
+
+    def test_json_lazy(self):
+        """Test create_from_json with lazy loading of the types' fields."""
+        schema1 = GraphQlSchemaFactory.create_from_modules([
+            'graphql.executor.test.star_wars',
+            'graphql.executor.test.star_wars_extra',
+            'graphql.scalar_descriptors.strict'])
+        schema2 = GraphQlSchema.create_from_json(schema1.to_json(), True)
+        self.assertIsNone(schema2.get_type('Query')._loader)
+        self.assertIsNotNone(schema2.get_type('Ship')._loader)
+        self.assertIsNotNone(schema2.get_type('Character')._loader)
+        field = schema2.get_type('Ship').fields['nameLength']
+        self.assertEqual('Int!', field.descriptor.field_type.type_str())
+        self.assertIsNone(schema2.get_type('Ship')._loader)
+        self._assert_schemas_equal(schema1, schema2)
+
+        # A failure to load the fields should not leave any of them behind
+        json_value = schema1.to_json()
+        for object_json in json_value['objects']:
+            if object_json['name'] == 'Ship':
+                object_json['fields'][-1]['fieldType'] = 'DoesNotExist'
+        schema2 = GraphQlSchema.create_from_json(json_value, True)
+        ship_type = schema2.get_type('Ship')
+        for i in xrange(2):
+            with self.assertRaisesRegexp(ValueError, 'DoesNotExist'):
+                ship_type.fields
+            self.assertEqual({}, ship_type._fields)
+            self.assertIsNotNone(ship_type._loader)
+
+    def test_snapshot(self):
+        """Test to_snapshot() and create_from_snapshot."""
+        schema1 = GraphQlSchemaFactory.create_from_modules([
+            'graphql.executor.test.star_wars',
+            'graphql.executor.test.star_wars_extra',
+            'graphql.scalar_descriptors.strict'])
+        snapshot = schema1.to_snapshot()
+        schema2 = GraphQlSchema.create_from_snapshot(snapshot)
+        self.assertIsNotNone(schema2.get_type('Ship')._loader)
+        self._assert_schemas_equal(schema1, schema2)
+        schema2 = GraphQlSchema.create_from_snapshot(snapshot, False)
+        self.assertIsNone(schema2.get_type('Ship')._loader)
+        self._assert_schemas_equal(schema1, schema2)
+
+        with self.assertRaises(ValueError):
+            GraphQlSchema.create_from_snapshot('')
+        with self.assertRaises(ValueError):
+            GraphQlSchema.create_from_snapshot(json.dumps(schema1.to_json()))
+        with self.assertRaises(ValueError):
+            GraphQlSchema.create_from_snapshot(
+                snapshot[:len(GraphQlSchema._SNAPSHOT_MAGIC)] +
+                struct.pack('<I', GraphQlSchema._VERSION - 1) +
+                snapshot[len(GraphQlSchema._SNAPSHOT_MAGIC) + 4:])
+        with self.assertRaises(ValueError):
+            GraphQlSchema.create_from_snapshot(
+                snapshot[:len(GraphQlSchema._SNAPSHOT_MAGIC) + 4] +
+                struct.pack('<I', marshal.version + 1) +
+                snapshot[len(GraphQlSchema._SNAPSHOT_MAGIC) + 8:])
+        with self.assertRaises(ValueError):
+            GraphQlSchema.create_from_snapshot(snapshot[:len(snapshot) // 2])
+
+    def test_snapshot_tool(self):
+        """Test the graphql.schema.snapshot command-line tool."""
+        schema1 = GraphQlSchemaFactory.create_from_modules([
+            'graphql.executor.test.star_wars',
+            'graphql.scalar_descriptors.strict'])
+        temp_dir = tempfile.mkdtemp()
+        try:
+            json_filename = os.path.join(temp_dir, 'schema.json')
+            snapshot_filename = os.path.join(temp_dir, 'schema.snapshot')
+            with open(json_filename, 'w') as f:
+                json.dump(schema1.to_json(), f)
+            self.assertEqual(
+                0, snapshot_tool.main([json_filename, snapshot_filename]))
+            with open(snapshot_filename, 'rb') as f:
+                schema2 = GraphQlSchema.create_from_snapshot(f.read())
+            self._assert_schemas_equal(schema1, schema2)
+
+            stderr = sys.stderr
+            sys.stderr = StringIO.StringIO()
+            try:
+                self.assertEqual(
+                    1,
+                    snapshot_tool.main([
+                        os.path.join(temp_dir, 'does_not_exist.json'),
+                        snapshot_filename]))
+                self.assertIn('does_not_exist.json', sys.stderr.getvalue())
+            finally:
+                sys.stderr = stderr
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_warm_up(self):
+        """Test GraphQlSchema.warm_up and warm_up_in_background."""
+        schema = GraphQlSchema.create_from_json(
+            GraphQlSchemaFactory.create_from_modules([
+                'graphql.executor.test.star_wars',
+                'graphql.executor.test.star_wars_extra',
+                'graphql.scalar_descriptors.strict']).to_json())
+        calls = []
+        schema.warm_up(
+            ['Episode', 'Int', 'Query'],
+            lambda num_warmed, num_types: calls.append(
+                (num_warmed, num_types)))
+        self.assertEqual([(1, 3), (2, 3), (3, 3)], calls)
+        self.assertIsNotNone(schema.get_type('Int')._scalar_descriptor)
+        self.assertIsNotNone(schema.get_type('Episode')._graphql_to_python)
+        self.assertIsNone(schema.get_type('String')._scalar_descriptor)
+        with self.assertRaises(ValueError):
+            schema.warm_up(['DoesNotExist'])
+
+        calls = []
+        thread = schema.warm_up_in_background(
+            None,
+            lambda num_warmed, num_types: calls.append(
+                (num_warmed, num_types)))
+        thread.join()
+        self.assertTrue(len(calls) > 3)
+        self.assertEqual((len(calls), len(calls)), calls[-1])
+        self.assertIsNotNone(schema.get_type('String')._scalar_descriptor)
+
+    def test_import_tracker(self):
+        """Test GraphQlImportTracker."""
+        tracker = GraphQlImportTracker()
+        sys.modules.pop('colorsys', None)
+        sys.modules.pop('sndhdr', None)
+        self.assertEqual(
+            'colorsys', tracker.import_module('colorsys').__name__)
+        tracker.import_module('colorsys')
+        tracker.prefetch(['sndhdr', 'does_not_exist', 'colorsys']).join()
+        imports = tracker.imports()
+        self.assertEqual(
+            [('colorsys', False), ('sndhdr', True)],
+            [(module_name, is_background)
+             for module_name, duration, is_background in imports])
+        self.assertTrue(imports[0][1] >= 0)
+        tracker.clear()
+        self.assertEqual([], tracker.imports())
+
+        # Only one prefetch of the same modules should be in flight
+        event = threading.Event()
+        tracker.import_module = lambda module_name: event.wait()
+        thread = tracker.prefetch(['colorsys', 'sndhdr'])
+        self.assertIs(thread, tracker.prefetch(['colorsys', 'sndhdr']))
+        other_thread = tracker.prefetch(['sndhdr'])
+        self.assertIsNot(thread, other_thread)
+        event.set()
+        thread.join()
+        other_thread.join()
+        thread2 = tracker.prefetch(['colorsys', 'sndhdr'])
+        self.assertIsNot(thread, thread2)
+        thread2.join()
+
+    def test_class_type(self):
+        """Test GraphQlSchema.class_type and GraphQlSchema.object_type."""
+        schema = GraphQlSchemaFactory.create_from_modules([
+            'graphql.executor.test.star_wars',
+            'graphql.scalar_descriptors.strict'])
+        human_type = schema.get_type('Human')
+        droid_type = schema.get_type('Droid')
+
+        class HumanSubclass(SwHuman):
+            pass
+
+        @graphql_runtime_type('Human')
+        class HumanProxy(object):
+            pass
+
+        class HumanProxySubclass(HumanProxy):
+            pass
+
+        @graphql_runtime_type('Droid')
+        class DroidProxy(HumanSubclass):
+            pass
+
+        @graphql_runtime_type('DoesNotExist')
+        class UnknownProxy(SwHuman):
+            pass
+
+        for i in xrange(2):
+            self.assertEqual(human_type, schema.class_type(SwHuman))
+            self.assertEqual(droid_type, schema.class_type(SwDroid))
+            self.assertEqual(human_type, schema.class_type(HumanSubclass))
+            self.assertEqual(human_type, schema.class_type(HumanProxy))
+            self.assertEqual(
+                human_type, schema.class_type(HumanProxySubclass))
+            self.assertEqual(droid_type, schema.class_type(DroidProxy))
+            self.assertIsNone(schema.class_type(UnknownProxy))
+            self.assertIsNone(schema.class_type(object))
+            self.assertIsNone(schema.class_type(int))
+            self.assertEqual(human_type, schema.object_type(HumanProxy()))
+            self.assertIsNone(schema.object_type(object()))
+
+        # The cache should not keep classes alive
+        class_ref = weakref.ref(UnknownProxy)
+        del UnknownProxy
+        gc.collect()
+        self.assertIsNone(class_ref())